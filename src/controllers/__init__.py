@@ -1,3 +1,9 @@
 from .generate_file_name import create_unique_name
-from .pdf_or_txt_to_chunks import from_doc_to_chunks
-from .sqlite_clear_taple import clear
\ No newline at end of file
+from .pdf_or_txt_to_chunks import from_doc_to_chunks, tag_chunks
+from .sqlite_clear_taple import clear
+from .archive_ingest import ingest_archive, iter_archive_members
+from .pdf_extractors import IPDFExtractor, get_pdf_extractor, load_pdf_documents
+from .chunk_dedup import ChunkDeduplicator, mark_duplicates, mark_stored_duplicates, index_chunk_signatures, count_duplicates
+from .hybrid_retriever import HybridRetriever, reciprocal_rank_fusion
+from .precompute_recommendations import materialize_recommendations, materialization_running, claim_materialization, SOIL_VOCABULARY
+from .bulk_chat import BulkRecommender, read_soil_table, classify_columns
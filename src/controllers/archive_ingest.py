@@ -0,0 +1,210 @@
+import os
+import sys
+import shutil
+import tarfile
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_debug
+    from helpers import get_settings, Settings
+    from .generate_file_name import create_unique_name
+    from .pdf_or_txt_to_chunks import from_doc_to_chunks
+    from .chunk_dedup import mark_duplicates, count_duplicates
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Chunking context of a worker process, set once by _init_chunk_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_chunk_worker(app_settings: Settings, tokenizer: Optional[Any], max_tokens: Optional[int]) -> None:
+    """Receives the settings and tokenizer once per worker instead of with every member."""
+    _worker.update(app_settings=app_settings, tokenizer=tokenizer, max_tokens=max_tokens)
+
+
+def _chunk_member(file_location: str) -> pd.DataFrame:
+    """Chunks one extracted member in a worker; extraction errors propagate to the parent."""
+    return from_doc_to_chunks(
+        file_location,
+        _worker["app_settings"],
+        _worker["tokenizer"],
+        _worker["max_tokens"],
+        deduplicate=False,
+        raise_errors=True,
+    )
+
+
+def iter_archive_members(fileobj: IO[bytes], archive_name: str) -> Iterator[Tuple[str, IO[bytes], int]]:
+    """
+    Streams the regular file members of a zip or tar archive one at a time.
+
+    Tar archives are read in stream mode (``r|*``) so members are never seeked
+    back to; zip members are decompressed lazily from the central directory.
+
+    Args:
+        fileobj (IO[bytes]): Readable binary file object holding the archive.
+        archive_name (str): Original archive file name, used to pick the format.
+
+    Yields:
+        Tuple[str, IO[bytes], int]: Member name, readable stream and uncompressed size.
+
+    Raises:
+        ValueError: If the archive format is not supported.
+    """
+    name = archive_name.lower()
+
+    if name.endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as stream:
+                    yield info.filename, stream, info.file_size
+
+    elif name.endswith(TAR_SUFFIXES):
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                stream = archive.extractfile(member)
+                if stream is None:
+                    continue
+                yield member.name, stream, member.size
+
+    else:
+        raise ValueError(f"Unsupported archive type: {archive_name}")
+
+
+def ingest_archive(
+    fileobj: IO[bytes],
+    archive_name: str,
+    app_settings: Settings = get_settings(),
+    tokenizer: Optional[Any] = None,
+    max_tokens: Optional[int] = None
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Extracts supported documents from an archive and chunks them in parallel.
+
+    Each supported member is copied to ``LOC_DOC`` under a unique name and handed
+    to a worker process running ``from_doc_to_chunks`` while the next member is
+    still being extracted. Workers are spawned rather than forked, since the app
+    process holds torch and server threads that a fork would copy in an unknown
+    state, and they receive the tokenizer once, when they start.
+
+    Args:
+        fileobj (IO[bytes]): Readable binary file object holding the archive.
+        archive_name (str): Original archive file name.
+        app_settings (Settings): Application settings.
+        tokenizer (Optional[Any]): Embedding model tokenizer, forwarded to the chunker.
+        max_tokens (Optional[int]): Embedding model max sequence length.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: All produced chunks and an ingestion summary
+        with accepted, skipped, empty (no text) and failed file counts and the number of
+        chunks and duplicates.
+    """
+    max_size = app_settings.FILE_MAX_SIZE * 1024 * 1024
+    summary: Dict[str, Any] = {
+        "accepted": 0,
+        "skipped": 0,
+        "empty": 0,
+        "failed": 0,
+        "chunks": 0,
+        "duplicates": 0,
+        "skipped_files": [],
+        "empty_files": [],
+        "failed_files": [],
+    }
+    frames = []
+
+    os.makedirs(app_settings.LOC_DOC, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=app_settings.ARCHIVE_MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_chunk_worker,
+        initargs=(app_settings, tokenizer, max_tokens),
+    ) as executor:
+        futures = {}
+
+        for member_name, stream, size in iter_archive_members(fileobj, archive_name):
+            base_name = Path(member_name).name
+            extension = Path(base_name).suffix.lower().lstrip(".")
+
+            if extension not in app_settings.FILE_ALLOWED_TYPES or base_name.startswith("."):
+                log_debug(f"Skipping unsupported archive member: {member_name}")
+                summary["skipped"] += 1
+                summary["skipped_files"].append(member_name)
+                continue
+
+            if size > max_size:
+                log_debug(f"Skipping oversized archive member: {member_name} ({size} bytes)")
+                summary["skipped"] += 1
+                summary["skipped_files"].append(member_name)
+                continue
+
+            try:
+                file_location = os.path.join(app_settings.LOC_DOC, create_unique_name(base_name))
+                with open(file_location, "wb") as f:
+                    shutil.copyfileobj(stream, f)
+            except Exception as e:
+                log_error(f"Failed to extract archive member {member_name}: {e}")
+                summary["failed"] += 1
+                summary["failed_files"].append(member_name)
+                continue
+
+            futures[executor.submit(_chunk_member, file_location)] = member_name
+
+        for future in as_completed(futures):
+            member_name = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                log_error(f"Failed to chunk archive member {member_name}: {e}")
+                summary["failed"] += 1
+                summary["failed_files"].append(member_name)
+                continue
+
+            if df.empty:
+                # Read fine but holds no text, e.g. a scanned PDF without a text layer
+                log_debug(f"Archive member has no text: {member_name}")
+                summary["empty"] += 1
+                summary["empty_files"].append(member_name)
+                continue
+
+            summary["accepted"] += 1
+            summary["chunks"] += len(df)
+            frames.append(df)
+
+    data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if app_settings.CHUNK_DEDUP:
+        # Dedup across the whole archive rather than per file
+        data = mark_duplicates(data, app_settings=app_settings)
+        summary["duplicates"] = count_duplicates(data)
+    log_info(
+        f"Archive '{archive_name}' ingested: {summary['accepted']} accepted, "
+        f"{summary['skipped']} skipped, {summary['empty']} empty, {summary['failed']} failed, {summary['chunks']} chunks, "
+        f"{summary['duplicates']} duplicates."
+    )
+    return data, summary
+
+
+if __name__ == "__main__":
+    archive_path = sys.argv[1]
+    with open(archive_path, "rb") as archive_file:
+        df, summary = ingest_archive(archive_file, archive_path)
+    print(summary)
@@ -0,0 +1,230 @@
+import os
+import sys
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_info, log_warning
+    from helpers import get_settings, Settings
+    from helpers.spliters import SOIL_KEYS, WEATHER_KEYS, normalize_element
+    from dbs import ChunkTextHydrator, PrecomputedRecommendations, normalize_term
+    from prompt import ContextAssembler
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+app_setting: Settings = get_settings()
+
+# Retrieval settings of the default /chat pipeline
+TOP_K = 5
+SCORE_THRESHOLD = 0.3
+
+
+def read_soil_table(file: BinaryIO, filename: str) -> pd.DataFrame:
+    """
+    Reads a lab export (.csv or .parquet; Parquet needs pyarrow) with every value
+    as a string and blanks as NaN.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(file, dtype=str, skipinitialspace=True)
+    if extension == ".parquet":
+        df = pd.read_parquet(file)
+        return df.apply(lambda column: column.map(lambda v: None if pd.isna(v) else str(v)))
+    raise ValueError(f"Unsupported file type '{extension}', expected .csv or .parquet")
+
+
+def classify_columns(columns) -> Tuple[Dict[str, str], Dict[str, str], List[str]]:
+    """
+    Splits table columns into soil and weather parameters (column -> canonical key)
+    and pass-through columns (sample ids, dates, ...) that are copied to the output.
+    """
+    soil, weather, passthrough = {}, {}, []
+    for column in columns:
+        name = normalize_term(str(column).replace("_", " "))
+        if name in SOIL_KEYS:
+            soil[column] = SOIL_KEYS[name]
+        elif name in WEATHER_KEYS:
+            weather[column] = WEATHER_KEYS[name]
+        else:
+            passthrough.append(column)
+    return soil, weather, passthrough
+
+
+def normalize_columns(df: pd.DataFrame, columns: Dict[str, str], section: str) -> pd.DataFrame:
+    """
+    Normalizes the values of the given columns, once per distinct value of each
+    column, and renames the columns to their canonical keys.
+    """
+    normalized = {}
+    for column, key in columns.items():
+        values = df[column]
+        mapping = {
+            value: normalize_element(key, value, section)[1]
+            for value in values.dropna().unique()
+            if str(value).strip()
+        }
+        normalized[key] = values.map(mapping)
+    return pd.DataFrame(normalized, index=df.index)
+
+
+class BulkRecommender:
+    """
+    Scores a table of soil samples. Every distinct (parameter, value) is embedded
+    and retrieved once, every distinct (parameter, value, weather) is generated
+    once, and prompts are sent to the LLM in batches, so the cost follows the
+    number of distinct inputs rather than the number of rows.
+    """
+
+    def __init__(
+        self,
+        qdrant,
+        embedding,
+        llm,
+        hydrator: Optional[ChunkTextHydrator] = None,
+        reranker=None,
+        precomputed_store: Optional[PrecomputedRecommendations] = None
+    ):
+        self.qdrant = qdrant
+        self.embedding = embedding
+        self.llm = llm
+        self.hydrator = hydrator
+        self.reranker = reranker if app_setting.RERANK_ENABLED else None
+        self.precomputed_store = precomputed_store if app_setting.PRECOMPUTED_RECOMMENDATIONS else None
+        self.model_version = llm.config_id()
+        self.assembler = ContextAssembler(llm.count_tokens)
+
+        self._contexts: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._answers: Dict[Tuple, Tuple[str, str]] = {}
+        self._precomputed: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self.stats = {"rows": 0, "units": 0, "retrievals": 0, "generations": 0, "precomputed": 0, "prompt_tokens": 0}
+
+    def _retrieve(self, pairs: List[Tuple[str, str]]) -> None:
+        queries = [f"{parameter}: {value}" for parameter, value in pairs]
+        vectors = self.embedding.embed_batch(texts=queries)
+        if vectors is None:
+            raise RuntimeError("Embedding of the bulk queries failed.")
+
+        depth = max(app_setting.RERANK_CANDIDATES, TOP_K) if self.reranker is not None else TOP_K
+        results = self.qdrant.search_embeddings_batch(
+            collection_name="embeddings",
+            query_embeddings=vectors,
+            requests=[{"top_k": depth, "score_threshold": SCORE_THRESHOLD}] * len(pairs),
+            hydrator=self.hydrator,
+        )
+        for pair, query, retrieved in zip(pairs, queries, results):
+            if retrieved and self.reranker is not None:
+                retrieved, reranked = self.reranker.rerank(query=query, docs=retrieved)
+                if not reranked:
+                    retrieved = retrieved[:TOP_K]
+            self._contexts[pair] = retrieved
+        self.stats["retrievals"] += len(pairs)
+
+    def _generate(self, units: List[Tuple[str, str, Tuple[Tuple[str, str], ...]]]) -> None:
+        prompts, prompted = [], []
+        for unit in units:
+            parameter, value, weather = unit
+            retrieved = self._contexts[(parameter, value)]
+            if not retrieved:
+                self._answers[unit] = ("NoContext", "No context found for this parameter.")
+                continue
+            prompt, prompt_tokens = self.assembler.build_prompt(
+                docs=retrieved,
+                user_message=f"{parameter}: {value}",
+                weather=dict(weather),
+            )
+            prompts.append(prompt)
+            prompted.append(unit)
+            self.stats["prompt_tokens"] += prompt_tokens
+
+        for unit, advice in zip(prompted, self.llm.batch_response(prompts)):
+            if advice is None:
+                self._answers[unit] = ("Error", "Error generating advice.")
+            else:
+                self._answers[unit] = ("Processed", advice.strip())
+        self.stats["generations"] += len(prompts)
+
+    def _resolve(self, units: List[Tuple[str, str, Tuple[Tuple[str, str], ...]]]) -> None:
+        """Answers every unit not answered yet: precomputed table first (rows without weather), then retrieval and generation."""
+        units = [unit for unit in dict.fromkeys(units) if unit not in self._answers]
+        if not units:
+            return
+        self.stats["units"] += len(units)
+
+        if self.precomputed_store is not None:
+            # Precomputed advice is generated without weather, so only weatherless rows use it
+            pairs = [
+                pair for pair in dict.fromkeys(unit[:2] for unit in units if not unit[2])
+                if pair not in self._precomputed
+            ]
+            if pairs:
+                found = self.precomputed_store.lookup(pairs, self.model_version)
+                for parameter, value in pairs:
+                    self._precomputed[(parameter, value)] = found.get((normalize_term(parameter), normalize_term(value)))
+
+        live = []
+        for unit in units:
+            entry = None if unit[2] else self._precomputed.get(unit[:2])
+            if entry is not None:
+                self._answers[unit] = (entry["status"], entry["advice"])
+                self.stats["precomputed"] += 1
+            else:
+                live.append(unit)
+
+        pairs = [pair for pair in dict.fromkeys(unit[:2] for unit in live) if pair not in self._contexts]
+        if pairs:
+            self._retrieve(pairs)
+        if live:
+            self._generate(live)
+
+    def iter_rows(self, df: pd.DataFrame, window: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one result per (row, soil parameter), in row order. Rows are processed
+        in windows so results stream out while later rows are still pending.
+
+        Raises:
+            ValueError: If the table has no soil parameter column.
+        """
+        soil_columns, weather_columns, passthrough = classify_columns(df.columns)
+        if not soil_columns:
+            raise ValueError("No soil parameter column found.")
+
+        soil = normalize_columns(df, soil_columns, "soil")
+        weather = normalize_columns(df, weather_columns, "weather")
+        window = max(1, window or app_setting.BULK_CHAT_WINDOW)
+        log_info(
+            f"[BULK CHAT] {len(df)} row(s), soil columns {list(soil.columns)}, "
+            f"weather columns {list(weather.columns)}."
+        )
+
+        for start in range(0, len(df), window):
+            stop = min(start + window, len(df))
+            rows = []
+            for soil_row, weather_row in zip(
+                soil.iloc[start:stop].to_dict("records"), weather.iloc[start:stop].to_dict("records")
+            ):
+                row_weather = tuple((k, v) for k, v in weather_row.items() if isinstance(v, str))
+                rows.append([(k, v, row_weather) for k, v in soil_row.items() if isinstance(v, str)])
+
+            self._resolve([unit for row_units in rows for unit in row_units])
+
+            extras = df[passthrough].iloc[start:stop].to_dict("records")
+            for position, row_units, extra in zip(range(start, stop), rows, extras):
+                extra = {k: "" if pd.isna(v) else v for k, v in extra.items()}
+                if not row_units:
+                    log_warning(f"[BULK CHAT] Row {position + 1} has no soil value.")
+                for unit in row_units:
+                    status, advice = self._answers[unit]
+                    yield {**extra, "row": position + 1, "parameter": unit[0], "value": unit[1],
+                           "status": status, "advice": advice}
+
+            self.stats["rows"] = stop
+            log_debug(f"[BULK CHAT] {self.stats}")
+
+        log_info(f"[BULK CHAT] Done: {self.stats}")
@@ -0,0 +1,251 @@
+import os
+import re
+import sys
+import zlib
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_debug
+    from helpers import get_settings, Settings
+    from dbs import add_chunk_signatures, fetch_band_matches
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+
+MASK32 = np.uint64(0xFFFFFFFF)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+class ChunkDeduplicator:
+    """
+    Finds exact and near-duplicate chunks.
+
+    Exact duplicates share the SHA-1 of their normalized text. Near duplicates are
+    found with MinHash signatures over word shingles, bucketed by LSH banding and
+    confirmed when the estimated Jaccard similarity reaches the threshold.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Band keys of different parameters never collide in the stored index
+        self.scheme = f"{num_perm}:{bands}:{shingle_size}:{seed}".encode("ascii")
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercases and strips punctuation and repeated whitespace."""
+        return _NON_WORD.sub(" ", text.lower()).strip()
+
+    @classmethod
+    def content_hash(cls, text: str) -> str:
+        """SHA-1 of the normalized text, shared by exact duplicates."""
+        return hashlib.sha1(cls.normalize(text).encode("utf-8")).hexdigest()
+
+    def signature(self, normalized: str) -> np.ndarray:
+        """MinHash signature of a normalized text's word shingles."""
+        words = normalized.split()
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        values = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        hashed = (np.outer(values, self._a) + self._b) & MASK32
+        return hashed.min(axis=0)
+
+    def band_keys(self, sig: np.ndarray) -> List[bytes]:
+        """LSH band keys of a signature; texts sharing any key are candidate duplicates."""
+        return [
+            hashlib.sha1(self.scheme + bytes([band]) + sig[band * self.rows:(band + 1) * self.rows].tobytes()).digest()[:16]
+            for band in range(self.bands)
+        ]
+
+    def is_similar(self, sig: np.ndarray, other: np.ndarray) -> bool:
+        """True when the estimated Jaccard similarity of two signatures reaches the threshold."""
+        return float(np.mean(sig == other)) >= self.threshold
+
+    def find_duplicates(self, texts: List[str]) -> Tuple[List[str], List[Optional[int]]]:
+        """
+        Maps every text to its canonical text.
+
+        Args:
+            texts (List[str]): Chunk texts in storage order.
+
+        Returns:
+            Tuple[List[str], List[Optional[int]]]: Content hash of every text, and the
+            index of its canonical text (None when the text is canonical itself).
+        """
+        hashes = [self.content_hash(t) for t in texts]
+        canonical_of: List[Optional[int]] = [None] * len(texts)
+        first_by_hash: Dict[str, int] = {}
+        buckets: Dict[bytes, List[int]] = {}
+        signatures: Dict[int, np.ndarray] = {}
+
+        for i, text in enumerate(texts):
+            if hashes[i] in first_by_hash:
+                canonical_of[i] = first_by_hash[hashes[i]]
+                continue
+            first_by_hash[hashes[i]] = i
+
+            normalized = self.normalize(text)
+            if not normalized:
+                continue
+            sig = self.signature(normalized)
+
+            keys = self.band_keys(sig)
+            match = None
+            for key in keys:
+                for candidate in buckets.get(key, ()):
+                    if self.is_similar(signatures[candidate], sig):
+                        match = candidate
+                        break
+                if match is not None:
+                    break
+
+            if match is not None:
+                canonical_of[i] = match
+                continue
+
+            signatures[i] = sig
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+
+        return hashes, canonical_of
+
+
+def make_deduplicator(app_settings: Settings) -> ChunkDeduplicator:
+    """ChunkDeduplicator with the DEDUP_* settings."""
+    return ChunkDeduplicator(
+        threshold=app_settings.DEDUP_THRESHOLD,
+        num_perm=app_settings.DEDUP_NUM_PERM,
+        bands=app_settings.DEDUP_BANDS,
+    )
+
+
+def mark_duplicates(df: pd.DataFrame, app_settings: Settings = get_settings()) -> pd.DataFrame:
+    """
+    Dedup stage of the chunking pipeline.
+
+    Adds ``content_hash`` and ``canonical_hash`` columns. Duplicate rows keep their
+    page/source/author provenance but their text is dropped and ``canonical_hash``
+    points at the canonical chunk's ``content_hash``.
+    """
+    if df.empty:
+        return df
+
+    deduplicator = make_deduplicator(app_settings)
+    hashes, canonical_of = deduplicator.find_duplicates(df["text"].tolist())
+
+    df = df.copy()
+    df["content_hash"] = hashes
+    df["canonical_hash"] = [hashes[c] if c is not None else None for c in canonical_of]
+    duplicated = df["canonical_hash"].notna()
+    df.loc[duplicated, "text"] = ""
+
+    log_info(f"Dedup stage: {int(duplicated.sum())} of {len(df)} chunk(s) are duplicates.")
+    return df
+
+
+def _canonical_signatures(df: pd.DataFrame, deduplicator: ChunkDeduplicator) -> Dict[int, np.ndarray]:
+    """MinHash signature of every canonical row with text, by row label."""
+    signatures = {}
+    for label, text in df.loc[df["canonical_hash"].isna(), "text"].items():
+        normalized = deduplicator.normalize(text or "")
+        if normalized:
+            signatures[label] = deduplicator.signature(normalized)
+    return signatures
+
+
+def mark_stored_duplicates(conn: sqlite3.Connection, df: pd.DataFrame, app_settings: Settings = get_settings()) -> pd.DataFrame:
+    """
+    Marks canonical rows of a new batch that are already stored as references to
+    the stored chunk: exact copies by content hash in the 'chunks' table, near
+    copies (a reprint, a lightly edited edition) through the MinHash band index
+    that index_chunk_signatures keeps for every stored canonical chunk.
+    """
+    if df.empty or "content_hash" not in df:
+        return df
+
+    candidates = df.loc[df["canonical_hash"].isna(), "content_hash"].unique().tolist()
+    stored = set()
+    try:
+        for start in range(0, len(candidates), 500):
+            batch = candidates[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT content_hash FROM chunks WHERE canonical_hash IS NULL AND content_hash IN ({placeholders})",
+                batch,
+            ).fetchall()
+            stored.update(row[0] for row in rows)
+    except sqlite3.Error as e:
+        log_error(f"Failed to look up stored chunk hashes: {e}")
+        return df
+
+    df = df.copy()
+    already_stored = df["canonical_hash"].isna() & df["content_hash"].isin(stored)
+    df.loc[already_stored, "canonical_hash"] = df.loc[already_stored, "content_hash"]
+    df.loc[already_stored, "text"] = ""
+
+    deduplicator = make_deduplicator(app_settings)
+    signatures = _canonical_signatures(df, deduplicator)
+    keys = {label: deduplicator.band_keys(sig) for label, sig in signatures.items()}
+    try:
+        matches = fetch_band_matches(conn, (key for row_keys in keys.values() for key in row_keys))
+    except sqlite3.Error as e:
+        log_error(f"Failed to look up stored MinHash bands: {e}")
+        matches = {}
+
+    near = 0
+    stored_signatures = {h: np.frombuffer(sig, dtype=np.uint64) for h, sig in matches.items()}
+    for label, sig in signatures.items():
+        match = next((h for h, other in stored_signatures.items() if deduplicator.is_similar(sig, other)), None)
+        if match is not None and match != df.at[label, "content_hash"]:
+            df.at[label, "canonical_hash"] = match
+            df.at[label, "text"] = ""
+            near += 1
+
+    log_debug(f"{int(already_stored.sum())} exact and {near} near-duplicate chunk(s) already stored, kept as references.")
+    return df
+
+
+def index_chunk_signatures(conn: sqlite3.Connection, df: pd.DataFrame, app_settings: Settings = get_settings()) -> int:
+    """
+    Adds the canonical chunks of a stored batch to the MinHash band index, so later
+    uploads can be matched against them by mark_stored_duplicates.
+
+    Returns:
+        int: Number of newly indexed chunks.
+    """
+    if df.empty or "content_hash" not in df:
+        return 0
+
+    deduplicator = make_deduplicator(app_settings)
+    signatures = _canonical_signatures(df, deduplicator)
+    return add_chunk_signatures(conn, (
+        (df.at[label, "content_hash"], sig.tobytes(), deduplicator.band_keys(sig))
+        for label, sig in signatures.items()
+    ))
+
+
+def count_duplicates(df: pd.DataFrame) -> int:
+    """Number of rows stored as references to a canonical chunk."""
+    if df.empty or "canonical_hash" not in df:
+        return 0
+    return int(df["canonical_hash"].notna().sum())
@@ -0,0 +1,162 @@
+import os
+import sys
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_debug
+    from helpers import get_settings, Settings
+    from dbs import SQLitePool, ChunkTextHydrator, search_chunks_fts
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuses ranked id lists: every list adds 1 / (k + rank) to each id it holds.
+
+    Returns:
+        List[Tuple[int, float]]: (id, fused score) pairs, best first.
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def filters_to_sql(filters) -> Tuple[Optional[str], Tuple]:
+    """
+    Translates retrieval filters (schemes.RetrievalFilters) into a condition on the
+    'chunks_resolved' columns (alias c), mirroring StartQdrant.build_filter.
+    """
+    if filters is None:
+        return None, ()
+
+    conditions, params = [], []
+    if filters.sources:
+        # Payloads hold the file name, SQLite the stored path
+        conditions.append("(" + " OR ".join("c.sources = ? OR c.sources LIKE ?" for _ in filters.sources) + ")")
+        for source in filters.sources:
+            params.extend((source, f"%/{source}"))
+    for column, values in (("crop", filters.crops), ("region", filters.regions)):
+        if values:
+            conditions.append(f"c.{column} IN ({', '.join('?' * len(values))})")
+            params.extend(v.strip().lower() for v in values)
+    if filters.year_from is not None:
+        conditions.append("c.year >= ?")
+        params.append(filters.year_from)
+    if filters.year_to is not None:
+        conditions.append("c.year <= ?")
+        params.append(filters.year_to)
+
+    return (" AND ".join(conditions) if conditions else None), tuple(params)
+
+
+class HybridRetriever:
+    """
+    Runs the FTS5 lexical search and the Qdrant vector search concurrently and
+    fuses both rankings with reciprocal rank fusion.
+
+    Exact terms ("pH 6.5", "K2O") that embeddings blur are caught by the lexical
+    side, so a smaller fused top-k carries the same evidence as a large vector top-k.
+    """
+
+    def __init__(
+        self,
+        qdrant,
+        pool: SQLitePool,
+        hydrator: ChunkTextHydrator,
+        collection_name: str = "embeddings",
+        app_settings: Settings = get_settings()
+    ):
+        self.qdrant = qdrant
+        self.pool = pool
+        self.hydrator = hydrator
+        self.collection_name = collection_name
+        self.rrf_k = app_settings.HYBRID_RRF_K
+        self.candidates = app_settings.HYBRID_CANDIDATES
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-retriever")
+
+    def _lexical(self, query: str, limit: int, filters) -> List[int]:
+        where, params = filters_to_sql(filters)
+        with self.pool.connection() as conn:
+            return [row[0] for row in search_chunks_fts(conn, query, limit=limit, where=where, params=params)]
+
+    def _vector(self, query_embedding, limit: int, score_threshold: float, filters, search_params) -> List[Dict[str, Any]]:
+        return self.qdrant.search_embeddings(
+            collection_name=self.collection_name,
+            query_embedding=query_embedding,
+            top_k=limit,
+            score_threshold=score_threshold,
+            hydrator=self.hydrator,
+            query_filter=self.qdrant.build_filter(filters),
+            search_params=search_params
+        )
+
+    def retrieve(
+        self,
+        query: str,
+        query_embedding,
+        top_k: int = 5,
+        score_threshold: float = 0.0,
+        filters=None,
+        search_params=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Hybrid search for one query.
+
+        Args:
+            query (str): Query text for the lexical side.
+            query_embedding: Query vector for the vector side.
+            top_k (int): Number of fused results to return.
+            score_threshold (float): Minimum cosine similarity for vector candidates.
+            filters (RetrievalFilters, optional): Applied to both sides.
+            search_params (SearchParams, optional): Vector search options.
+
+        Returns:
+            list[dict]: Results shaped like search_embeddings (text, score, id), where
+            score is the fused RRF score.
+        """
+        depth = max(top_k, self.candidates)
+        vector_future = self._executor.submit(
+            self._vector, query_embedding, depth, score_threshold, filters, search_params
+        )
+        lexical_future = self._executor.submit(self._lexical, query, depth, filters)
+
+        vector_hits = vector_future.result()
+        try:
+            lexical_ids = lexical_future.result()
+        except sqlite3.Error as e:
+            log_error(f"[HYBRID] Lexical search failed, using vector results only: {e}")
+            lexical_ids = []
+
+        fused = reciprocal_rank_fusion(
+            [[int(hit["id"]) for hit in vector_hits], lexical_ids], k=self.rrf_k
+        )[:top_k]
+
+        texts = {int(hit["id"]): hit["text"] for hit in vector_hits}
+        missing = [chunk_id for chunk_id, _ in fused if chunk_id not in texts]
+        if missing:
+            texts.update(self.hydrator.hydrate(missing))
+
+        results = [
+            {"text": texts[chunk_id], "score": score, "id": chunk_id}
+            for chunk_id, score in fused
+            if chunk_id in texts
+        ]
+        log_debug(
+            f"[HYBRID] {len(vector_hits)} vector + {len(lexical_ids)} lexical candidate(s) "
+            f"fused into {len(results)} result(s)."
+        )
+        return results
+
+    def close(self) -> None:
+        """Shuts down the worker threads."""
+        self._executor.shutdown(wait=False)
+        log_info("[HYBRID] Retriever closed.")
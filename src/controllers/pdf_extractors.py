@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+import hashlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_community.document_loaders import PyPDFLoader
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_debug
+    from helpers import get_settings, Settings
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+
+class IPDFExtractor(ABC):
+    """
+    Abstract base class for PDF text extraction backends.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def extract_pages(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Extracts the text of every page of a PDF.
+
+        Args:
+            file_path (str): Path to the PDF file.
+
+        Returns:
+            List[Dict[str, Any]]: One item per page with "text" and "metadata"
+            (at least "source", "page" and "author").
+        """
+        pass
+
+
+class PyPDFExtractor(IPDFExtractor):
+    """
+    Default backend, langchain's pure Python ``PyPDFLoader``.
+    """
+
+    name = "pypdf"
+
+    def extract_pages(self, file_path: str) -> List[Dict[str, Any]]:
+        documents = PyPDFLoader(file_path).load()
+        return [{"text": doc.page_content, "metadata": dict(doc.metadata)} for doc in documents]
+
+
+class PyMuPDFExtractor(IPDFExtractor):
+    """
+    Native MuPDF backend (``pip install pymupdf``).
+    """
+
+    name = "pymupdf"
+
+    def extract_pages(self, file_path: str) -> List[Dict[str, Any]]:
+        import fitz  # pylint: disable=import-outside-toplevel
+
+        pages = []
+        with fitz.open(file_path) as pdf:
+            info = pdf.metadata or {}
+            for index, page in enumerate(pdf):
+                pages.append({
+                    "text": page.get_text(),
+                    "metadata": {
+                        "source": file_path,
+                        "page": index,
+                        "total_pages": pdf.page_count,
+                        "author": info.get("author", ""),
+                        "creationdate": info.get("creationDate", ""),
+                    },
+                })
+        return pages
+
+
+class PdfiumExtractor(IPDFExtractor):
+    """
+    Native PDFium backend (``pip install pypdfium2``).
+    """
+
+    name = "pdfium"
+
+    def extract_pages(self, file_path: str) -> List[Dict[str, Any]]:
+        import pypdfium2 as pdfium  # pylint: disable=import-outside-toplevel
+
+        pages = []
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            info = pdf.get_metadata_dict()
+            total_pages = len(pdf)
+            for index in range(total_pages):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                pages.append({
+                    "text": textpage.get_text_range(),
+                    "metadata": {
+                        "source": file_path,
+                        "page": index,
+                        "total_pages": total_pages,
+                        "author": info.get("Author", ""),
+                        "creationdate": info.get("CreationDate", ""),
+                    },
+                })
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        return pages
+
+
+PDF_EXTRACTORS = {
+    PyPDFExtractor.name: PyPDFExtractor,
+    PyMuPDFExtractor.name: PyMuPDFExtractor,
+    PdfiumExtractor.name: PdfiumExtractor,
+}
+
+
+def get_pdf_extractor(name: str) -> IPDFExtractor:
+    """
+    Returns an extractor instance by its registered name.
+
+    Raises:
+        ValueError: If no extractor is registered under that name.
+    """
+    extractor_cls = PDF_EXTRACTORS.get(name.lower())
+    if extractor_cls is None:
+        raise ValueError(f"Unsupported PDF extractor: {name}. Options: {list(PDF_EXTRACTORS)}")
+    return extractor_cls()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted page text keyed by file content hash and backend,
+    so re-chunking the same PDF never parses it again.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def file_digest(file_path: str) -> str:
+        """Returns the SHA-256 hex digest of a file's content."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _path(self, digest: str, extractor_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.{extractor_name}.json")
+
+    def get(self, digest: str, extractor_name: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(digest, extractor_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log_error(f"Corrupt extraction cache entry {path}: {e}")
+            return None
+
+    def put(self, digest: str, extractor_name: str, pages: List[Dict[str, Any]]) -> None:
+        path = self._path(digest, extractor_name)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(pages, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log_error(f"Failed to write extraction cache entry {path}: {e}")
+
+
+def load_pdf_documents(file_path: str, app_settings: Settings = get_settings()) -> List[Document]:
+    """
+    Extracts a PDF into one langchain Document per page with the configured
+    backend, reusing cached page text when the file content was seen before.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        app_settings (Settings): Application settings.
+
+    Returns:
+        List[Document]: Page documents ready for splitting.
+    """
+    extractor = get_pdf_extractor(app_settings.PDF_EXTRACTOR)
+    cache = ExtractionCache(app_settings.EXTRACTION_CACHE_DIR) if app_settings.EXTRACTION_CACHE_DIR else None
+
+    pages = None
+    digest = None
+    if cache:
+        digest = cache.file_digest(file_path)
+        pages = cache.get(digest, extractor.name)
+        if pages is not None:
+            log_debug(f"Extraction cache hit for {file_path} ({extractor.name})")
+
+    if pages is None:
+        pages = extractor.extract_pages(file_path)
+        if cache:
+            cache.put(digest, extractor.name, pages)
+
+    documents = []
+    for page in pages:
+        metadata = dict(page["metadata"])
+        metadata["source"] = file_path
+        documents.append(Document(page_content=page["text"], metadata=metadata))
+    return documents
+
+
+if __name__ == "__main__":
+    # Benchmark: pages per second for every installed backend on the same corpus
+    app_settings = get_settings()
+    corpus = [
+        os.path.join(app_settings.LOC_DOC, f)
+        for f in sorted(os.listdir(app_settings.LOC_DOC))
+        if Path(f).suffix.lower() == ".pdf"
+    ]
+    print(f"Corpus: {len(corpus)} PDF file(s) from {app_settings.LOC_DOC}")
+
+    for name in PDF_EXTRACTORS:
+        extractor = get_pdf_extractor(name)
+        total_pages = 0
+        start = time.perf_counter()
+        try:
+            for file in corpus:
+                total_pages += len(extractor.extract_pages(file))
+        except ImportError as e:
+            print(f"{name:>8}: not installed ({e})")
+            continue
+        elapsed = time.perf_counter() - start
+        rate = total_pages / elapsed if elapsed else 0.0
+        print(f"{name:>8}: {total_pages} pages in {elapsed:.2f}s -> {rate:.1f} pages/s")
@@ -1,9 +1,10 @@
 import os
+import re
 import sys
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import pandas as pd
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 try:
@@ -12,17 +13,127 @@ try:
 
     from logs import log_error, log_info, log_debug
     from helpers import get_settings, Settings
+    from .pdf_extractors import load_pdf_documents
+    from .chunk_dedup import mark_duplicates
 except ImportError as ie:
     print(f"ImportError in {__file__}: {ie}")
     raise
 
 
-def from_doc_to_chunks(file_path: Optional[str] = None, app_settings: Settings = get_settings()) -> pd.DataFrame:
+def build_splitter(app_settings: Settings, tokenizer: Optional[Any] = None, max_tokens: Optional[int] = None) -> RecursiveCharacterTextSplitter:
+    """
+    Builds the text splitter for the configured chunking mode.
+
+    In "tokens" mode chunks are measured with the embedding model's tokenizer and
+    sized to its max sequence length (minus the two special tokens), so nothing
+    is truncated at encode time. Falls back to character mode without a tokenizer.
+    """
+    if app_settings.CHUNKING_MODE == "tokens":
+        if tokenizer is not None and max_tokens:
+            return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+                tokenizer,
+                chunk_size=max_tokens - 2,
+                chunk_overlap=app_settings.CHUNK_TOKEN_OVERLAP
+            )
+        log_debug("Token chunking requested without a tokenizer, falling back to characters.")
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=app_settings.FILE_DEFAULT_CHUNK_SIZE,
+        chunk_overlap=app_settings.CHUNK_OVERLAP
+    )
+
+
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+
+
+def publication_year(metadata: Dict[str, Any]) -> Optional[int]:
+    """
+    Publication year from a page's PDF creation date ("D:20200131...", ISO
+    timestamps), None when the document carries no usable date.
+    """
+    match = _YEAR.search(str(metadata.get("creationdate") or ""))
+    return int(match.group()) if match else None
+
+
+def tag_chunks(
+    df: pd.DataFrame,
+    crop: Optional[str] = None,
+    region: Optional[str] = None,
+    year: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Sets the filterable crop / region / year metadata on every chunk of a batch.
+    Values left as None keep what the chunker extracted.
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+    if crop:
+        df["crop"] = crop.strip().lower()
+    if region:
+        df["region"] = region.strip().lower()
+    if year:
+        df["year"] = year
+    return df
+
+
+def chunks_to_frame(chunks: List[Any], tokenizer: Optional[Any] = None) -> pd.DataFrame:
+    """
+    One row per split document with its text, page, source, author, token count and
+    publication year. Year stays an object column of ints and None: a batch mixing
+    dated and undated files must not become float NaN, which JSON cannot carry.
+    """
+    texts, pages, sources, authors, years = [], [], [], [], []
+
+    for doc in chunks:
+        texts.append(doc.page_content)
+        meta = doc.metadata
+        pages.append(meta.get("page", -1))
+        sources.append(meta.get("source", ""))
+        authors.append(meta.get("author", ""))
+        years.append(publication_year(meta))
+
+    return pd.DataFrame({
+        "text": texts,
+        "pages": pages,
+        "sources": sources,
+        "authors": authors,
+        "token_count": count_tokens(tokenizer, texts) if tokenizer is not None else [None] * len(texts),
+        "year": pd.Series(years, dtype=object),
+    })
+
+
+def count_tokens(tokenizer: Any, texts: List[str]) -> List[int]:
+    """Counts tokens per text, special tokens included, as the embedding model sees them."""
+    if not texts:
+        return []
+    encoded = tokenizer(texts, add_special_tokens=True, truncation=False)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+
+def from_doc_to_chunks(
+    file_path: Optional[str] = None,
+    app_settings: Settings = get_settings(),
+    tokenizer: Optional[Any] = None,
+    max_tokens: Optional[int] = None,
+    deduplicate: bool = True,
+    raise_errors: bool = False
+) -> pd.DataFrame:
     """
     Loads and chunks documents from a file path or a folder defined in settings.
 
+    Args:
+        file_path (Optional[str]): Single file to chunk; all of LOC_DOC when omitted.
+        app_settings (Settings): Application settings.
+        tokenizer (Optional[Any]): Embedding model tokenizer, used for token chunking and counts.
+        max_tokens (Optional[int]): Embedding model max sequence length.
+        deduplicate (bool): Run the dedup stage when CHUNK_DEDUP is enabled.
+        raise_errors (bool): Raise when a file fails instead of logging it and moving on.
+
     Returns:
-        pd.DataFrame: DataFrame containing page content, page numbers, sources, and authors.
+        pd.DataFrame: DataFrame containing page content, page numbers, sources, authors,
+        token counts (None without a tokenizer) and publication years, plus content and
+        canonical hashes when deduplicated.
     """
     total_chunks = 0
 
@@ -44,26 +155,20 @@ def from_doc_to_chunks(file_path: Optional[str] = None, app_settings: Settings =
         return pd.DataFrame()
 
     all_chunks = []
+    splitter = build_splitter(app_settings, tokenizer=tokenizer, max_tokens=max_tokens)
 
     for file in files_to_process:
         try:
             extension = Path(file).suffix.lower().lstrip(".")
-            loader = None
 
             if extension == "pdf":
-                loader = PyPDFLoader(file)
+                documents = load_pdf_documents(file, app_settings=app_settings)
             elif extension == "txt":
-                loader = TextLoader(file, encoding="utf-8")
+                documents = TextLoader(file, encoding="utf-8").load()
             else:
                 log_debug(f"Unsupported file type: {extension}")
                 continue
 
-            documents = loader.load()
-
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=app_settings.FILE_DEFAULT_CHUNK_SIZE,
-                chunk_overlap=app_settings.CHUNK_OVERLAP
-            )
             chunks = splitter.split_documents(documents)
             all_chunks.extend(chunks)
 
@@ -72,26 +177,14 @@ def from_doc_to_chunks(file_path: Optional[str] = None, app_settings: Settings =
 
         except Exception as e:
             log_error(f"Error processing file {file}: {e}")
+            if raise_errors:
+                raise
             continue
 
     # Extract metadata and content
-    texts, pages, sources, authors = [], [], [], []
-
-    for doc in all_chunks:
-        texts.append(doc.page_content)
-        meta = doc.metadata
-        pages.append(meta.get("page", -1))
-        sources.append(meta.get("source", ""))
-        authors.append(meta.get("author", ""))
-
-    data = {
-        "text": texts,
-        "pages": pages,
-        "sources": sources,
-        "authors": authors,
-    }
-
-    df = pd.DataFrame(data)
+    df = chunks_to_frame(all_chunks, tokenizer)
+    if deduplicate and app_settings.CHUNK_DEDUP:
+        df = mark_duplicates(df, app_settings=app_settings)
     log_info(f"Total number of chunks processed: {total_chunks}")
     return df
 
@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_warning
+    from helpers import get_settings, Settings
+    from dbs import PrecomputedRecommendations, ChunkTextHydrator, normalize_term
+    from prompt import ContextAssembler
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+app_setting: Settings = get_settings()
+
+# Closed vocabulary of the categorical [SoilData] parameters; numeric ones (pH) are answered live
+SOIL_VOCABULARY: Dict[str, Tuple[str, ...]] = {
+    "Nitrogen": ("High", "Medium", "Low"),
+    "Phosphorus": ("High", "Medium", "Low"),
+    "Potassium": ("High", "Medium", "Low"),
+    "Soil Texture": ("Sandy", "Loamy", "Clay", "Silty", "Peaty", "Chalky"),
+    "Soil Moisture": ("Dry", "Moderate", "Wet"),
+    "Organic Matter": ("Poor", "Moderate", "Rich"),
+}
+
+# Retrieval settings of the default /chat pipeline
+TOP_K = 5
+SCORE_THRESHOLD = 0.3
+
+_job_lock = threading.Lock()
+
+
+def materialization_running() -> bool:
+    """Whether a materialization job currently holds the job lock."""
+    return _job_lock.locked()
+
+
+def claim_materialization() -> bool:
+    """
+    Takes the job lock without waiting, for a job that will run later (e.g. as a
+    background task). Returns False when another job holds it. The claimed job must
+    be run with ``claimed=True``, which releases the lock when it ends.
+    """
+    return _job_lock.acquire(blocking=False)
+
+
+def materialize_recommendations(
+    store: PrecomputedRecommendations,
+    qdrant,
+    embedding,
+    llm,
+    hydrator: Optional[ChunkTextHydrator] = None,
+    reranker=None,
+    vocabulary: Optional[Dict[str, Tuple[str, ...]]] = None,
+    force: bool = False,
+    claimed: bool = False
+) -> Dict[str, Any]:
+    """
+    Runs retrieval and generation once per known (parameter, value) pair and stores
+    the advice stamped with the current corpus version and the LLM config id.
+
+    Pairs already stored for both versions are skipped unless ``force`` is set.
+    Advice is generated without weather data and only served to requests that carry none.
+    With ``claimed`` the caller already holds the job lock from claim_materialization().
+
+    Returns:
+        Dict[str, Any]: Versions and counts of generated, skipped, context-less and failed pairs.
+
+    Raises:
+        RuntimeError: If another materialization is already running.
+    """
+    if not claimed and not claim_materialization():
+        raise RuntimeError("A materialization job is already running.")
+
+    try:
+        vocabulary = vocabulary or SOIL_VOCABULARY
+        version = store.corpus_version()
+        model_version = llm.config_id()
+        pairs = [(parameter, value) for parameter, values in vocabulary.items() for value in values]
+
+        existing = {} if force else store.lookup(pairs, model_version, version=version)
+        pending = [(p, v) for p, v in pairs if (normalize_term(p), normalize_term(v)) not in existing]
+        summary = {
+            "corpus_version": version,
+            "model_version": model_version,
+            "generated": 0,
+            "skipped": len(pairs) - len(pending),
+            "no_context": 0,
+            "failed": 0,
+        }
+        if not pending:
+            log_info("[PRECOMPUTE] Every pair is up to date.")
+            return summary
+
+        queries = [f"{parameter}: {value}" for parameter, value in pending]
+        vectors = embedding.embed_batch(texts=queries)
+        if vectors is None:
+            raise RuntimeError("Embedding of the vocabulary failed.")
+
+        depth = max(app_setting.RERANK_CANDIDATES, TOP_K) if reranker is not None else TOP_K
+        assembler = ContextAssembler(llm.count_tokens)
+        prompted, prompts = [], []
+
+        for (parameter, value), query, vector in zip(pending, queries, vectors):
+            retrieved = qdrant.search_embeddings(
+                collection_name="embeddings",
+                query_embedding=vector,
+                top_k=depth,
+                score_threshold=SCORE_THRESHOLD,
+                hydrator=hydrator
+            )
+            if retrieved and reranker is not None:
+                retrieved, reranked = reranker.rerank(query=query, docs=retrieved)
+                if not reranked:
+                    retrieved = retrieved[:TOP_K]
+
+            if not retrieved:
+                # Not stored: an empty answer may only mean the vectors are not there yet
+                summary["no_context"] += 1
+                continue
+
+            prompt, _ = assembler.build_prompt(docs=retrieved, user_message=query)
+            prompted.append((parameter, value, query, retrieved))
+            prompts.append(prompt)
+
+        # One batch, so the LLM client can batch or rate-limit the whole vocabulary
+        for (parameter, value, query, retrieved), advice in zip(prompted, llm.batch_response(prompts)):
+            if advice is None:
+                log_error(f"[PRECOMPUTE] LLM error for {query}")
+                summary["failed"] += 1
+                continue
+
+            store.store([(
+                parameter, value, version, model_version, "Processed", advice.strip(),
+                json.dumps([doc["id"] for doc in retrieved]),
+                datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+            )])
+            summary["generated"] += 1
+
+        log_info(
+            f"[PRECOMPUTE] {summary['generated']} generated, {summary['skipped']} up to date, "
+            f"{summary['no_context']} without context, {summary['failed']} failed (corpus {version}, model {model_version})."
+        )
+        if summary["failed"] or summary["no_context"]:
+            log_warning("[PRECOMPUTE] Failed pairs and pairs without context are answered live until the job is rerun.")
+        return summary
+
+    finally:
+        _job_lock.release()
+
@@ -1,14 +1,34 @@
 # Standard library
 import os
 import sys
+import json
 import subprocess
 import time
 import uuid
 
 # Third-party libraries
 import numpy as np
+import pandas as pd
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    MatchAny,
+    PayloadSchemaType,
+    PointStruct,
+    QuantizationSearchParams,
+    Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
+    VectorParams,
+)
 
 
 try:
@@ -22,6 +42,23 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Filterable payload fields and the index type Qdrant keeps for each
+PAYLOAD_INDEXES = {
+    "source": PayloadSchemaType.KEYWORD,
+    "crop": PayloadSchemaType.KEYWORD,
+    "region": PayloadSchemaType.KEYWORD,
+    "year": PayloadSchemaType.INTEGER,
+}
+
+# Speed/recall presets for search: hnsw_ef multiplier over QDRANT_HNSW_EF,
+# whether quantized hits are rescored with the original vectors, and oversampling factor
+SEARCH_MODES = {
+    "fast": {"ef_scale": 0.5, "rescore": False, "oversampling": 1.0},
+    "balanced": {"ef_scale": 1.0, "rescore": None, "oversampling": None},
+    "accurate": {"ef_scale": 4.0, "rescore": True, "oversampling": 3.0},
+}
+
+
 class StartQdrant:
     """
     StartQdrant is responsible for managing the initialization and connection to a local Qdrant vector database
@@ -49,6 +86,7 @@ class StartQdrant:
                 "docker", "run", "-d",  # Run in detached mode (background)
                 "-p", f"{self.app_setting.PORT}:{self.app_setting.PORT}",
                 "-v", f"{self.app_setting.VECTOR_DB}:/qdrant/storage",
+                "-v", f"{self.app_setting.QDRANT_SNAPSHOT_DIR}:/qdrant/snapshots",
                 "qdrant/qdrant"
             ]
 
@@ -110,27 +148,178 @@ class StartQdrant:
             log_error(f"[QDRANT CLIENT] Failed to initialize client: {e}")
             raise
 
-    def create_collection(self, collection_name: str, vector_size: int = 384) -> None:
+    def create_collection(
+        self,
+        collection_name: str,
+        vector_size: int = 384,
+        hnsw_m: int | None = None,
+        ef_construct: int | None = None,
+        on_disk: bool | None = None,
+        quantization: str | None = None,
+        recreate: bool = True
+    ) -> None:
         """
         Public method to create a collection in Qdrant with given name and vector configuration.
 
+        Index and storage options default to the QDRANT_* settings.
+
         Args:
             collection_name (str): The name of the Qdrant collection (e.g. 'chunks_metadata').
             vector_size (int): The size of the embedding vectors (default is 384 for MiniLM-type models).
+            hnsw_m (int): Edges per node in the HNSW graph; higher raises recall and memory.
+            ef_construct (int): Candidate list size while building the graph; higher builds a better graph, slower.
+            on_disk (bool): Keep the original vectors memory-mapped on disk instead of in RAM.
+            quantization (str): "none", "scalar" (int8, ~4x smaller) or "binary" (1 bit, ~32x smaller).
+            recreate (bool): Drop an existing collection of that name; when False it is kept as is.
 
         Raises:
             Exception: If the collection fails to create or if communication with Qdrant fails.
         """
         try:
-            vectors_config = VectorParams(size=vector_size, distance=Distance.COSINE)
+            if not recreate and self.client.collection_exists(collection_name=collection_name):
+                log_info(f"[QDRANT COLLECTION] '{collection_name}' already exists, keeping it.")
+                return
+
+            hnsw_m = hnsw_m or self.app_setting.QDRANT_HNSW_M
+            ef_construct = ef_construct or self.app_setting.QDRANT_HNSW_EF_CONSTRUCT
+            on_disk = self.app_setting.QDRANT_ON_DISK if on_disk is None else on_disk
+            quantization = (quantization or self.app_setting.QDRANT_QUANTIZATION).lower()
+
+            if quantization == "scalar":
+                quantization_config = ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=self.app_setting.QDRANT_QUANTIZATION_ALWAYS_RAM
+                    )
+                )
+            elif quantization == "binary":
+                quantization_config = BinaryQuantization(
+                    binary=BinaryQuantizationConfig(always_ram=self.app_setting.QDRANT_QUANTIZATION_ALWAYS_RAM)
+                )
+            elif quantization == "none":
+                quantization_config = None
+            else:
+                raise ValueError(f"Unsupported quantization: {quantization}. Options: none, scalar, binary")
+
+            vectors_config = VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=on_disk)
             self.client.recreate_collection(
                 collection_name=collection_name,
-                vectors_config=vectors_config
+                vectors_config=vectors_config,
+                hnsw_config=HnswConfigDiff(m=hnsw_m, ef_construct=ef_construct),
+                quantization_config=quantization_config
+            )
+            log_info(
+                f"[QDRANT COLLECTION] '{collection_name}' created with vector size {vector_size} "
+                f"(m={hnsw_m}, ef_construct={ef_construct}, on_disk={on_disk}, quantization={quantization})."
             )
-            log_info(f"[QDRANT COLLECTION] '{collection_name}' created with vector size {vector_size}.")
         except Exception as e:
             log_error(f"[QDRANT COLLECTION] Failed to create collection '{collection_name}': {e}")
             raise
+
+    def collection_state(self, collection_name: str) -> str:
+        """
+        Public method to fingerprint what a collection currently holds: point count,
+        lowest point id and vector config. Embedding, re-embedding, dropping or
+        restoring a snapshot changes it.
+
+        Returns:
+            str: The fingerprint, "missing" when the collection does not exist.
+        """
+        try:
+            if not self.client.collection_exists(collection_name=collection_name):
+                return "missing"
+            info = self.client.get_collection(collection_name=collection_name)
+            # Integer ids scroll in ascending order, so this is the lowest id
+            points, _ = self.client.scroll(
+                collection_name=collection_name, limit=1, with_payload=False, with_vectors=False
+            )
+            vectors = info.config.params.vectors
+            return (
+                f"{info.points_count}:{points[0].id if points else None}:"
+                f"{getattr(vectors, 'size', vectors)}:{getattr(vectors, 'distance', None)}"
+            )
+        except Exception as e:
+            log_error(f"[QDRANT COLLECTION] Failed to read the state of '{collection_name}': {e}")
+            raise
+
+    def build_search_params(self, search_mode: str = "balanced", hnsw_ef: int | None = None) -> SearchParams:
+        """
+        Public method to turn a speed/recall knob into Qdrant search parameters.
+
+        Args:
+            search_mode (str): "fast", "balanced", "accurate" (see SEARCH_MODES) or "exact",
+                a brute-force scan over the original vectors.
+            hnsw_ef (int): Explicit candidate list size, overriding the preset.
+
+        Raises:
+            ValueError: If the search mode is unknown.
+        """
+        if search_mode == "exact":
+            return SearchParams(exact=True, quantization=QuantizationSearchParams(ignore=True))
+
+        preset = SEARCH_MODES.get(search_mode)
+        if preset is None:
+            raise ValueError(f"Unsupported search mode: {search_mode}. Options: {[*SEARCH_MODES, 'exact']}")
+
+        rescore = self.app_setting.QDRANT_RESCORE if preset["rescore"] is None else preset["rescore"]
+        oversampling = preset["oversampling"] or self.app_setting.QDRANT_OVERSAMPLING
+        return SearchParams(
+            hnsw_ef=hnsw_ef or max(int(self.app_setting.QDRANT_HNSW_EF * preset["ef_scale"]), 1),
+            exact=False,
+            quantization=QuantizationSearchParams(ignore=False, rescore=rescore, oversampling=oversampling)
+        )
+
+    def create_payload_indexes(self, collection_name: str) -> None:
+        """
+        Public method to index the filterable payload fields (PAYLOAD_INDEXES), so that
+        filtered searches are resolved inside the HNSW traversal instead of post-filtering.
+
+        Args:
+            collection_name (str): The name of the Qdrant collection.
+
+        Raises:
+            Exception: If an index fails to create.
+        """
+        try:
+            for field_name, field_schema in PAYLOAD_INDEXES.items():
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+            log_info(f"[QDRANT INDEX] Payload indexes {list(PAYLOAD_INDEXES)} ready on '{collection_name}'.")
+        except Exception as e:
+            log_error(f"[QDRANT INDEX] Failed to create payload indexes on '{collection_name}': {e}")
+            raise
+
+    @staticmethod
+    def build_filter(filters) -> Filter | None:
+        """
+        Translates retrieval filters (schemes.RetrievalFilters) into a Qdrant Filter.
+        Every given field must match; values within a field are alternatives.
+
+        Returns:
+            Filter | None: None when no filter field is set.
+        """
+        if filters is None:
+            return None
+
+        must = []
+        for field_name, values, normalize in (
+            ("source", filters.sources, False),
+            ("crop", filters.crops, True),
+            ("region", filters.regions, True),
+        ):
+            if values:
+                values = [v.strip().lower() if normalize else v for v in values]
+                must.append(FieldCondition(key=field_name, match=MatchAny(any=values)))
+
+        if filters.year_from is not None or filters.year_to is not None:
+            must.append(FieldCondition(key="year", range=Range(gte=filters.year_from, lte=filters.year_to)))
+
+        return Filter(must=must) if must else None
+
     def insert_embedding(
         self,
         collection_name: str,
@@ -161,12 +350,46 @@ class StartQdrant:
             log_error(f"[QDRANT UPSERT] Failed to insert point: {e}")
             raise
     
+    def insert_embeddings(
+        self,
+        collection_name: str,
+        embeddings: list[list[float]] | np.ndarray,
+        ids: list[str | int],
+        payloads: list[dict] = None
+    ) -> None:
+        """
+        Inserts many embeddings into the specified Qdrant collection with one upsert.
+
+        Args:
+            collection_name (str): Target Qdrant collection name.
+            embeddings (list or np.ndarray): Vector embeddings, one per id.
+            ids (list[str|int]): Unique IDs for the vectors.
+            payloads (list[dict]): Optional metadata per vector.
+        """
+        try:
+            if isinstance(embeddings, np.ndarray):
+                embeddings = embeddings.tolist()
+            payloads = payloads or [{} for _ in ids]
+
+            points = [
+                PointStruct(id=id_, vector=vector, payload=payload or {})
+                for id_, vector, payload in zip(ids, embeddings, payloads)
+            ]
+            self.client.upsert(collection_name=collection_name, points=points)
+            log_info(f"[QDRANT UPSERT] Inserted {len(points)} point(s) into '{collection_name}'.")
+        except Exception as e:
+            log_error(f"[QDRANT UPSERT] Failed to insert points: {e}")
+            raise
+
     def search_embeddings(
         self,
         collection_name: str,
         query_embedding: list[float] | np.ndarray,
         top_k: int = 5,
-        score_threshold: float = 0.5
+        score_threshold: float = 0.5,
+        hydrator=None,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None
     ) -> list[dict]:
         """
         Search for similar embeddings in the collection and return top k results with text chunks.
@@ -176,6 +399,11 @@ class StartQdrant:
             query_embedding (list[float] | np.ndarray): The embedding vector to search with
             top_k (int): Number of top results to return
             score_threshold (float): Minimum similarity score to consider (0.0 to 1.0)
+            hydrator (ChunkTextHydrator, optional): Resolves the text of hits stored with
+                lean payloads (chunk id only) in one batched lookup
+            query_filter (Filter, optional): Payload filter applied during the search (see build_filter)
+            search_params (SearchParams, optional): hnsw_ef / exact / quantization options,
+                the "balanced" preset by default (see build_search_params)
         
         Returns:
             list[dict]: List of results containing:
@@ -196,29 +424,284 @@ class StartQdrant:
                 query_vector=query_embedding,
                 limit=top_k,
                 score_threshold=score_threshold,
+                query_filter=query_filter,
+                search_params=search_params or self.build_search_params(),
                 with_payload=True,
                 with_vectors=False
             )
             
-            # Format the results
-            results = []
-            for hit in search_results:
-                if hit.payload and "text" in hit.payload:
-                    results.append({
-                        "text": hit.payload["text"],
-                        "score": hit.score,
-                        "id": hit.id
-                    })
-                else:
-                    log_warning(f"Search result missing 'text' in payload: {hit}")
-            
-            log_info(f"[QDRANT SEARCH] Found {len(results)} results (requested {top_k})")
-            return results
-            
+            return self.__format_hits(search_results, hydrator)
+
         except Exception as e:
             log_error(f"[QDRANT SEARCH] Failed to search embeddings: {e}")
             raise
 
+    def search_embeddings_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list[float]] | np.ndarray,
+        requests: list[dict],
+        hydrator=None
+    ) -> list[list[dict]]:
+        """
+        Runs many searches in one multi-search call.
+
+        Args:
+            collection_name (str): Name of the Qdrant collection to search
+            query_embeddings (list[list[float]] | np.ndarray): One query vector per request
+            requests (list[dict]): Per-query options: top_k, score_threshold and optionally
+                query_filter and search_params (as for search_embeddings)
+            hydrator (ChunkTextHydrator, optional): Resolves lean-payload texts of every
+                query in a single batched lookup
+
+        Returns:
+            list[list[dict]]: Results per query, in request order, shaped as in search_embeddings.
+        """
+        try:
+            if isinstance(query_embeddings, np.ndarray):
+                query_embeddings = query_embeddings.tolist()
+
+            searches = [
+                SearchRequest(
+                    vector=vector,
+                    limit=request["top_k"],
+                    score_threshold=request.get("score_threshold"),
+                    filter=request.get("query_filter"),
+                    params=request.get("search_params") or self.build_search_params(),
+                    with_payload=True,
+                    with_vector=False
+                )
+                for vector, request in zip(query_embeddings, requests)
+            ]
+            batches = self.client.search_batch(collection_name=collection_name, requests=searches)
+
+            lean_ids = [chunk_id for hits in batches for chunk_id in self.__lean_ids(hits)]
+            texts = hydrator.hydrate(lean_ids) if lean_ids and hydrator is not None else {}
+            return [self.__format_hits(hits, texts=texts) for hits in batches]
+
+        except Exception as e:
+            log_error(f"[QDRANT SEARCH] Failed to run batch search of {len(requests)} queries: {e}")
+            raise
+
+    @staticmethod
+    def __lean_ids(hits) -> list:
+        """Chunk ids of the hits whose payload carries no text."""
+        return [
+            (hit.payload or {}).get("chunk_id", hit.id)
+            for hit in hits
+            if "text" not in (hit.payload or {})
+        ]
+
+    def __format_hits(self, hits, hydrator=None, texts: dict | None = None) -> list[dict]:
+        """
+        Internal method that turns search hits into result dicts, hydrating the text
+        of lean-payload hits with a single batched lookup (unless texts are given).
+        """
+        if texts is None:
+            lean_ids = self.__lean_ids(hits)
+            texts = hydrator.hydrate(lean_ids) if lean_ids and hydrator is not None else {}
+
+        results = []
+        for hit in hits:
+            payload = hit.payload or {}
+            text = payload.get("text")
+            if text is None:
+                text = texts.get(int(payload.get("chunk_id", hit.id)))
+            if text is None:
+                log_warning(f"Search result has no resolvable text: {hit.id}")
+                continue
+            results.append({
+                "text": text,
+                "score": hit.score,
+                "id": hit.id
+            })
+
+        log_info(f"[QDRANT SEARCH] Found {len(results)} results (requested {len(hits)})")
+        return results
+
+    def create_snapshot(self, collection_name: str) -> dict:
+        """
+        Public method to snapshot a collection on the Qdrant server.
+
+        Snapshots land in QDRANT_SNAPSHOT_DIR (mounted as /qdrant/snapshots), so the
+        files can be copied to another node and restored there.
+
+        Returns:
+            dict: Snapshot name, creation time and size in bytes.
+        """
+        try:
+            snapshot = self.client.create_snapshot(collection_name=collection_name, wait=True)
+            log_info(f"[QDRANT SNAPSHOT] Created '{snapshot.name}' for '{collection_name}' ({snapshot.size} bytes).")
+            return {"name": snapshot.name, "creation_time": snapshot.creation_time, "size": snapshot.size}
+        except Exception as e:
+            log_error(f"[QDRANT SNAPSHOT] Failed to snapshot '{collection_name}': {e}")
+            raise
+
+    def list_snapshots(self, collection_name: str) -> list[dict]:
+        """
+        Public method to list the snapshots of a collection, newest first.
+        """
+        try:
+            snapshots = self.client.list_snapshots(collection_name=collection_name)
+            items = [
+                {"name": s.name, "creation_time": s.creation_time, "size": s.size}
+                for s in snapshots
+            ]
+            return sorted(items, key=lambda item: item["creation_time"] or "", reverse=True)
+        except Exception as e:
+            log_error(f"[QDRANT SNAPSHOT] Failed to list snapshots of '{collection_name}': {e}")
+            raise
+
+    def restore_snapshot(self, collection_name: str, snapshot: str) -> None:
+        """
+        Public method to replace a collection with a snapshot.
+
+        Args:
+            collection_name (str): Collection to restore into; created if missing.
+            snapshot (str): File name of a snapshot in QDRANT_SNAPSHOT_DIR/<collection_name>.
+                URLs and paths are rejected, so the server only ever reads its own snapshot dir.
+
+        Raises:
+            ValueError: If snapshot is not a plain file name present in the snapshot dir.
+        """
+        try:
+            if not snapshot or "://" in snapshot or os.path.basename(snapshot) != snapshot or snapshot in (".", ".."):
+                raise ValueError(f"Snapshot must be a file name in the snapshot dir, got: {snapshot}")
+            local_path = os.path.join(self.app_setting.QDRANT_SNAPSHOT_DIR, collection_name, snapshot)
+            if not os.path.isfile(local_path):
+                raise ValueError(f"Snapshot not found in {os.path.dirname(local_path)}: {snapshot}")
+
+            location = f"file:///qdrant/snapshots/{collection_name}/{snapshot}"
+            self.client.recover_snapshot(collection_name=collection_name, location=location, wait=True)
+            log_info(f"[QDRANT SNAPSHOT] Restored '{collection_name}' from {location}.")
+        except Exception as e:
+            log_error(f"[QDRANT SNAPSHOT] Failed to restore '{collection_name}' from '{snapshot}': {e}")
+            raise
+
+    def export_collection(self, collection_name: str, out_dir: str, batch_size: int = 1024) -> int:
+        """
+        Public method to export every point of a collection to files:
+        ``vectors.npy`` (float32 matrix, memory-mappable), ``points.parquet``
+        (id and JSON payload per row, same order; needs pyarrow) and ``manifest.json``.
+
+        The vector file is sized from a count taken before scrolling; if points are
+        deleted meanwhile it is truncated to the rows actually read.
+
+        Args:
+            collection_name (str): Collection to export.
+            out_dir (str): Target directory, created if missing.
+            batch_size (int): Points read per scroll request.
+
+        Returns:
+            int: Number of exported points.
+        """
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            info = self.client.get_collection(collection_name=collection_name)
+            vector_params = info.config.params.vectors
+            total = self.client.count(collection_name=collection_name, exact=True).count
+
+            vectors_path = os.path.join(out_dir, "vectors.npy")
+            vectors = np.lib.format.open_memmap(
+                vectors_path, mode="w+", dtype=np.float32, shape=(total, vector_params.size)
+            )
+            ids, payloads = [], []
+            offset = None
+            while len(ids) < total:
+                points, offset = self.client.scroll(
+                    collection_name=collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True
+                )
+                points = points[:total - len(ids)]
+                if points:
+                    vectors[len(ids):len(ids) + len(points)] = np.asarray([p.vector for p in points], dtype=np.float32)
+                ids.extend(p.id for p in points)
+                payloads.extend(json.dumps(p.payload or {}, ensure_ascii=False) for p in points)
+                if offset is None:
+                    break
+            vectors.flush()
+            del vectors
+            if len(ids) < total:
+                log_warning(f"[QDRANT EXPORT] '{collection_name}' shrank during export: {len(ids)} of {total} point(s) read.")
+                self.__truncate_vectors(vectors_path, len(ids), batch_size)
+
+            pd.DataFrame({"id": [str(i) for i in ids], "payload": payloads}).to_parquet(
+                os.path.join(out_dir, "points.parquet"), index=False
+            )
+            with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump({
+                    "collection": collection_name,
+                    "count": len(ids),
+                    "vector_size": vector_params.size,
+                    "distance": str(vector_params.distance.value),
+                }, f, indent=2)
+
+            log_info(f"[QDRANT EXPORT] Exported {len(ids)} point(s) of '{collection_name}' to {out_dir}.")
+            return len(ids)
+        except Exception as e:
+            log_error(f"[QDRANT EXPORT] Failed to export '{collection_name}': {e}")
+            raise
+
+    @staticmethod
+    def __truncate_vectors(path: str, rows: int, batch_size: int) -> None:
+        """Internal method that rewrites a .npy vector file keeping only its first rows."""
+        source = np.load(path, mmap_mode="r")
+        tmp_path = f"{path}.tmp"
+        target = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=source.dtype, shape=(rows, source.shape[1]))
+        for start in range(0, rows, batch_size):
+            end = min(start + batch_size, rows)
+            target[start:end] = source[start:end]
+        target.flush()
+        del target, source
+        os.replace(tmp_path, path)
+
+    def import_collection(self, collection_name: str, in_dir: str, batch_size: int = 1024, recreate: bool = False) -> int:
+        """
+        Public method to load points written by export_collection into a collection,
+        without running the embedding model. Vectors are read memory-mapped.
+
+        Args:
+            collection_name (str): Target collection.
+            in_dir (str): Directory holding vectors.npy, points.parquet and manifest.json.
+            batch_size (int): Points per upsert.
+            recreate (bool): Drop and recreate the collection (with the configured index settings)
+                first. By default an existing collection is kept and the points are upserted into
+                it; a missing one is created.
+
+        Returns:
+            int: Number of imported points.
+        """
+        try:
+            with open(os.path.join(in_dir, "manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            vectors = np.load(os.path.join(in_dir, "vectors.npy"), mmap_mode="r")
+            points = pd.read_parquet(os.path.join(in_dir, "points.parquet"))
+            if len(points) != len(vectors):
+                raise ValueError(f"Export is inconsistent: {len(points)} payload row(s) for {len(vectors)} vector(s).")
+
+            self.create_collection(collection_name, vector_size=manifest["vector_size"], recreate=recreate)
+            self.create_payload_indexes(collection_name)
+
+            ids = [int(i) if i.isdigit() else i for i in points["id"].tolist()]
+            payloads = points["payload"].tolist()
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                self.insert_embeddings(
+                    collection_name,
+                    embeddings=np.asarray(vectors[start:end]),
+                    ids=ids[start:end],
+                    payloads=[json.loads(p) for p in payloads[start:end]]
+                )
+
+            log_info(f"[QDRANT IMPORT] Imported {len(ids)} point(s) into '{collection_name}' from {in_dir}.")
+            return len(ids)
+        except Exception as e:
+            log_error(f"[QDRANT IMPORT] Failed to import into '{collection_name}': {e}")
+            raise
+
 if __name__ == "__main__":
     try:
         # Initialize and set up Qdrant
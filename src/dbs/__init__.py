@@ -1,4 +1,10 @@
-from .db_engine import get_sqlite_engine
-from .db_tables import init_chunks_table, init_query_response_table
-from .db_insert import add_chunk, add_query_response
-from .db_query import fetch_all_rows
+from .db_engine import get_sqlite_engine, configure_connection, SQLitePool
+from .db_compression import encode_text, decode_text, get_codec
+from .db_tables import init_chunks_table, init_query_response_table, init_chat_interactions_table
+from .db_insert import add_chunk, add_chunks_bulk, add_query_response, add_query_responses, add_chat_interactions, CHUNK_COLUMNS
+from .db_query import fetch_all_rows, fetch_chat_history, iter_rows
+from .db_writer import ChatInteractionWriter
+from .db_hydrator import ChunkTextHydrator
+from .db_fts import init_chunks_fts, clear_chunks_fts, search_chunks_fts
+from .db_minhash import init_chunk_signatures_table, add_chunk_signatures, fetch_band_matches, clear_chunk_signatures
+from .db_precomputed import init_precomputed_table, corpus_version, normalize_term, PrecomputedRecommendations
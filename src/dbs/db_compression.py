@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import zlib
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_compression.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+# Compressed values are stored as BLOBs whose first byte names the codec;
+# plain TEXT values are left untouched, so both kinds of rows can coexist.
+CODEC_TAGS = {"zlib": 1, "zstd": 2, "lz4": 3}
+TAG_CODECS = {tag: name for name, tag in CODEC_TAGS.items()}
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+_codecs: Dict[str, Codec] = {}
+
+
+def _load_codec(name: str) -> Codec:
+    if name == "zlib":
+        return (lambda data: zlib.compress(data, 6)), zlib.decompress
+    if name == "zstd":
+        import zstandard  # pylint: disable=import-outside-toplevel
+        compressor = zstandard.ZstdCompressor(level=3)
+        decompressor = zstandard.ZstdDecompressor()
+        return compressor.compress, decompressor.decompress
+    if name == "lz4":
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+        return lz4.frame.compress, lz4.frame.decompress
+    raise ValueError(f"Unsupported chunk text codec: {name}. Options: none, {', '.join(CODEC_TAGS)}")
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Returns the (compress, decompress) pair of a codec.
+
+    zlib ships with Python; zstd needs ``pip install zstandard`` and lz4 needs
+    ``pip install lz4``.
+
+    Raises:
+        ValueError: If the codec is unknown.
+        ImportError: If the codec's package is not installed.
+    """
+    name = name.lower()
+    if name not in _codecs:
+        _codecs[name] = _load_codec(name)
+    return _codecs[name]
+
+
+def encode_text(text: Optional[str], codec: str) -> Any:
+    """
+    Compresses a chunk text for storage with the given codec ("none" keeps it as is).
+    Empty texts stay plain, they compress to nothing worth the tag byte.
+    """
+    if not text or codec == "none":
+        return text
+    compress, _ = get_codec(codec)
+    return bytes((CODEC_TAGS[codec],)) + compress(text.encode("utf-8"))
+
+
+def decode_text(value: Any) -> Any:
+    """
+    Returns the plain text of a stored chunk text, whatever codec wrote it.
+    """
+    if isinstance(value, bytes):
+        _, decompress = get_codec(TAG_CODECS[value[0]])
+        return decompress(value[1:]).decode("utf-8")
+    if value is None or isinstance(value, str):
+        return value
+    # Legacy 'text INTEGER' columns turn numeric-looking chunks into numbers
+    return str(value)
+
+
+def resolve_source_ids(conn: sqlite3.Connection, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """
+    Maps (source, author) pairs to their 'chunk_sources' ids, inserting unseen pairs.
+    Runs inside the caller's transaction.
+    """
+    unique = list(dict.fromkeys(pairs))
+    conn.executemany("INSERT OR IGNORE INTO chunk_sources (source, author) VALUES (?, ?)", unique)
+    ids: Dict[Tuple[str, str], int] = {}
+    for pair in unique:
+        row = conn.execute("SELECT id FROM chunk_sources WHERE source = ? AND author = ?", pair).fetchone()
+        ids[pair] = row[0]
+    log_debug(f"Resolved {len(ids)} chunk source(s).")
+    return ids
+
+
+if __name__ == "__main__":
+    # Benchmark: on-disk size and full-scan read throughput of the stored chunks per codec
+    import tempfile
+    from dbs.db_engine import get_sqlite_engine
+    from dbs.db_tables import init_chunks_table
+    from dbs.db_insert import add_chunks_bulk, CHUNK_COLUMNS
+    from dbs.db_query import iter_rows
+
+    source = get_sqlite_engine(app_setting.SQLITE_DB)
+    records = [
+        (decode_text(row[0]), *row[1:])
+        for row in source.execute(f"SELECT {', '.join(CHUNK_COLUMNS)} FROM chunks_resolved")
+    ]
+    source.close()
+    print(f"Corpus: {len(records)} chunk(s) from {app_setting.SQLITE_DB}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for codec in ("none", *CODEC_TAGS):
+            try:
+                if codec != "none":
+                    get_codec(codec)
+            except ImportError as e:
+                print(f"{codec:>5}: not installed ({e})")
+                continue
+
+            path = os.path.join(tmp, f"{codec}.db")
+            conn = get_sqlite_engine(path)
+            init_chunks_table(conn)
+            add_chunks_bulk(conn, records, codec=codec)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            conn.execute("VACUUM;")
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+
+            start = time.perf_counter()
+            count = sum(1 for _ in iter_rows(conn, "chunks_resolved", ["id", "text", "sources"]))
+            elapsed = time.perf_counter() - start
+            conn.close()
+
+            baseline = baseline or size_mb
+            print(
+                f"{codec:>5}: {size_mb:8.2f} MB ({size_mb / baseline:.2f}x), "
+                f"read {count / elapsed if elapsed else 0.0:,.0f} chunks/s"
+            )
@@ -1,7 +1,9 @@
 import os
 import sys
+import queue
 import sqlite3
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 FILE_LOCATION = f"{os.path.dirname(__file__)}/create_sqlite_engin.py"
 
@@ -18,6 +20,24 @@ except Exception as e:
 
 app_setting: Settings = get_settings()
 
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Applies the concurrency and caching pragmas to a connection:
+    WAL journaling (readers never block on the writer), synchronous=NORMAL,
+    a busy timeout instead of immediate "database is locked" errors,
+    a larger page cache and memory-mapped reads. Foreign keys are enforced,
+    so ON DELETE CASCADE clauses take effect.
+    """
+    conn.execute("PRAGMA foreign_keys=ON;")
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute(f"PRAGMA busy_timeout={app_setting.SQLITE_BUSY_TIMEOUT_MS};")
+    conn.execute(f"PRAGMA cache_size=-{app_setting.SQLITE_CACHE_SIZE_KB};")
+    conn.execute(f"PRAGMA mmap_size={app_setting.SQLITE_MMAP_SIZE_MB * 1024 * 1024};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    return conn
+
+
 def get_sqlite_engine(database: Optional[str] = None):
     """
     Creates a connection to an SQLite database.
@@ -27,9 +47,74 @@ def get_sqlite_engine(database: Optional[str] = None):
         if not database:
             database = app_setting.SQLITE_DB
         # Create a connection to the SQLite database
-        conn = sqlite3.connect(database=database)
-        log_info(f"Successfully connected to the database: {app_setting.SQLITE_DB}")
+        conn = sqlite3.connect(
+            database=database,
+            timeout=app_setting.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False
+        )
+        configure_connection(conn)
+        log_info(f"Successfully connected to the database: {database}")
         return conn
     except Exception as e:
         log_error(f"Filed to connect to the database: {e}")
         raise
+
+
+class SQLitePool:
+    """
+    Fixed-size pool of configured SQLite connections shared across request threads.
+
+    Each connection is used by one request at a time; with WAL journaling
+    concurrent readers proceed while a single writer commits.
+    """
+
+    def __init__(self, database: Optional[str] = None, size: Optional[int] = None):
+        self.database = database or app_setting.SQLITE_DB
+        self.size = size or app_setting.SQLITE_POOL_SIZE
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=self.size)
+
+        for _ in range(self.size):
+            self._pool.put(get_sqlite_engine(self.database))
+        log_info(f"SQLite pool ready with {self.size} connection(s) to {self.database}")
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Takes a connection from the pool, waiting up to SQLITE_POOL_TIMEOUT seconds.
+
+        Raises:
+            TimeoutError: If no connection is released in time.
+        """
+        try:
+            return self._pool.get(timeout=timeout or app_setting.SQLITE_POOL_TIMEOUT)
+        except queue.Empty as e:
+            raise TimeoutError("No SQLite connection available in the pool.") from e
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Rolls back any unfinished transaction and returns the connection to the pool."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            log_error(f"Failed to reset pooled SQLite connection: {e}")
+        self._pool.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager handing out a pooled connection."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Closes every idle connection in the pool."""
+        closed = 0
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            closed += 1
+        log_info(f"SQLite pool closed {closed} connection(s).")
@@ -0,0 +1,123 @@
+import os
+import re
+import sys
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_fts.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+    from .db_query import iter_rows
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+# Numbers keep their decimal part ("6.5") and symbols their digits ("K2O")
+_TERM = re.compile(r"\w+(?:[.,]\w+)*")
+MAX_QUERY_TERMS = 32
+
+
+def init_chunks_fts(conn: sqlite3.Connection) -> None:
+    """
+    Creates 'chunks_fts', a contentless FTS5 index over the chunk text keyed by
+    chunk id. The text itself lives only in 'chunks'; when the index is new, the
+    chunks stored so far are indexed.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks_fts'"
+    ).fetchone()
+    if exists:
+        return
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE chunks_fts USING fts5(
+            text,
+            content='',
+            tokenize='porter unicode61'
+        );
+    """)
+    rows = iter_rows(conn, "chunks", ["id", "text"], where="canonical_hash IS NULL AND text != ''")
+    count = index_chunks(conn, rows)
+    conn.commit()
+    log_info(f"Table 'chunks_fts' created, {count} stored chunk(s) indexed.")
+
+
+def index_chunks(conn: sqlite3.Connection, rows: Iterable[Tuple[int, str]]) -> int:
+    """
+    Adds (chunk id, plain text) rows to 'chunks_fts' inside the caller's transaction.
+    Empty texts (duplicates stored as references) are skipped.
+    """
+    rows = [(chunk_id, text) for chunk_id, text in rows if text]
+    conn.executemany("INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)", rows)
+    return len(rows)
+
+
+def clear_chunks_fts(conn: sqlite3.Connection) -> None:
+    """Empties 'chunks_fts', e.g. when the chunks table is reset."""
+    try:
+        conn.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('delete-all')")
+        conn.commit()
+        log_info("All records deleted from table 'chunks_fts'.")
+    except sqlite3.Error as e:
+        log_error(f"SQLite error while clearing 'chunks_fts': {e}")
+        raise
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 MATCH expression: every term becomes a quoted
+    phrase (so "6.5" matches the adjacent tokens 6 and 5) and terms are OR-ed,
+    leaving the ranking to bm25. None when the text holds no searchable term.
+    """
+    terms = list(dict.fromkeys(_TERM.findall(text.lower())))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search_chunks_fts(
+    conn: sqlite3.Connection,
+    text: str,
+    limit: int = 20,
+    where: Optional[str] = None,
+    params: Tuple = ()
+) -> List[Tuple[int, float]]:
+    """
+    Lexical search over the chunk text, best match first.
+
+    Args:
+        conn (sqlite3.Connection): SQLite connection.
+        text (str): Free-text query.
+        limit (int): Maximum number of hits.
+        where (Optional[str]): Extra SQL condition on the 'chunks_resolved' columns (alias c).
+        params (Tuple): Parameters bound to placeholders in ``where``.
+
+    Returns:
+        List[Tuple[int, float]]: (chunk id, bm25 score) pairs; lower scores rank higher.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+
+    query = "SELECT f.rowid, bm25(chunks_fts) AS score FROM chunks_fts AS f"
+    bind: List = [match]
+    if where:
+        query += " JOIN chunks_resolved AS c ON c.id = f.rowid"
+    query += " WHERE chunks_fts MATCH ?"
+    if where:
+        query += f" AND ({where})"
+        bind.extend(params)
+    query += " ORDER BY score LIMIT ?"
+    bind.append(limit)
+
+    rows = conn.execute(query, bind).fetchall()
+    log_debug(f"FTS search returned {len(rows)} hit(s) for: {match}")
+    return rows
@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_hydrator.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+    from .db_engine import SQLitePool
+    from .db_compression import decode_text
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+
+class ChunkTextHydrator:
+    """
+    Resolves chunk ids to chunk text for vectors stored with lean payloads.
+
+    Hot chunks are served from an in-process LRU; every other id of a search is
+    read with a single ``WHERE id IN (...)`` query, so hydration costs at most one
+    round trip per search regardless of top_k.
+    """
+
+    def __init__(self, pool: SQLitePool, cache_size: Optional[int] = None):
+        self.pool = pool
+        self.cache_size = cache_size if cache_size is not None else app_setting.CHUNK_TEXT_CACHE_SIZE
+        self._cache: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def hydrate(self, ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Returns the text of every given chunk id that exists in the 'chunks' table.
+        """
+        ids = list(dict.fromkeys(int(i) for i in ids))
+        found: Dict[int, str] = {}
+
+        with self._lock:
+            for chunk_id in ids:
+                text = self._cache.get(chunk_id)
+                if text is not None:
+                    self._cache.move_to_end(chunk_id)
+                    found[chunk_id] = text
+            self._hits += len(found)
+            self._misses += len(ids) - len(found)
+
+        missing = [i for i in ids if i not in found]
+        if not missing:
+            return found
+
+        try:
+            placeholders = ", ".join("?" * len(missing))
+            with self.pool.connection() as conn:
+                rows = conn.execute(f"SELECT id, text FROM chunks WHERE id IN ({placeholders})", missing).fetchall()
+        except Exception as e:
+            log_error(f"[HYDRATOR] Failed to load {len(missing)} chunk text(s): {e}")
+            raise
+
+        loaded = {row[0]: decode_text(row[1]) for row in rows}
+        found.update(loaded)
+
+        with self._lock:
+            for chunk_id, text in loaded.items():
+                self._cache[chunk_id] = text
+                self._cache.move_to_end(chunk_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        log_debug(f"[HYDRATOR] Loaded {len(loaded)} chunk text(s), {len(ids) - len(missing)} from cache.")
+        return found
+
+    def clear(self) -> None:
+        """Drops every cached text, e.g. after the chunks table was reset."""
+        with self._lock:
+            self._cache.clear()
+        log_info("[HYDRATOR] Cache cleared.")
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters."""
+        with self._lock:
+            return {"cached": len(self._cache), "capacity": self.cache_size, "hits": self._hits, "misses": self._misses}
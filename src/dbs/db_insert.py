@@ -1,7 +1,12 @@
 import os
 import sys
+import time
 import sqlite3
 import json
+from collections.abc import Mapping
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
 import pandas as pd
 
 from pydantic import ValidationError
@@ -15,26 +20,134 @@ try:
 
     from logs import log_debug, log_error, log_info
     from helpers import get_settings, Settings
+    from .db_compression import encode_text, resolve_source_ids
+    from .db_fts import index_chunks
 except Exception as e:
     msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
     raise ImportError(msg)
 
 app_setting: Settings = get_settings()
 
-def add_chunk(conn: sqlite3.Connection, data: pd.DataFrame):
+CHUNK_COLUMNS = (
+    "text", "pages", "sources", "authors", "token_count", "content_hash", "canonical_hash",
+    "crop", "region", "year",
+)
+
+ChunkRecord = Union[Mapping[str, Any], Sequence[Any]]
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection, name: str) -> Iterator[None]:
     """
-    Inserts a DataFrame of chunks (with page_counten, pages, sources, authors) into the 'chunks' table.
+    Runs a write as one atomic unit. On its own it is a BEGIN IMMEDIATE transaction
+    (the write lock is taken up front, so row ids within it are contiguous). Inside a
+    transaction the caller already has open, it becomes a savepoint instead: a failure
+    undoes only this write and the caller still decides whether to commit.
     """
-    cursor = conn.cursor()
-
+    nested = conn.in_transaction
+    conn.execute(f"SAVEPOINT {name}" if nested else "BEGIN IMMEDIATE")
     try:
-        data.to_sql("chunks", conn, if_exists='append', index=False)
-
+        yield
+    except BaseException:
+        if nested:
+            conn.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            conn.execute(f"RELEASE SAVEPOINT {name}")
+        else:
+            conn.rollback()
+        raise
+    if nested:
+        conn.execute(f"RELEASE SAVEPOINT {name}")
+    else:
         conn.commit()
-        log_info(f"Inserted {len(data)} chunk(s) into 'chunks' table.")
+
+
+def _chunk_row(record: ChunkRecord) -> tuple:
+    """Turns a mapping or a positional sequence (CHUNK_COLUMNS order) into a bind tuple."""
+    if type(record) is tuple and len(record) == len(CHUNK_COLUMNS):
+        return record
+    if isinstance(record, Mapping):
+        return tuple(record.get(column) for column in CHUNK_COLUMNS)
+    row = tuple(record)
+    return row + (None,) * (len(CHUNK_COLUMNS) - len(row))
+
+
+def add_chunks_bulk(
+    conn: sqlite3.Connection,
+    records: Iterable[ChunkRecord],
+    batch_size: Optional[int] = None,
+    codec: Optional[str] = None
+) -> List[int]:
+    """
+    Inserts chunk records into the 'chunks' table with prepared executemany batches
+    inside a single transaction, or inside the caller's transaction when one is open
+    (committing it is then left to the caller).
+
+    With CHUNK_FTS enabled the plain text is also added to the 'chunks_fts' index
+    in the same transaction. With a codec other than "none" the text is stored compressed and sources/authors
+    are normalized into 'chunk_sources'; read such rows through 'chunks_resolved'
+    and the query helpers, which decompress transparently.
+
+    Args:
+        conn (sqlite3.Connection): SQLite connection.
+        records (Iterable[ChunkRecord]): Any iterable of mappings keyed by column name or
+            sequences in CHUNK_COLUMNS order; consumed lazily, so generators can stream in.
+        batch_size (Optional[int]): Rows per executemany call, CHUNK_INSERT_BATCH_SIZE by default.
+        codec (Optional[str]): Text codec ("none", "zlib", "zstd", "lz4"), CHUNK_TEXT_CODEC by default.
+
+    Returns:
+        List[int]: The row ids assigned to the records, in input order.
+
+    Raises:
+        sqlite3.Error: If the insert fails; everything it wrote is rolled back.
+    """
+    batch_size = batch_size or app_setting.CHUNK_INSERT_BATCH_SIZE
+    codec = (codec or app_setting.CHUNK_TEXT_CODEC).lower()
+    columns = CHUNK_COLUMNS if codec == "none" else CHUNK_COLUMNS + ("source_id",)
+    sql = f"INSERT INTO chunks ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    rows = map(_chunk_row, records)
+    ids: List[int] = []
+
+    try:
+        with _write_transaction(conn, "add_chunks_bulk"):
+            cursor = conn.cursor()
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                texts = [row[0] for row in batch]
+                if codec != "none":
+                    source_ids = resolve_source_ids(conn, ((row[2] or "", row[3] or "") for row in batch))
+                    batch = [
+                        (encode_text(row[0], codec), row[1], "", "", *row[4:], source_ids[(row[2] or "", row[3] or "")])
+                        for row in batch
+                    ]
+                cursor.executemany(sql, batch)
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                batch_ids = range(last_id - len(batch) + 1, last_id + 1)
+                if app_setting.CHUNK_FTS:
+                    # Same transaction, so the lexical index never drifts from the table
+                    index_chunks(conn, zip(batch_ids, texts))
+                ids.extend(batch_ids)
+        log_info(f"Inserted {len(ids)} chunk(s) into 'chunks' table.")
+        return ids
     except Exception as e:
-        log_error(f"Error inserting chunk(s): {e}")
-        conn.rollback()
+        log_error(f"Error bulk inserting chunk(s): {e}")
+        raise
+
+
+def add_chunk(conn: sqlite3.Connection, data: pd.DataFrame) -> List[int]:
+    """
+    Inserts a DataFrame of chunks (with text, pages, sources, authors) into the 'chunks' table.
+
+    Returns:
+        List[int]: The assigned row ids.
+
+    Raises:
+        sqlite3.Error: If the insert fails; nothing of the batch is stored.
+    """
+    # Column-wise tolist() yields native Python values; NaN binds as NULL in SQLite
+    columns = [data[c].tolist() if c in data else [None] * len(data) for c in CHUNK_COLUMNS]
+    return add_chunks_bulk(conn=conn, records=zip(*columns))
 
 
 def add_query_response(conn: sqlite3.Connection, query, response, user_id: str):
@@ -75,4 +188,111 @@ def add_query_response(conn: sqlite3.Connection, query, response, user_id: str):
         log_error(f"Validation failed for query-response pair: {ve}")
     except Exception as e:
         log_error(f"Error inserting query-response pair: {e}")
-        conn.rollback()
\ No newline at end of file
+        conn.rollback()
+
+
+def add_query_responses(conn: sqlite3.Connection, records: List[tuple]) -> int:
+    """
+    Inserts many (user_id, query, response) records into the 'query_responses'
+    table in a single transaction.
+
+    Returns:
+        int: Number of inserted records.
+
+    Raises:
+        sqlite3.Error: If the insert fails; the transaction is rolled back.
+    """
+    try:
+        conn.executemany("""
+            INSERT INTO query_responses (user_id, query, response)
+            VALUES (?, ?, ?)
+        """, records)
+        conn.commit()
+        return len(records)
+    except Exception as e:
+        log_error(f"Error inserting {len(records)} query-response record(s): {e}")
+        conn.rollback()
+        raise
+
+
+def add_chat_interactions(conn: sqlite3.Connection, records: List[tuple]) -> int:
+    """
+    Inserts many chat interactions into 'chat_interactions', with one
+    'chat_recommendations' row per parameter, in a single transaction (or in the
+    caller's transaction when one is open).
+
+    Args:
+        conn (sqlite3.Connection): SQLite connection.
+        records (List[tuple]): (user_id, query, model_name, config_id, created_at, recommendations)
+            tuples, where recommendations is a list of dicts with parameter, value, status, advice
+            and prompt_tokens (optional).
+
+    Returns:
+        int: Number of inserted interactions.
+
+    Raises:
+        sqlite3.Error: If the insert fails; everything it wrote is rolled back.
+    """
+    if not records:
+        return 0
+
+    try:
+        # Interaction ids within the write are contiguous, see _write_transaction
+        with _write_transaction(conn, "add_chat_interactions"):
+            conn.executemany("""
+                INSERT INTO chat_interactions (user_id, query, model_name, config_id, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [record[:5] for record in records])
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+            recommendation_rows = [
+                (
+                    interaction_id,
+                    item.get("parameter"),
+                    None if item.get("value") is None else str(item.get("value")),
+                    item.get("status"),
+                    item.get("advice"),
+                    item.get("prompt_tokens"),
+                )
+                for interaction_id, record in zip(range(last_id - len(records) + 1, last_id + 1), records)
+                for item in record[5]
+            ]
+            conn.executemany("""
+                INSERT INTO chat_recommendations (interaction_id, parameter, value, status, advice, prompt_tokens)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, recommendation_rows)
+        return len(records)
+    except Exception as e:
+        log_error(f"Error inserting {len(records)} chat interaction(s): {e}")
+        raise
+
+if __name__ == "__main__":
+    # Benchmark: pandas to_sql vs add_chunks_bulk on fresh WAL-configured database files
+    import tempfile
+    from dbs.db_engine import get_sqlite_engine
+    from dbs.db_tables import init_chunks_table
+
+    total = 100_000
+    df = pd.DataFrame({
+        "text": [f"Chunk {i} about soil nitrogen, phosphorus and potassium levels." * 4 for i in range(total)],
+        "pages": [i % 300 for i in range(total)],
+        "sources": [f"/docs/bulletin_{i % 50}.pdf" for i in range(total)],
+        "authors": ["Extension Service"] * total,
+        "token_count": [64] * total,
+    })
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label in ("to_sql", "bulk", "stream"):
+            conn = get_sqlite_engine(os.path.join(tmp_dir, f"{label}.db"))
+            init_chunks_table(conn)
+            start = time.perf_counter()
+            if label == "to_sql":
+                df.to_sql("chunks", conn, if_exists="append", index=False)
+                conn.commit()
+            elif label == "bulk":
+                add_chunk(conn, df)
+            else:
+                add_chunks_bulk(conn, ({"text": t, "pages": 0, "sources": "s", "authors": "a"} for t in df["text"]))
+            elapsed = time.perf_counter() - start
+            print(f"{label:>7}: {total / elapsed:,.0f} rows/s")
+            conn.close()
@@ -0,0 +1,103 @@
+import os
+import sys
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_minhash.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from .db_insert import _write_transaction
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+# Bound parameters per IN (...) lookup, under SQLite's default variable limit
+LOOKUP_BATCH = 500
+
+
+def init_chunk_signatures_table(conn: sqlite3.Connection) -> None:
+    """
+    Creates the near-duplicate index of stored chunks: 'chunk_minhash' holds the
+    MinHash signature of every canonical chunk, 'chunk_minhash_bands' its LSH band
+    keys, so a new chunk finds its candidates without scanning stored text.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_minhash (
+            content_hash TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        );
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chunk_minhash_bands (
+            band_key BLOB NOT NULL,
+            content_hash TEXT NOT NULL
+        );
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chunk_minhash_bands_key ON chunk_minhash_bands (band_key);")
+
+
+def add_chunk_signatures(conn: sqlite3.Connection, entries: Iterable[Tuple[str, bytes, List[bytes]]]) -> int:
+    """
+    Stores (content hash, signature, band keys) entries in one transaction, or in
+    the caller's open transaction. Hashes already indexed are left unchanged.
+
+    Returns:
+        int: Number of newly indexed chunks.
+    """
+    added = 0
+    with _write_transaction(conn, "add_chunk_signatures"):
+        for content_hash, signature, band_keys in entries:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO chunk_minhash (content_hash, signature) VALUES (?, ?)",
+                (content_hash, signature),
+            )
+            if cursor.rowcount:
+                conn.executemany(
+                    "INSERT INTO chunk_minhash_bands (band_key, content_hash) VALUES (?, ?)",
+                    [(key, content_hash) for key in band_keys],
+                )
+                added += 1
+    log_debug(f"Indexed MinHash signatures of {added} chunk(s).")
+    return added
+
+
+def fetch_band_matches(conn: sqlite3.Connection, band_keys: Iterable[bytes]) -> Dict[str, bytes]:
+    """
+    Stored chunks sharing at least one LSH band key with the given keys.
+
+    Returns:
+        Dict[str, bytes]: Signature of every candidate, by content hash.
+    """
+    keys = list(dict.fromkeys(band_keys))
+    matches: Dict[str, bytes] = {}
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        batch = keys[start:start + LOOKUP_BATCH]
+        placeholders = ", ".join("?" * len(batch))
+        rows = conn.execute(
+            f"""
+            SELECT m.content_hash, m.signature FROM chunk_minhash AS m
+            WHERE m.content_hash IN (
+                SELECT content_hash FROM chunk_minhash_bands WHERE band_key IN ({placeholders})
+            )
+            """,
+            batch,
+        ).fetchall()
+        matches.update(rows)
+    return matches
+
+
+def clear_chunk_signatures(conn: sqlite3.Connection) -> None:
+    """Empties the near-duplicate index, e.g. when the chunks table is reset."""
+    try:
+        conn.execute("DELETE FROM chunk_minhash_bands")
+        conn.execute("DELETE FROM chunk_minhash")
+        conn.commit()
+        log_info("All records deleted from tables 'chunk_minhash' and 'chunk_minhash_bands'.")
+    except sqlite3.Error as e:
+        log_error(f"SQLite error while clearing the MinHash index: {e}")
+        raise
@@ -0,0 +1,179 @@
+import os
+import sys
+import time
+import hashlib
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_precomputed.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+    from .db_engine import SQLitePool
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+# How long a read of the vector collection state is reused by lookups
+VECTOR_STATE_TTL_S = 5.0
+
+
+def normalize_term(text: Any) -> str:
+    """Lower-cases and collapses whitespace, so 'Soil  Texture' and 'soil texture' share a key."""
+    return " ".join(str(text).split()).lower()
+
+
+def init_precomputed_table(conn: sqlite3.Connection) -> None:
+    """
+    Creates 'precomputed_recommendations': advice materialized offline for the known
+    (parameter, value) vocabulary, stamped with the corpus and model versions it was
+    generated from. The unique key doubles as the lookup index.
+    """
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS precomputed_recommendations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                parameter TEXT NOT NULL,
+                value TEXT NOT NULL,
+                corpus_version TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                status TEXT NOT NULL,
+                advice TEXT NOT NULL,
+                chunk_ids TEXT,
+                created_at TEXT NOT NULL,
+                UNIQUE (corpus_version, model_version, parameter, value)
+            );
+        """)
+        conn.commit()
+        log_info("Table 'precomputed_recommendations' created successfully.")
+    except Exception as e:
+        log_error(f"Error creating 'precomputed_recommendations' table: {e}")
+        raise
+
+
+def corpus_version(conn: sqlite3.Connection, vector_state: str = "") -> str:
+    """
+    Stamp of the chunk corpus, the vectors and the embedding model. Chunk ids are
+    AUTOINCREMENT, so any ingest or reset moves the id range; both bounds come from
+    the primary key and cost two index seeks. ``vector_state`` (StartQdrant.collection_state)
+    changes when the vectors are embedded, rebuilt or restored from a snapshot.
+    """
+    low, high = conn.execute("SELECT MIN(id), MAX(id) FROM chunks").fetchone()
+    stamp = f"{low}:{high}:{vector_state}:{app_setting.EMBEDDING_MODEL}"
+    return hashlib.sha1(stamp.encode("utf-8")).hexdigest()[:16]
+
+
+class PrecomputedRecommendations:
+    """
+    Read/write access to 'precomputed_recommendations' through the connection pool.
+    Lookups only return entries for the current corpus version and the given model
+    version, so stale advice is never served after a re-ingest, a re-embed, a
+    snapshot restore or a model change.
+    """
+
+    def __init__(self, pool: SQLitePool, qdrant=None, collection_name: str = "embeddings"):
+        self.pool = pool
+        self.qdrant = qdrant
+        self.collection_name = collection_name
+        self._vector_state = ("", 0.0)
+
+    def vector_state(self) -> str:
+        """State of the vector collection, re-read at most every VECTOR_STATE_TTL_S seconds."""
+        if self.qdrant is None:
+            return ""
+        state, read_at = self._vector_state
+        if time.monotonic() - read_at > VECTOR_STATE_TTL_S:
+            state = self.qdrant.collection_state(self.collection_name)
+            self._vector_state = (state, time.monotonic())
+        return state
+
+    def corpus_version(self) -> str:
+        with self.pool.connection() as conn:
+            return corpus_version(conn, self.vector_state())
+
+    def lookup(
+        self,
+        items: Iterable[Tuple[Any, Any]],
+        model_version: str,
+        version: Optional[str] = None
+    ) -> Dict[Tuple[str, str], Dict[str, str]]:
+        """
+        Returns the stored entries for the given (parameter, value) pairs.
+
+        Args:
+            items (Iterable[Tuple[Any, Any]]): Pairs as parsed from the query.
+            model_version (str): LLM config id (ILLMsGenerators.config_id).
+            version (Optional[str]): Corpus version; read from the database when None.
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, str]]: {(parameter, value): {"status", "advice"}}
+            keyed by the normalized pair; pairs without an entry are absent.
+        """
+        keys = list(dict.fromkeys((normalize_term(p), normalize_term(v)) for p, v in items))
+        if not keys:
+            return {}
+
+        conditions = " OR ".join("(parameter = ? AND value = ?)" for _ in keys)
+        vector_state = self.vector_state() if version is None else ""
+        with self.pool.connection() as conn:
+            version = version or corpus_version(conn, vector_state)
+            rows = conn.execute(f"""
+                SELECT parameter, value, status, advice
+                FROM precomputed_recommendations
+                WHERE corpus_version = ? AND model_version = ? AND ({conditions})
+            """, [version, model_version, *[term for key in keys for term in key]]).fetchall()
+
+        found = {(row[0], row[1]): {"status": row[2], "advice": row[3]} for row in rows}
+        log_debug(f"[PRECOMPUTED] {len(found)} of {len(keys)} parameter(s) found.")
+        return found
+
+    def store(self, records: List[tuple]) -> int:
+        """
+        Inserts or replaces entries.
+
+        Args:
+            records (List[tuple]): (parameter, value, corpus_version, model_version, status,
+                advice, chunk_ids, created_at) tuples; parameter and value are normalized here.
+
+        Returns:
+            int: Number of stored entries.
+        """
+        if not records:
+            return 0
+
+        rows = [(normalize_term(r[0]), normalize_term(r[1]), *r[2:]) for r in records]
+        with self.pool.connection() as conn:
+            try:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO precomputed_recommendations
+                        (parameter, value, corpus_version, model_version, status, advice, chunk_ids, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            except sqlite3.Error as e:
+                log_error(f"[PRECOMPUTED] Failed to store {len(rows)} entr(ies): {e}")
+                conn.rollback()
+                raise
+        return len(rows)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Entry counts per (corpus_version, model_version), newest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT corpus_version, model_version, COUNT(*), MAX(created_at)
+                FROM precomputed_recommendations
+                GROUP BY corpus_version, model_version
+                ORDER BY MAX(created_at) DESC
+            """).fetchall()
+        return [
+            {"corpus_version": row[0], "model_version": row[1], "entries": row[2], "created_at": row[3]}
+            for row in rows
+        ]
+
@@ -3,7 +3,7 @@
 import os
 import sys
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 
 # Setup path and logging
 FILE_LOCATION = f"{os.path.dirname(__file__)}/pull_from_table.py"
@@ -13,38 +13,109 @@ try:
     sys.path.append(MAIN_DIR)
 
     from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+    from .db_compression import decode_text
 except Exception as e:
     raise ImportError(f"Import Error in {FILE_LOCATION}: {e}")
 
+app_setting: Settings = get_settings()
+
+def iter_rows(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: Sequence[str],
+    where: Optional[str] = None,
+    params: Sequence[Any] = (),
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None,
+    id_column: str = "id",
+    decode_columns: Sequence[str] = ("text",)
+) -> Iterator[tuple]:
+    """
+    Streams rows of a table in id order, ``page_size`` rows per ``fetchmany``,
+    so memory stays constant regardless of table size.
+
+    Args:
+        conn (sqlite3.Connection): SQLite connection.
+        table_name (str): Target table to read from.
+        columns (Sequence[str]): Columns to project, in tuple order.
+        where (Optional[str]): Optional SQL condition to filter rows on.
+        params (Sequence[Any]): Parameters bound to placeholders in ``where``.
+        after_id (Optional[int]): Resume after this id (keyset ``WHERE id > ?``).
+        page_size (Optional[int]): Rows per fetchmany call, DB_FETCH_PAGE_SIZE by default.
+        id_column (str): Integer key the rows are ordered and resumed on.
+        decode_columns (Sequence[str]): Columns holding possibly compressed chunk text,
+            returned decompressed.
+
+    Yields:
+        tuple: One row with the projected columns.
+    """
+    page_size = page_size or app_setting.DB_FETCH_PAGE_SIZE
+    conditions = []
+    bind: List[Any] = []
+    if where:
+        conditions.append(f"({where})")
+        bind.extend(params)
+    if after_id is not None:
+        conditions.append(f"{id_column} > ?")
+        bind.append(after_id)
+
+    query = f"SELECT {', '.join(columns)} FROM {table_name}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {id_column}"
+
+    decode_at = [i for i, column in enumerate(columns) if column in decode_columns]
+
+    cursor = conn.execute(query, bind)
+    try:
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            if not decode_at:
+                yield from rows
+                continue
+            for row in rows:
+                row = list(row)
+                for i in decode_at:
+                    row[i] = decode_text(row[i])
+                yield tuple(row)
+    finally:
+        cursor.close()
+
+
 def fetch_all_rows(
     conn: sqlite3.Connection,
     table_name: str,
     columns: List[str],
-    rely_data: str = "text"
+    rely_data: str = "text",
+    where: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Pulls data from a specified table in the SQLite database.
 
+    Loads every matching row into memory; use ``iter_rows`` to stream large tables.
+
     Args:
         conn (sqlite3.Connection): SQLite connection.
         table_name (str): Target table to pull from.
-        columns (List[str]): List of columns to select.
+        columns (List[str]): List of columns to select; the first is the data column,
+            the second the id, any further ones are returned under their own names.
         rely_data (str): Label key for the first selected column.
+        where (Optional[str]): Optional SQL condition to filter rows on.
 
     Returns:
         List[Dict[str, Any]]: List of records with 'id' and selected data.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name}")
-        rows = cursor.fetchall()
-
-        log_info(f"Pulled {len(rows)} row(s) from table '{table_name}'.")
-
+        extra_columns = columns[2:]
         result = [
-            {"id": row[1], rely_data: row[0]} for row in rows
+            {"id": row[1], rely_data: row[0], **dict(zip(extra_columns, row[2:]))}
+            for row in iter_rows(conn, table_name, columns, where=where, id_column=columns[1])
         ]
 
+        log_info(f"Pulled {len(result)} row(s) from table '{table_name}'.")
         return result
 
     except Exception as e:
@@ -52,3 +123,75 @@ def fetch_all_rows(
         return []
     finally:
         log_debug("Executed pull_from_table.")
+
+
+def fetch_chat_history(
+    conn: sqlite3.Connection,
+    user_id: str,
+    limit: int = 20,
+    before: Optional[Tuple[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reads one page of a user's chat interactions, newest first, with keyset
+    pagination on (created_at, id) so every page is an index range scan.
+
+    Args:
+        conn (sqlite3.Connection): SQLite connection.
+        user_id (str): User whose history is read.
+        limit (int): Maximum number of interactions to return.
+        before (Optional[Tuple[str, int]]): (created_at, id) of the last interaction of
+            the previous page; None for the first page.
+
+    Returns:
+        List[Dict[str, Any]]: Interactions with their per-parameter recommendations.
+    """
+    try:
+        query = """
+            SELECT id, query, model_name, config_id, created_at
+            FROM chat_interactions
+            WHERE user_id = ?
+        """
+        params: List[Any] = [user_id]
+        if before is not None:
+            query += " AND (created_at, id) < (?, ?)"
+            params.extend(before)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        interactions = [
+            {
+                "id": row[0],
+                "query": row[1],
+                "model_name": row[2],
+                "config_id": row[3],
+                "created_at": row[4],
+                "recommendations": [],
+            }
+            for row in conn.execute(query, params)
+        ]
+        if not interactions:
+            return interactions
+
+        by_id = {item["id"]: item for item in interactions}
+        placeholders = ", ".join("?" * len(by_id))
+        rows = conn.execute(f"""
+            SELECT interaction_id, parameter, value, status, advice, prompt_tokens
+            FROM chat_recommendations
+            WHERE interaction_id IN ({placeholders})
+            ORDER BY id
+        """, list(by_id)).fetchall()
+        for interaction_id, parameter, value, status, advice, prompt_tokens in rows:
+            by_id[interaction_id]["recommendations"].append({
+                "parameter": parameter,
+                "value": value,
+                "status": status,
+                "advice": advice,
+                "prompt_tokens": prompt_tokens,
+            })
+
+        log_debug(f"Pulled {len(interactions)} interaction(s) for user {user_id}.")
+        return interactions
+
+    except Exception as e:
+        log_error(f"Failed to pull chat history for user {user_id}: {e}")
+        raise
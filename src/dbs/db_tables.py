@@ -12,23 +12,79 @@ try:
 
     from logs import log_debug, log_error, log_info
     from helpers import get_settings, Settings
+    from .db_fts import init_chunks_fts
+    from .db_minhash import init_chunk_signatures_table
 except Exception as e:
     msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
     raise ImportError(msg)
 
 app_setting: Settings = get_settings()
 
+def add_missing_columns(conn: sqlite3.Connection, table_name: str, columns: dict):
+    """
+    Adds the given columns ({name: declaration}) to an existing table when absent,
+    so databases created before a schema change keep working.
+    """
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+    for name, declaration in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {name} {declaration}")
+            log_info(f"Added column '{name}' to table '{table_name}'.")
+
+
 def init_chunks_table(conn: sqlite3.Connection):
     try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                author TEXT NOT NULL,
+                UNIQUE (source, author)
+            );
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS chunks (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text INTEGER NOT NULL,
+                text TEXT NOT NULL,
                 pages TEXT NOT NULL,
                 sources TEXT NOT NULL,
-                authors TEXT NOT NULL
+                authors TEXT NOT NULL,
+                token_count INTEGER,
+                content_hash TEXT,
+                canonical_hash TEXT,
+                source_id INTEGER REFERENCES chunk_sources (id),
+                crop TEXT,
+                region TEXT,
+                year INTEGER
             );
         """)
+        add_missing_columns(conn, "chunks", {
+            "token_count": "INTEGER",
+            "content_hash": "TEXT",
+            "canonical_hash": "TEXT",
+            "source_id": "INTEGER REFERENCES chunk_sources (id)",
+            "crop": "TEXT",
+            "region": "TEXT",
+            "year": "INTEGER",
+        })
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_token_count ON chunks (token_count);")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_content_hash ON chunks (content_hash);")
+        # Rows written in compressed mode keep sources/authors in 'chunk_sources';
+        # the view is recreated so it follows columns added above
+        conn.execute("DROP VIEW IF EXISTS chunks_resolved;")
+        conn.execute("""
+            CREATE VIEW chunks_resolved AS
+            SELECT c.id, c.text, c.pages,
+                   COALESCE(s.source, c.sources) AS sources,
+                   COALESCE(s.author, c.authors) AS authors,
+                   c.token_count, c.content_hash, c.canonical_hash,
+                   c.crop, c.region, c.year
+            FROM chunks AS c
+            LEFT JOIN chunk_sources AS s ON s.id = c.source_id;
+        """)
+        if app_setting.CHUNK_FTS:
+            init_chunks_fts(conn)
+        init_chunk_signatures_table(conn)
         conn.commit()
         log_info("Table 'chunks' created successfully.")
     except Exception as e:
@@ -50,3 +106,53 @@ def init_query_response_table(conn: sqlite3.Connection):
     except Exception as e:
         log_error(f"Error creating 'query_responses' table: {e}")
         raise
+
+
+def init_chat_interactions_table(conn: sqlite3.Connection):
+    """
+    Creates the structured chat history tables: one 'chat_interactions' row per
+    request and one 'chat_recommendations' row per soil parameter, indexed for
+    per-user history reads and per-parameter analytics.
+    """
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_interactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                query TEXT NOT NULL,
+                model_name TEXT,
+                config_id TEXT,
+                created_at TEXT NOT NULL
+            );
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_recommendations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                interaction_id INTEGER NOT NULL REFERENCES chat_interactions (id) ON DELETE CASCADE,
+                parameter TEXT NOT NULL,
+                value TEXT,
+                status TEXT NOT NULL,
+                advice TEXT,
+                prompt_tokens INTEGER
+            );
+        """)
+        add_missing_columns(conn, "chat_recommendations", {
+            "prompt_tokens": "INTEGER",
+        })
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chat_interactions_user_created
+            ON chat_interactions (user_id, created_at, id);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chat_recommendations_interaction
+            ON chat_recommendations (interaction_id);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chat_recommendations_parameter
+            ON chat_recommendations (parameter, status);
+        """)
+        conn.commit()
+        log_info("Tables 'chat_interactions' and 'chat_recommendations' created successfully.")
+    except Exception as e:
+        log_error(f"Error creating chat interaction tables: {e}")
+        raise
@@ -0,0 +1,155 @@
+import os
+import sys
+import time
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/db_writer.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info, log_warning
+    from helpers import get_settings, Settings
+    from .db_engine import SQLitePool
+    from .db_insert import add_chat_interactions
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+
+class ChatInteractionWriter:
+    """
+    Write-behind queue for chat interaction records, stored in the structured
+    'chat_interactions' and 'chat_recommendations' tables.
+
+    Requests only enqueue a record; a background thread flushes the queue in
+    batched transactions once CHAT_WRITER_BATCH_SIZE records are waiting or
+    CHAT_WRITER_FLUSH_INTERVAL seconds have passed. When the queue is full new
+    records are dropped and counted rather than blocking the request.
+    """
+
+    def __init__(
+        self,
+        pool: SQLitePool,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self.pool = pool
+        self.batch_size = batch_size or app_setting.CHAT_WRITER_BATCH_SIZE
+        self.flush_interval = flush_interval or app_setting.CHAT_WRITER_FLUSH_INTERVAL
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue or app_setting.CHAT_WRITER_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def start(self) -> None:
+        """Starts the background flush thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="chat-writer", daemon=True)
+        self._thread.start()
+        log_info("[CHAT WRITER] Background writer started.")
+
+    def submit(self, record: tuple) -> bool:
+        """
+        Enqueues a record without blocking.
+
+        Returns:
+            bool: False if the queue was full and the record was dropped.
+        """
+        try:
+            self._queue.put_nowait(record)
+            self._count("enqueued")
+            return True
+        except queue.Full:
+            self._count("dropped")
+            log_warning("[CHAT WRITER] Queue full, interaction record dropped.")
+            return False
+
+    def _next_batch(self) -> List[tuple]:
+        """Waits for the first record, then collects more until the batch is full or the interval ends."""
+        batch: List[tuple] = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[tuple]) -> None:
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as conn:
+                add_chat_interactions(conn, batch)
+            self._count("written", len(batch))
+            log_debug(f"[CHAT WRITER] Flushed {len(batch)} record(s).")
+        except Exception as e:
+            self._count("failed", len(batch))
+            log_error(f"[CHAT WRITER] Failed to flush {len(batch)} record(s): {e}")
+        finally:
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _drain(self) -> None:
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._flush(batch)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stops the background thread and flushes every record still queued."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._drain()
+        log_info(f"[CHAT WRITER] Stopped. Stats: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and counters, including records dropped on overflow."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["capacity"] = self._queue.maxsize
+        return stats
@@ -1 +1,2 @@
-from .text_embedding_engine import EmbeddingService
\ No newline at end of file
+from .text_embedding_engine import EmbeddingService
+from .reranker import CrossEncoderReranker
@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sentence_transformers import CrossEncoder
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/reranker.py"
+
+# Add root dir and handle potential import errors
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+# Weight of the newest sample in the per-pair latency average
+EWMA_ALPHA = 0.2
+
+
+class CrossEncoderReranker:
+    """
+    Re-scores retrieved passages against the query with a small cross-encoder and
+    keeps the best few.
+
+    Scores are cached per (query, chunk id), so repeated questions only score new
+    candidates. The cost of scoring is tracked as a moving average per pair; when
+    the pairs still to score would overrun the caller's latency budget, the
+    candidates are handed back untouched instead.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        self.model_name = model_name or app_setting.RERANKER_MODEL
+        self.batch_size = batch_size or app_setting.RERANK_BATCH_SIZE
+        self.cache_size = cache_size if cache_size is not None else app_setting.RERANK_CACHE_SIZE
+        try:
+            self.model = CrossEncoder(self.model_name)
+            log_info(f"[RERANKER] Cross-encoder '{self.model_name}' initialized.")
+        except Exception as e:
+            log_error(f"[RERANKER] Failed to load cross-encoder '{self.model_name}': {e}")
+            raise
+
+        self._cache: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ms_per_pair: Optional[float] = None
+        self._hits = 0
+        self._misses = 0
+        self._skipped = 0
+
+    def estimate_ms(self, pairs: int) -> float:
+        """Expected time to score the given number of pairs; 0 until a first batch was timed."""
+        return (self._ms_per_pair or 0.0) * pairs
+
+    def _score(self, query: str, texts: List[str]) -> List[float]:
+        started = time.perf_counter()
+        scores = self.model.predict(
+            [(query, text) for text in texts],
+            batch_size=self.batch_size,
+            show_progress_bar=False
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000 / len(texts)
+        with self._lock:
+            if self._ms_per_pair is None:
+                self._ms_per_pair = elapsed_ms
+            else:
+                self._ms_per_pair = EWMA_ALPHA * elapsed_ms + (1 - EWMA_ALPHA) * self._ms_per_pair
+        return [float(score) for score in scores]
+
+    def rerank(
+        self,
+        query: str,
+        docs: List[Dict],
+        top_n: Optional[int] = None,
+        budget_ms: Optional[float] = None
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Reorders retrieved docs by cross-encoder score.
+
+        Args:
+            query (str): The query the docs were retrieved for.
+            docs (List[Dict]): Results shaped like search_embeddings (text, score, id).
+            top_n (Optional[int]): Number of docs to keep, RERANK_TOP_N by default.
+            budget_ms (Optional[float]): Time left for reranking; None means unbounded.
+
+        Returns:
+            Tuple[List[Dict], bool]: The kept docs (score replaced by the reranker score,
+            the retrieval score kept as retrieval_score) and whether reranking ran. When it
+            did not, the docs are returned unchanged for the caller to cut.
+        """
+        top_n = top_n or app_setting.RERANK_TOP_N
+        if len(docs) <= 1:
+            return docs, False
+
+        with self._lock:
+            scores: Dict[int, float] = {}
+            for doc in docs:
+                key = (query, int(doc["id"]))
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[key[1]] = self._cache[key]
+            self._hits += len(scores)
+            self._misses += len(docs) - len(scores)
+
+        pending = [doc for doc in docs if int(doc["id"]) not in scores]
+        if pending and budget_ms is not None and self.estimate_ms(len(pending)) > budget_ms:
+            with self._lock:
+                self._skipped += 1
+            log_debug(
+                f"[RERANKER] Skipped: {len(pending)} pair(s) need ~{self.estimate_ms(len(pending)):.0f} ms, "
+                f"{budget_ms:.0f} ms left."
+            )
+            return docs, False
+
+        if pending:
+            fresh = self._score(query, [doc["text"] for doc in pending])
+            with self._lock:
+                for doc, score in zip(pending, fresh):
+                    scores[int(doc["id"])] = score
+                    self._cache[(query, int(doc["id"]))] = score
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        ranked = sorted(docs, key=lambda doc: scores[int(doc["id"])], reverse=True)[:top_n]
+        log_debug(f"[RERANKER] Kept {len(ranked)} of {len(docs)} passage(s), {len(pending)} scored.")
+        return [
+            {**doc, "score": scores[int(doc["id"])], "retrieval_score": doc["score"]}
+            for doc in ranked
+        ], True
+
+    def clear(self) -> None:
+        """Drops every cached score, e.g. after the chunks table was reset."""
+        with self._lock:
+            self._cache.clear()
+        log_info("[RERANKER] Cache cleared.")
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters, skipped reranks and the current per-pair latency estimate."""
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "capacity": self.cache_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "skipped": self._skipped,
+                "ms_per_pair": round(self._ms_per_pair or 0.0, 3),
+            }
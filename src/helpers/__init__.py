@@ -1,2 +1,4 @@
 from .setting import Settings, get_settings
-from .spliters import split_soil_elements
+from .spliters import split_soil_elements, normalize_soil_elements, format_soil_query
+from .single_flight import SingleFlight
+from .token_bucket import AsyncTokenBucket
@@ -1,6 +1,6 @@
 import os
 import json
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
@@ -13,12 +13,67 @@ class Settings(BaseSettings):
     LOC_DOC: str
     VECTOR_DB: str
     SQLITE_DB: str
+    SQLITE_POOL_SIZE: int = 8
+    SQLITE_POOL_TIMEOUT: float = 30.0
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
+    CHUNK_INSERT_BATCH_SIZE: int = 1000
+    DB_FETCH_PAGE_SIZE: int = 1000
+    CHUNK_TEXT_CODEC: str = "none"  # Options: "none", "zlib", "zstd", "lz4"
+    CHUNK_FTS: bool = True
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATES: int = 20
+    LIVE_RAG_BATCH_SIZE: int = 64
+    LIVE_RAG_BATCH_MAX: int = 10000
+    CHAT_WRITER_QUEUE_SIZE: int = 10000
+    CHAT_WRITER_BATCH_SIZE: int = 200
+    CHAT_WRITER_FLUSH_INTERVAL: float = 1.0
     PORT: int
     HOST: str
+    QDRANT_PAYLOAD_MODE: str = "full"  # Options: "full" (text in payload), "lean" (chunk id only)
+    QDRANT_PAYLOAD_METADATA: bool = True  # Keep sources and pages in lean payloads
+    CHUNK_TEXT_CACHE_SIZE: int = 4096
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_EF: int = 128
+    QDRANT_ON_DISK: bool = False
+    QDRANT_QUANTIZATION: str = "none"  # Options: "none", "scalar", "binary"
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    QDRANT_RESCORE: bool = True
+    QDRANT_OVERSAMPLING: float = 2.0
+    QDRANT_SNAPSHOT_DIR: str = os.path.join(root_dir, "database/QdrantSnapshots")
+    QDRANT_EXPORT_DIR: str = os.path.join(root_dir, "database/QdrantExports")
 
     # Add these two
     EMBEDDING_MODEL: str
     HUGGINGFACE_TOKIENS: str
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_SORT_WINDOW: int = 4096
+    RERANK_ENABLED: bool = False
+    RERANKER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 20
+    RERANK_TOP_N: int = 3
+    RERANK_BUDGET_MS: float = 250.0
+    RERANK_BATCH_SIZE: int = 32
+    RERANK_CACHE_SIZE: int = 16384
+    PRECOMPUTED_RECOMMENDATIONS: bool = True  # Weather-independent advice for the closed soil vocabulary
+    LLM_BATCH_SIZE: int = 8
+    PROMPT_CONTEXT_TOKENS: int = 1024
+    LLM_SEED: Optional[int] = None
+    LLM_RESPONSE_CACHE_ENABLED: bool = True
+    LLM_RESPONSE_CACHE_SIZE: int = 2048
+    GOOGLE_API_ENDPOINT: Optional[str] = None
+    GOOGLE_API_TRANSPORT: Optional[str] = None
+    GOOGLE_MAX_CONCURRENCY: int = 8
+    GOOGLE_REQUESTS_PER_MINUTE: float = 60.0
+    GOOGLE_RATE_BURST: int = 5
+    GOOGLE_REQUEST_TIMEOUT: float = 30.0
+    GOOGLE_MAX_RETRIES: int = 3
+    GOOGLE_RETRY_BASE_DELAY: float = 0.5
+    GOOGLE_RETRY_MAX_DELAY: float = 8.0
+    BULK_CHAT_MAX_ROWS: int = 100000
+    BULK_CHAT_WINDOW: int = 256
 
     FILE_ALLOWED_TYPES: List[str]
     FILE_MAX_SIZE: int
@@ -26,6 +81,17 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int
     CHUNK_OVERLAP: int
 
+    # Ingestion Settings
+    ARCHIVE_MAX_WORKERS: int = 4
+    PDF_EXTRACTOR: str = "pypdf"  # Options: "pypdf", "pymupdf", "pdfium"
+    EXTRACTION_CACHE_DIR: str = os.path.join(root_dir, "database/ExtractCache")
+    CHUNKING_MODE: str = "characters"  # Options: "characters", "tokens"
+    CHUNK_TOKEN_OVERLAP: int = 32
+    CHUNK_DEDUP: bool = True
+    DEDUP_THRESHOLD: float = 0.8
+    DEDUP_NUM_PERM: int = 64
+    DEDUP_BANDS: int = 16
+
     # Monitoring Settings
     CPU_THRESHOLD: int
     MEMORY_THRESHOLD: int
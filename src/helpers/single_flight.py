@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight computation.
+
+    The first caller for a key starts the work as a task; callers arriving while it
+    runs await the same task instead of starting their own. The key is forgotten as
+    soon as the task finishes, so results are shared, never cached. A caller that is
+    cancelled (e.g. a dropped client) only stops waiting; the others still get the result.
+
+    Meant to be used from a single event loop; no locking is needed.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._started = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Returns the result of ``await fn(*args, **kwargs)``, shared with every
+        concurrent caller of the same key. Exceptions are shared the same way.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            self._started += 1
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark a failure as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """In-flight keys, started computations and calls that joined one already running."""
+        return {"in_flight": len(self._calls), "started": self._started, "shared": self._shared}
@@ -1,9 +1,186 @@
-from typing import Any, Dict, Tuple
+import re
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# One pass over the text: a [Section] header or a "key: value" entry. Entries end at
+# a comma, a line break or the next header; a comma between two digits is a decimal
+# comma ("Soil pH: 6,5") and stays in the value.
+_TOKEN = re.compile(
+    r"\[\s*(?P<section>[^\]]+?)\s*\]"
+    r"|(?P<key>[^,:\[\]\n]+?)\s*:\s*(?P<value>(?:[^,\[\]\n]|(?<=\d),(?=\d))*)"
+)
+_NUMBER = re.compile(r"[-+]?\d+(?:[.,]\d+)?")
+_SPACES = re.compile(r"\s+")
+
+_SECTIONS = {
+    "soildata": "soil", "soil": "soil",
+    "weatherdata": "weather", "weather": "weather",
+}
+
+SOIL_KEYS = {
+    "soil ph": "Soil pH", "ph": "Soil pH", "ph level": "Soil pH", "soil ph level": "Soil pH",
+    "nitrogen": "Nitrogen", "n": "Nitrogen",
+    "phosphorus": "Phosphorus", "phosphorous": "Phosphorus", "p": "Phosphorus",
+    "potassium": "Potassium", "potash": "Potassium", "k": "Potassium",
+    "soil texture": "Soil Texture", "texture": "Soil Texture", "soil type": "Soil Texture",
+    "soil moisture": "Soil Moisture", "moisture": "Soil Moisture",
+    "organic matter": "Organic Matter", "om": "Organic Matter", "organic content": "Organic Matter",
+}
+
+WEATHER_KEYS = {
+    "temperature": "Temperature", "temp": "Temperature", "air temperature": "Temperature",
+    "humidity": "Humidity", "relative humidity": "Humidity", "rh": "Humidity",
+    "wind speed": "Wind Speed", "wind": "Wind Speed",
+    "precipitation": "Precipitation", "rainfall": "Precipitation", "rain": "Precipitation",
+}
+
+_LEVELS = {
+    "high": "High", "h": "High", "rich": "High", "excessive": "High",
+    "medium": "Medium", "med": "Medium", "m": "Medium", "moderate": "Medium",
+    "average": "Medium", "normal": "Medium", "optimal": "Medium",
+    "low": "Low", "l": "Low", "poor": "Low", "deficient": "Low",
+}
+_TEXTURES = {
+    "sandy": "Sandy", "sand": "Sandy",
+    "loamy": "Loamy", "loam": "Loamy",
+    "clay": "Clay", "clayey": "Clay",
+    "silty": "Silty", "silt": "Silty",
+    "peaty": "Peaty", "peat": "Peaty",
+    "chalky": "Chalky", "chalk": "Chalky",
+}
+_MOISTURE = {
+    "dry": "Dry", "low": "Dry",
+    "moderate": "Moderate", "medium": "Moderate", "moist": "Moderate", "normal": "Moderate",
+    "wet": "Wet", "high": "Wet", "saturated": "Wet", "waterlogged": "Wet",
+}
+_ORGANIC = {
+    "poor": "Poor", "low": "Poor",
+    "moderate": "Moderate", "medium": "Moderate", "average": "Moderate",
+    "rich": "Rich", "high": "Rich",
+}
+
+
+def _clean(text: Any) -> str:
+    return _SPACES.sub(" ", str(text)).strip()
+
+
+def _measure(text: str) -> Tuple[Optional[float], str]:
+    """Leading number of a value and its unit, lower-cased without spaces or degree signs."""
+    match = _NUMBER.search(text)
+    if not match:
+        return None, ""
+    unit = text[match.end():].lower().replace(" ", "").replace("°", "").replace("º", "")
+    return float(match.group().replace(",", ".")), unit
+
+
+def _fmt(number: float) -> str:
+    return f"{round(number, 1):g}"
+
+
+def _category(mapping: Dict[str, str]) -> Callable[[str], str]:
+    def normalize(value: str) -> str:
+        return mapping.get(value.lower(), value)
+    return normalize
+
+
+def _ph(value: str) -> str:
+    number, _ = _measure(value)
+    return _fmt(number) if number is not None and 0 <= number <= 14 else value
+
+
+def _temperature(value: str) -> str:
+    number, unit = _measure(value)
+    if number is None:
+        return value
+    if unit in ("f", "degf", "fahrenheit"):
+        number = (number - 32) * 5 / 9
+    elif unit in ("k", "kelvin"):
+        number -= 273.15
+    return f"{_fmt(number)}°C"
+
+
+def _humidity(value: str) -> str:
+    number, unit = _measure(value)
+    if number is None:
+        return value
+    if not unit and number < 1:
+        number *= 100
+    return f"{_fmt(number)}%"
+
+
+def _wind(value: str) -> str:
+    number, unit = _measure(value)
+    if number is None:
+        return value
+    if unit == "mph":
+        number *= 1.609344
+    elif unit in ("m/s", "mps"):
+        number *= 3.6
+    elif unit in ("kn", "kt", "kts", "knot", "knots"):
+        number *= 1.852
+    return f"{_fmt(number)} km/h"
+
+
+def _precipitation(value: str) -> str:
+    number, unit = _measure(value)
+    if number is None:
+        return value
+    if unit == "cm":
+        number *= 10
+    elif unit in ("in", "inch", "inches", '"'):
+        number *= 25.4
+    return f"{_fmt(number)} mm"
+
+
+def _nutrient(value: str) -> str:
+    # Lab values ("45 mg/kg") stay numeric; only named levels are bucketed
+    return _LEVELS.get(value.lower(), value)
+
+
+_VALUE_NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "Soil pH": _ph,
+    "Nitrogen": _nutrient,
+    "Phosphorus": _nutrient,
+    "Potassium": _nutrient,
+    "Soil Texture": _category(_TEXTURES),
+    "Soil Moisture": _category(_MOISTURE),
+    "Organic Matter": _category(_ORGANIC),
+    "Temperature": _temperature,
+    "Humidity": _humidity,
+    "Wind Speed": _wind,
+    "Precipitation": _precipitation,
+}
+
+
+def normalize_element(key: Any, value: Any, section: str) -> Tuple[str, str]:
+    """
+    Maps a key to its canonical name (case and synonyms) and its value to the
+    canonical unit or category of that key. Unknown keys and values are kept,
+    with whitespace collapsed.
+    """
+    key, value = _clean(key), _clean(value)
+    names = SOIL_KEYS if section == "soil" else WEATHER_KEYS
+    key = names.get(key.lower(), key)
+    normalizer = _VALUE_NORMALIZERS.get(key)
+    return key, (normalizer(value) if normalizer and value else value)
+
+
+def normalize_soil_elements(
+    soil: Optional[Mapping[str, Any]] = None,
+    weather: Optional[Mapping[str, Any]] = None
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Normalizes structured soil and weather data (e.g. a JSON body) the same way
+    split_soil_elements normalizes the bracketed text format.
+    """
+    soil_data = dict(normalize_element(k, v, "soil") for k, v in (soil or {}).items() if v is not None)
+    weather_data = dict(normalize_element(k, v, "weather") for k, v in (weather or {}).items() if v is not None)
+    return soil_data, weather_data
 
 
 def split_soil_elements(query: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    Extracts soil and weather elements from a structured query string.
+    Extracts soil and weather elements from a structured query string in a single
+    pass, with canonical keys and values (see normalize_element).
 
     Args:
         query (str): Formatted string containing [SoilData] and [WeatherData].
@@ -11,50 +188,35 @@ def split_soil_elements(query: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     Returns:
         Tuple[Dict[str, Any], Dict[str, Any]]: Two dictionaries for soil and weather data.
     """
-    soil_data: Dict[str, str] = {}
-    weather_data: Dict[str, str] = {}
-    current_section = None
-
-    lines = query.strip().splitlines()
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if line.startswith("[") and "]" in line:
-            section_end = line.find("]") + 1
-            section_name = line[1:section_end - 1]
-            current_section = section_name
-
-            inline_data = line[section_end:].strip()
-            if inline_data:
-                entries = [e.strip() for e in inline_data.split(",") if e.strip()]
-                for entry in entries:
-                    if ": " in entry:
-                        key, value = entry.split(": ", 1)
-                        if current_section == "SoilData":
-                            soil_data[key.strip()] = value.strip()
-                        elif current_section == "WeatherData":
-                            weather_data[key.strip()] = value.strip()
-        elif current_section:
-            entries = [e.strip() for e in line.split(",") if e.strip()]
-            for entry in entries:
-                if ": " in entry:
-                    key, value = entry.split(": ", 1)
-                    if current_section == "SoilData":
-                        soil_data[key.strip()] = value.strip()
-                    elif current_section == "WeatherData":
-                        weather_data[key.strip()] = value.strip()
+    data: Dict[str, Dict[str, str]] = {"soil": {}, "weather": {}}
+    section = None
 
-    return soil_data, weather_data
+    for match in _TOKEN.finditer(query):
+        if match.group("section") is not None:
+            section = _SECTIONS.get(match.group("section").replace(" ", "").replace("_", "").lower())
+        elif section is not None:
+            key, value = normalize_element(match.group("key"), match.group("value"), section)
+            if key:
+                data[section][key] = value
+
+    return data["soil"], data["weather"]
+
+
+def format_soil_query(soil: Mapping[str, Any], weather: Mapping[str, Any]) -> str:
+    """Renders soil and weather data in the bracketed text format."""
+    parts = ["[SoilData] " + ", ".join(f"{k}: {v}" for k, v in soil.items())]
+    if weather:
+        parts.append("[WeatherData] " + ", ".join(f"{k}: {v}" for k, v in weather.items()))
+    return " ".join(parts)
 
 
 if __name__ == "__main__":
+    import timeit
+
     query = """[SoilData] Soil PH: 6.5,
                                Nitrogen: High, Phosphorus: Medium, Potassium: Low, Soil Texture: Loamy,
-                               Soil Moisture: Moderate, Organic Matter: Rich 
-                               [WeatherData] Temperature: 22°C, Humidity: 60%, Wind Speed: 10 km/h, Precipitation: 2 mm"""
+                               Soil Moisture: Moderate, Organic Matter: Rich
+                               [WeatherData] Temperature: 72°F, Humidity: 60%, Wind Speed: 10 mph, Precipitation: 2 mm"""
 
     soil, weather = split_soil_elements(query)
 
@@ -65,3 +227,7 @@ if __name__ == "__main__":
     print("\nWeather Data:")
     for key, value in weather.items():
         print(f"  {key}: {value}")
+
+    runs = 10_000
+    seconds = timeit.timeit(lambda: split_soil_elements(query), number=runs)
+    print(f"\n{runs / seconds:,.0f} parses/s")
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code: ``rate`` tokens per second, at most ``capacity``
+    saved up for bursts. Callers over the rate wait in arrival order instead of
+    failing, and waiting never blocks the event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._waited = 0.0
+        self._acquired = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Waits until ``tokens`` are available and takes them. Returns the seconds waited."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        started = time.monotonic()
+        # The lock makes waiters queue in order rather than race for each refill
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+        waited = time.monotonic() - started
+        self._waited += waited
+        self._acquired += 1
+        return waited
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Configured rate, tokens currently available and total time callers waited.
+        Read-only, so it is safe to call from another thread than acquire().
+        """
+        tokens, updated = self._tokens, self._updated
+        available = min(self.capacity, tokens + (time.monotonic() - updated) * self.rate)
+        return {
+            "rate_per_s": self.rate,
+            "capacity": self.capacity,
+            "available": round(available, 3),
+            "acquired": self._acquired,
+            "waited_s": round(self._waited, 3),
+        }
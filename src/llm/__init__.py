@@ -1,3 +1,4 @@
 from .abc_llm import ILLMsGenerators
 from .huggingface import HuggingFaceLLM
 from .google_ai import GoogleLLM
+from .response_cache import ResponseCache, init_response_cache_table
@@ -1,10 +1,17 @@
+import json
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 class ILLMsGenerators(ABC):
     """
     Abstract base class for LLM generators.
     """
 
+    # Set by the application to a ResponseCache; used only by deterministic configs
+    response_cache = None
+
     def __init__(self,
                  model_name: str,
                  max_new_tokens: int,
@@ -52,3 +59,86 @@ class ILLMsGenerators(ABC):
             str: The generated response.
         """
         pass
+
+    async def aresponse(self, prompt: str) -> str:
+        """
+        Generates a response without blocking the event loop. This default runs
+        response() in a worker thread; clients with an async API override it.
+
+        Args:
+            prompt (str): The input text to generate a response for.
+
+        Returns:
+            str: The generated response.
+        """
+        return await asyncio.to_thread(self.response, prompt)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Counts the tokens of each text as the model would see them. This default is
+        an estimate (about four characters per token) for models without a local tokenizer.
+
+        Args:
+            texts (List[str]): The texts to count.
+
+        Returns:
+            List[int]: Token count per text.
+        """
+        return [(len(text) + 3) // 4 for text in texts]
+
+    def batch_response(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Generates one response per prompt. Implementations may batch the calls; this
+        default runs them one after another.
+
+        Args:
+            prompts (List[str]): The input texts.
+
+        Returns:
+            List[Optional[str]]: Responses in prompt order, None where generation failed.
+        """
+        responses: List[Optional[str]] = []
+        for prompt in prompts:
+            try:
+                responses.append(self.response(prompt))
+            except (RuntimeError, ValueError):
+                responses.append(None)
+        return responses
+
+    def generation_signature(self) -> str:
+        """
+        Canonical JSON of the model and its generation parameters. The seed is only
+        included when set, so ids of unseeded configs are unchanged.
+        """
+        config = {
+            name: getattr(self, name, None)
+            for name in ("model_name", "max_new_tokens", "do_sample", "temperature",
+                         "top_p", "top_k", "quantization", "quantization_type")
+        }
+        if getattr(self, "seed", None) is not None:
+            config["seed"] = self.seed
+        return json.dumps(config, sort_keys=True, default=str)
+
+    def config_id(self) -> str:
+        """
+        Short stable id of the model and its generation parameters, stored with
+        every interaction so answers can be traced back to the config that made them.
+        """
+        return hashlib.sha1(self.generation_signature().encode("utf-8")).hexdigest()[:16]
+
+    def is_deterministic(self) -> bool:
+        """True when the same prompt always yields the same text: greedy decoding or a fixed seed."""
+        return not getattr(self, "do_sample", True) or getattr(self, "seed", None) is not None
+
+    def cached_response(self, prompt: str) -> Optional[str]:
+        """Returns the cached response to ``prompt``, or None on a miss or for sampled configs."""
+        if self.response_cache is None or not self.is_deterministic():
+            return None
+        return self.response_cache.get(self.response_cache.make_key(self.generation_signature(), prompt))
+
+    def cache_response(self, prompt: str, response: str) -> None:
+        """Stores a generated response when the config is deterministic."""
+        if self.response_cache is None or not self.is_deterministic():
+            return
+        key = self.response_cache.make_key(self.generation_signature(), prompt)
+        self.response_cache.put(key, self.config_id(), response)
@@ -8,8 +8,11 @@ the ILLMsGenerators abstract base class.
 
 import os
 import sys
+import random
+import asyncio
 import logging
-from typing import Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional, Tuple
 import google.generativeai as genai
 from google.api_core import exceptions # Import exceptions for API errors
 
@@ -39,8 +42,8 @@ try:
 
     # Import project-specific modules
     # Ensure these modules (logs, helpers, abc_llm) exist and are correctly structured
-    from src.logs import log_error, log_info
-    from src.helpers import get_settings, Settings
+    from src.logs import log_error, log_info, log_warning
+    from src.helpers import get_settings, Settings, AsyncTokenBucket
     from .abc_llm import ILLMsGenerators # Relative import for abc_llm
 
 except ImportError as ie:
@@ -53,6 +56,17 @@ except Exception as e:
     raise
 
 
+# Quota and transient failures; anything else is not worth another attempt
+RETRYABLE_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+    exceptions.InternalServerError,
+    exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
+
 class GoogleLLM(ILLMsGenerators):
     """
     Implementation of ILLMsGenerators for Google's Generative AI models.
@@ -85,6 +99,11 @@ class GoogleLLM(ILLMsGenerators):
         self.top_k = top_k
         self.model: Optional[genai.GenerativeModel] = None # Type hint for model
         self.generation_config: Optional[genai.types.GenerationConfig] = None # Type hint
+        # Concurrency and rate guards, owned by the event loop that serves the app; sync
+        # calls from worker threads are run on that loop so every call shares them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[AsyncTokenBucket] = None
 
         # Log unused parameters for transparency and potential user awareness
         if not do_sample:
@@ -108,8 +127,18 @@ class GoogleLLM(ILLMsGenerators):
                 # Use a more specific exception for configuration errors
                 raise ValueError("Google API key is missing in settings. Please ensure GOOGLE_API_KEY is set.")
 
-            # Configure the genai library with the API key
-            genai.configure(api_key=api_key)
+            # Configure the genai library with the API key; a custom endpoint (e.g. a local stub) is optional
+            client_config: dict = {"api_key": api_key}
+            if self.app_settings.GOOGLE_API_ENDPOINT:
+                client_config["client_options"] = {"api_endpoint": self.app_settings.GOOGLE_API_ENDPOINT}
+            if self.app_settings.GOOGLE_API_TRANSPORT:
+                client_config["transport"] = self.app_settings.GOOGLE_API_TRANSPORT
+            genai.configure(**client_config)
+            try:
+                # Configured from a request handler: remember the app's loop for the guards
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._loop = None
             
             # Create the GenerationConfig instance
             self.generation_config = genai.types.GenerationConfig(
@@ -119,7 +148,8 @@ class GoogleLLM(ILLMsGenerators):
                 top_k=self.top_k
             )
             
-            # Initialize the GenerativeModel with the correctly formatted model name
+            # Initialize the GenerativeModel with the correctly formatted model name.
+            # Its clients, and their connections, are reused by every call.
             self.model = genai.GenerativeModel(self.model_name)
             
             log_info(f"GoogleLLM initialized successfully with model: '{self.model_name}'")
@@ -157,29 +187,30 @@ class GoogleLLM(ILLMsGenerators):
             log_error("Invalid prompt provided. Prompt must be a non-empty string.")
             raise ValueError("Prompt must be a non-empty string.")
 
+        cached = self.cached_response(prompt)
+        if cached is not None:
+            return cached
+
+        loop = self._limiter_loop()
+        if loop is not None:
+            # Worker thread of the app: share the concurrency cap, rate limit and retries
+            return asyncio.run_coroutine_threadsafe(self.aresponse(prompt), loop).result()
+
         try:
             # Call the generate_content method with the prompt and generation config
             # Using a list for the prompt is generally more robust for future multi-turn support
             # and aligns with how chat models expect input.
             response = self.model.generate_content(
                 [prompt], # Wrap prompt in a list for consistency
-                generation_config=self.generation_config
+                generation_config=self.generation_config,
+                request_options={"timeout": self.app_settings.GOOGLE_REQUEST_TIMEOUT}
             )
+            generated_text = self._extract_text(response, prompt)
+            self.cache_response(prompt, generated_text)
+            return generated_text
 
-            # Check if candidates exist and if the first candidate has content
-            if response and response.candidates:
-                # Access the text from the first part of the first candidate
-                # This handles cases where content might be structured differently (e.g., with parts)
-                generated_text = ""
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'text'):
-                        generated_text += part.text
-                return generated_text.strip()
-            else:
-                # Handle cases where no candidates or no content is returned
-                log_error(f"Google API returned an empty or invalid response for prompt: {prompt[:100]}...")
-                raise RuntimeError("Google API returned an empty or invalid response. No content generated.")
-
+        except RuntimeError:
+            raise
         except exceptions.GoogleAPICallError as api_err: # Changed from genai.types.APIError
             # Specific handling for API errors (e.g., invalid key, rate limits, model not found)
             log_error(f"Google API error during generation: {api_err}")
@@ -189,6 +220,183 @@ class GoogleLLM(ILLMsGenerators):
             log_error(f"An unexpected error occurred during text generation for prompt: {prompt[:100]}... Error: {e}")
             raise RuntimeError(f"Text generation failed due to an unexpected error: {e}") from e
 
+    def _extract_text(self, response: Any, prompt: str) -> str:
+        """
+        Joins the text parts of the first candidate.
+
+        Raises:
+            RuntimeError: If the response has no candidates.
+        """
+        # Check if candidates exist and if the first candidate has content
+        if response and response.candidates:
+            # Access the text from the first part of the first candidate
+            # This handles cases where content might be structured differently (e.g., with parts)
+            generated_text = ""
+            for part in response.candidates[0].content.parts:
+                if hasattr(part, 'text'):
+                    generated_text += part.text
+            return generated_text.strip()
+        # Handle cases where no candidates or no content is returned
+        log_error(f"Google API returned an empty or invalid response for prompt: {prompt[:100]}...")
+        raise RuntimeError("Google API returned an empty or invalid response. No content generated.")
+
+    async def aresponse(self, prompt: str) -> str:
+        """
+        Generate a response with the async API, without blocking the event loop.
+
+        At most GOOGLE_MAX_CONCURRENCY requests are in flight and they start at no more
+        than GOOGLE_REQUESTS_PER_MINUTE, so bursts queue instead of hitting the quota.
+        Quota and transient errors, and timeouts, are retried up to GOOGLE_MAX_RETRIES
+        times with jittered exponential backoff.
+
+        Args:
+            prompt: Input text to generate response for
+
+        Returns:
+            Generated response text
+
+        Raises:
+            RuntimeError: If generation fails or model not initialized
+            ValueError: If the prompt is empty or invalid
+        """
+        if self.model is None or self.generation_config is None:
+            log_error("GoogleLLM is not initialized. Call initialize_llm() first.")
+            raise RuntimeError("GoogleLLM not properly initialized. Call initialize_llm() before generating content.")
+
+        if not prompt or not isinstance(prompt, str):
+            log_error("Invalid prompt provided. Prompt must be a non-empty string.")
+            raise ValueError("Prompt must be a non-empty string.")
+
+        cached = self.cached_response(prompt)
+        if cached is not None:
+            return cached
+
+        semaphore, rate_limiter = self._guards()
+        timeout = self.app_settings.GOOGLE_REQUEST_TIMEOUT
+        attempts = max(0, self.app_settings.GOOGLE_MAX_RETRIES) + 1
+        for attempt in range(attempts):
+            try:
+                async with semaphore:
+                    await rate_limiter.acquire()
+                    response = await asyncio.wait_for(self._generate_async(prompt, timeout), timeout=timeout)
+                generated_text = self._extract_text(response, prompt)
+                self.cache_response(prompt, generated_text)
+                return generated_text
+
+            except RETRYABLE_ERRORS as err:
+                if attempt + 1 == attempts:
+                    log_error(f"Google API call failed after {attempts} attempt(s): {err!r}")
+                    raise RuntimeError(f"Google API error during text generation: {err!r}") from err
+                # Full jitter keeps retries of a burst from arriving together
+                delay = random.uniform(0, min(
+                    self.app_settings.GOOGLE_RETRY_MAX_DELAY,
+                    self.app_settings.GOOGLE_RETRY_BASE_DELAY * 2 ** attempt
+                ))
+                log_warning(f"Google API call failed ({err!r}), retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except RuntimeError:
+                raise
+            except exceptions.GoogleAPICallError as api_err:
+                log_error(f"Google API error during generation: {api_err}")
+                raise RuntimeError(f"Google API error during text generation: {api_err}") from api_err
+            except Exception as e:
+                log_error(f"An unexpected error occurred during text generation for prompt: {prompt[:100]}... Error: {e}")
+                raise RuntimeError(f"Text generation failed due to an unexpected error: {e}") from e
+
+    def _guards(self) -> Tuple[asyncio.Semaphore, AsyncTokenBucket]:
+        """Semaphore and rate limiter of the running loop, created on its first call."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(max(1, self.app_settings.GOOGLE_MAX_CONCURRENCY))
+            self._rate_limiter = AsyncTokenBucket(
+                rate=self.app_settings.GOOGLE_REQUESTS_PER_MINUTE / 60,
+                capacity=self.app_settings.GOOGLE_RATE_BURST,
+            )
+        return self._semaphore, self._rate_limiter
+
+    def _limiter_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        The loop owning the guards when the calling thread may block on it, i.e. a
+        worker thread while that loop runs; None otherwise (scripts, or the loop itself).
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return loop
+        return None
+
+    def _generate_async(self, prompt: str, timeout: float) -> Awaitable[Any]:
+        """
+        One generate_content call that does not block the loop. The async client only
+        works over gRPC; with the REST transport the call runs in a worker thread.
+        The client's own retry is turned off so that aresponse's backoff is the only one.
+        """
+        request_options = {"timeout": timeout, "retry": None}
+        if self.app_settings.GOOGLE_API_TRANSPORT == "rest":
+            return asyncio.to_thread(
+                self.model.generate_content,
+                [prompt],
+                generation_config=self.generation_config,
+                request_options=request_options
+            )
+        return self.model.generate_content_async(
+            [prompt],
+            generation_config=self.generation_config,
+            request_options=request_options
+        )
+
+    async def abatch_response(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Generates responses for many prompts through aresponse(), so a batch queues
+        behind the same concurrency cap, rate limit and retries as single calls.
+
+        Returns:
+            Responses in prompt order, None where generation failed
+        """
+        results = await asyncio.gather(*(self.aresponse(prompt) for prompt in prompts), return_exceptions=True)
+        return [None if isinstance(result, (RuntimeError, ValueError)) else result for result in results]
+
+    def rate_limit_stats(self) -> dict:
+        """Rate limiter state of the async path; empty before its first call."""
+        return self._rate_limiter.stats() if self._rate_limiter is not None else {}
+
+    def is_deterministic(self) -> bool:
+        """
+        The API ignores do_sample and takes no seed here, so only temperature 0
+        (greedy decoding) gives repeatable answers.
+        """
+        return self.temperature == 0
+
+    def batch_response(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Generates responses for many prompts. Called from a worker thread of the app
+        (bulk scoring, the precompute job) it runs abatch_response on the app's loop and
+        waits, so bursts respect the quota limiter. Elsewhere the API, which takes one
+        prompt per request, gets up to LLM_BATCH_SIZE requests concurrently.
+
+        Args:
+            prompts: Input texts
+
+        Returns:
+            Responses in prompt order, None where generation failed
+        """
+        loop = self._limiter_loop()
+        if loop is not None:
+            return asyncio.run_coroutine_threadsafe(self.abatch_response(prompts), loop).result()
+
+        def generate(prompt: str) -> Optional[str]:
+            try:
+                return self.response(prompt)
+            except (RuntimeError, ValueError):
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, self.app_settings.LLM_BATCH_SIZE)) as executor:
+            return list(executor.map(generate, prompts))
+
     def __call__(self, prompt: str) -> str:
         """
         Makes the GoogleLLM instance callable directly, acting as a shortcut for response().
@@ -1,7 +1,7 @@
 import os
 import sys
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
 from transformers import BitsAndBytesConfig
@@ -33,6 +33,7 @@ class HuggingFaceLLM(ILLMsGenerators):
                  quantization: bool = False,
                  quantization_type: str = "8bit",
                  device_map: Optional[str] = "auto",
+                 seed: Optional[int] = None,
         ) -> None:
         """
         Initializes the HuggingFace LLM generator with enhanced error handling.
@@ -50,6 +51,8 @@ class HuggingFaceLLM(ILLMsGenerators):
             self.quantization = quantization
             self.quantization_type = quantization_type
             self.device_map = device_map
+            # A fixed seed makes sampled generation repeatable, and so cacheable
+            self.seed = seed if seed is not None else self.settings.LLM_SEED
             
             self.model = None
             self.tokenizer = None
@@ -149,6 +152,11 @@ class HuggingFaceLLM(ILLMsGenerators):
                 log_warning("Empty or invalid prompt received")
                 raise ValueError("Prompt must be a non-empty string")
             
+            cached = self.cached_response(prompt)
+            if cached is not None:
+                log_debug("Response served from cache")
+                return cached
+
             log_debug(f"Generating response for prompt (length: {len(prompt)})")
             
             # Tokenize the input prompt
@@ -161,6 +169,8 @@ class HuggingFaceLLM(ILLMsGenerators):
 
             # Generate output
             try:
+                if self.seed is not None:
+                    torch.manual_seed(self.seed)
                 with torch.no_grad():
                     output = self.model.generate(
                         input_ids,
@@ -180,6 +190,7 @@ class HuggingFaceLLM(ILLMsGenerators):
             try:
                 generated_text = self.tokenizer.decode(output[0], skip_special_tokens=True)
                 log_debug(f"Generated response (length: {len(generated_text)})")
+                self.cache_response(prompt, generated_text)
                 return generated_text
             except Exception as e:
                 log_error(f"Response decoding failed: {e}")
@@ -189,6 +200,78 @@ class HuggingFaceLLM(ILLMsGenerators):
             log_error(f"Failed to generate response: {e}")
             raise RuntimeError(f"Response generation failed: {e}") from e
     
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Counts the tokens of each text with the model's tokenizer, special tokens included.
+
+        Args:
+            texts (List[str]): The texts to count.
+
+        Returns:
+            List[int]: Token count per text.
+        """
+        if not texts:
+            return []
+        return [len(ids) for ids in self.tokenizer(texts, add_special_tokens=True)["input_ids"]]
+
+    def batch_response(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Generates responses for many prompts with left-padded batches of
+        LLM_BATCH_SIZE, one generate call per batch. A batch that fails (e.g. out of
+        memory) is retried prompt by prompt. Cached prompts are not regenerated.
+
+        Seeded sampling goes prompt by prompt: a sampled answer from a shared batch
+        depends on its batch mates, so it would not match response() for the same
+        prompt and could not be cached under the same key.
+
+        Args:
+            prompts (List[str]): The input texts.
+
+        Returns:
+            List[Optional[str]]: Responses in prompt order, None where generation failed.
+        """
+        batch_size = max(1, self.settings.LLM_BATCH_SIZE)
+        cached = {i: self.cached_response(prompt) for i, prompt in enumerate(prompts)}
+        pending = [prompt for i, prompt in enumerate(prompts) if cached[i] is None]
+        responses: List[Optional[str]] = []
+
+        if self.do_sample and self.seed is not None:
+            responses = super().batch_response(pending)
+            pending = []
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            padding_side = self.tokenizer.padding_side
+            try:
+                # Decoder-only models continue from the last position, so pad on the left
+                self.tokenizer.padding_side = "left"
+                inputs = self.tokenizer(batch, return_tensors="pt", padding=True).to(self.model.device)
+                if self.seed is not None:
+                    torch.manual_seed(self.seed)
+                with torch.no_grad():
+                    output = self.model.generate(
+                        **inputs,
+                        max_new_tokens=self.max_new_tokens,
+                        do_sample=self.do_sample,
+                        temperature=self.temperature,
+                        top_p=self.top_p,
+                        top_k=self.top_k,
+                        pad_token_id=self.tokenizer.pad_token_id
+                    )
+                decoded = self.tokenizer.batch_decode(output, skip_special_tokens=True)
+                for prompt, text in zip(batch, decoded):
+                    self.cache_response(prompt, text)
+                responses.extend(decoded)
+                log_debug(f"Generated {len(batch)} response(s) in one batch")
+            except Exception as e:
+                log_warning(f"Batched generation of {len(batch)} prompt(s) failed, retrying one by one: {e}")
+                responses.extend(super().batch_response(batch))
+            finally:
+                self.tokenizer.padding_side = padding_side
+
+        generated = iter(responses)
+        return [cached[i] if cached[i] is not None else next(generated) for i in range(len(prompts))]
+
     def __str__(self) -> str:
         return f"HuggingFaceLLM(model={self.model_name}, quantized={self.quantization})"
 
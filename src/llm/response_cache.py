@@ -0,0 +1,162 @@
+import os
+import sys
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+FILE_LOCATION = f"{os.path.dirname(__file__)}/response_cache.py"
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug, log_error, log_info
+    from helpers import get_settings, Settings
+    from dbs import SQLitePool
+except Exception as e:
+    msg = f"Import Error in: {FILE_LOCATION}, Error: {e}"
+    raise ImportError(msg)
+
+app_setting: Settings = get_settings()
+
+
+def init_response_cache_table(conn: sqlite3.Connection) -> None:
+    """
+    Creates 'llm_response_cache': generated text keyed by the hash of the model,
+    its generation parameters and the exact prompt.
+    """
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                key TEXT PRIMARY KEY,
+                config_id TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            );
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_response_cache_config ON llm_response_cache (config_id);")
+        conn.commit()
+        log_info("Table 'llm_response_cache' created successfully.")
+    except Exception as e:
+        log_error(f"Error creating LLM response cache table: {e}")
+        raise
+
+
+class ResponseCache:
+    """
+    Two-tier cache of LLM responses: an in-process LRU in front of a SQLite table
+    that survives restarts and model swaps.
+
+    Only deterministic configs (greedy decoding or a fixed seed) may use it, since a
+    sampled config is expected to answer the same prompt differently; the LLM
+    classes check that before every lookup.
+    """
+
+    def __init__(self, pool: Optional[SQLitePool] = None, cache_size: Optional[int] = None):
+        self.pool = pool
+        self.cache_size = cache_size if cache_size is not None else app_setting.LLM_RESPONSE_CACHE_SIZE
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(generation_signature: str, prompt: str) -> str:
+        """sha256 of the generation config (model identity and parameters) and the prompt."""
+        digest = hashlib.sha256(generation_signature.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, response: str) -> None:
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.encode("utf-8"))
+            self._cache[key] = response
+            self._bytes += len(response.encode("utf-8"))
+            while len(self._cache) > self.cache_size:
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for ``key``, looking in memory first, then in SQLite."""
+        with self._lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return response
+
+        if self.pool is not None:
+            try:
+                with self.pool.connection() as conn:
+                    row = conn.execute("SELECT response FROM llm_response_cache WHERE key = ?", (key,)).fetchone()
+            except Exception as e:
+                log_error(f"[LLM CACHE] Lookup failed: {e}")
+                row = None
+            if row is not None:
+                self._remember(key, row[0])
+                with self._lock:
+                    self._hits += 1
+                    self._disk_hits += 1
+                return row[0]
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, config_id: str, response: str) -> None:
+        """Stores a response in both tiers. A failed write only costs a future miss."""
+        self._remember(key, response)
+        if self.pool is None:
+            return
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache (key, config_id, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, config_id, response, datetime.now(timezone.utc).isoformat(timespec="microseconds")),
+                )
+                conn.commit()
+        except Exception as e:
+            log_error(f"[LLM CACHE] Write failed: {e}")
+
+    def clear(self) -> None:
+        """Drops every cached response from both tiers."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                conn.execute("DELETE FROM llm_response_cache")
+                conn.commit()
+        log_info("[LLM CACHE] Cache cleared.")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and the entries and bytes held by each tier."""
+        stored = {"entries": None, "bytes": None}
+        if self.pool is not None:
+            try:
+                with self.pool.connection() as conn:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(response AS BLOB))), 0) FROM llm_response_cache"
+                    ).fetchone()
+                stored = {"entries": entries, "bytes": size}
+            except Exception as e:
+                log_debug(f"[LLM CACHE] Could not read table stats: {e}")
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "memory": {"entries": len(self._cache), "capacity": self.cache_size, "bytes": self._bytes},
+                "sqlite": stored,
+            }
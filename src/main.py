@@ -14,11 +14,16 @@ from src.routes import (
     hello_routes, upload_route, to_chunks_route,
     chunks_embedding_route, chat_route,
     llm_settings_route, live_rag_route,
-    logers_router, monitor_router
+    logers_router, monitor_router,
+    ingest_archive_route, history_route,
+    snapshot_route, precompute_route
 )
-from src.dbs import get_sqlite_engine, init_chunks_table, init_query_response_table
+from src.dbs import SQLitePool, ChatInteractionWriter, ChunkTextHydrator, PrecomputedRecommendations, init_chunks_table, init_query_response_table, init_chat_interactions_table, init_precomputed_table
 from src.db_vector import StartQdrant
-from src.embedding import EmbeddingService
+from src.controllers import HybridRetriever
+from src.embedding import EmbeddingService, CrossEncoderReranker
+from src.helpers import get_settings, SingleFlight
+from src.llm import ResponseCache, init_response_cache_table
 
 templates = Jinja2Templates(directory=f"{MAIN_DIR}/src/web")
 
@@ -30,11 +35,26 @@ async def lifespan(app: FastAPI):
 
         app.state.qdrant = StartQdrant()
         app.state.embedded = EmbeddingService()
-        app.state.qdrant.create_collection("embeddings")
-
-        app.state.conn = get_sqlite_engine()
-        init_chunks_table(conn=app.state.conn)
-        init_query_response_table(conn=app.state.conn)
+        app.state.qdrant.create_collection("embeddings", recreate=False)
+        app.state.qdrant.create_payload_indexes("embeddings")
+
+        app.state.db_pool = SQLitePool()
+        with app.state.db_pool.connection() as conn:
+            init_chunks_table(conn=conn)
+            init_query_response_table(conn=conn)
+            init_chat_interactions_table(conn=conn)
+            init_precomputed_table(conn=conn)
+            init_response_cache_table(conn=conn)
+        app.state.chat_writer = ChatInteractionWriter(pool=app.state.db_pool)
+        app.state.chat_writer.start()
+        app.state.chunk_hydrator = ChunkTextHydrator(pool=app.state.db_pool)
+        app.state.hybrid_retriever = HybridRetriever(
+            qdrant=app.state.qdrant, pool=app.state.db_pool, hydrator=app.state.chunk_hydrator
+        )
+        app.state.reranker = CrossEncoderReranker() if get_settings().RERANK_ENABLED else None
+        app.state.precomputed = PrecomputedRecommendations(pool=app.state.db_pool, qdrant=app.state.qdrant)
+        app.state.chat_flights = SingleFlight()
+        app.state.response_cache = ResponseCache(pool=app.state.db_pool) if get_settings().LLM_RESPONSE_CACHE_ENABLED else None
 
         app.state.llm = None
         log_info("[STARTUP] LLM initialized.")
@@ -44,9 +64,14 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         log_info("[SHUTDOWN] Cleaning up application resources...")
-        if hasattr(app.state, 'conn'):
-            app.state.conn.close()
-            log_info("[SHUTDOWN] SQLite connection closed.")
+        if hasattr(app.state, 'hybrid_retriever'):
+            app.state.hybrid_retriever.close()
+        if hasattr(app.state, 'chat_writer'):
+            app.state.chat_writer.stop()
+            log_info("[SHUTDOWN] Chat interaction queue drained.")
+        if hasattr(app.state, 'db_pool'):
+            app.state.db_pool.close()
+            log_info("[SHUTDOWN] SQLite connection pool closed.")
         if hasattr(app.state, 'llm'):
             del app.state.llm
             log_info("[SHUTDOWN] LLM resources released.")
@@ -63,8 +88,12 @@ app = FastAPI(
 app.include_router(hello_routes, prefix="/api", tags=["Hello World"])
 app.include_router(upload_route, prefix="/api", tags=["Document Upload"])
 app.include_router(to_chunks_route, prefix="/api", tags=["Document Processing"])
+app.include_router(ingest_archive_route, prefix="/api", tags=["Document Processing"])
 app.include_router(chunks_embedding_route, prefix="/api", tags=["Embedding Generation"])
+app.include_router(snapshot_route, prefix="/api", tags=["Vector Snapshots"])
 app.include_router(chat_route, prefix="/api", tags=["Chatbot Interaction"])
+app.include_router(history_route, prefix="/api", tags=["Chatbot Interaction"])
+app.include_router(precompute_route, prefix="/api", tags=["Chatbot Interaction"])
 app.include_router(llm_settings_route, prefix="/api", tags=["LLM Configuration"])
 app.include_router(live_rag_route, prefix="/api", tags=["Live RAG"])
 app.include_router(logers_router, prefix="/api", tags=["Loges System"])
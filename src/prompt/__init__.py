@@ -1 +1,2 @@
-from .prompt import FarmAssistantPromptBuilder
\ No newline at end of file
+from .prompt import FarmAssistantPromptBuilder, format_retrieved_context
+from .context_assembler import ContextAssembler
@@ -0,0 +1,150 @@
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_debug
+    from helpers import get_settings, Settings
+    from .prompt import FarmAssistantPromptBuilder, format_retrieved_context
+except ImportError as ie:
+    print(f"ImportError in {__file__}: {ie}")
+    raise
+
+app_setting: Settings = get_settings()
+
+# Overlaps shorter than this are left alone; they are as likely to be coincidence
+MIN_OVERLAP_CHARS = 24
+# Upper bound on characters per token, to turn a token overlap into a search window
+MAX_CHARS_PER_TOKEN = 8
+
+
+def overlap_window(settings: Settings) -> int:
+    """
+    Characters to search for the splitter overlap of the active chunking mode. Token
+    mode can fall back to characters (no tokenizer), so it covers both overlaps.
+    """
+    window = 2 * settings.CHUNK_OVERLAP
+    if settings.CHUNKING_MODE == "tokens":
+        window = max(window, settings.CHUNK_TOKEN_OVERLAP * MAX_CHARS_PER_TOKEN)
+    return max(window, MIN_OVERLAP_CHARS)
+
+
+def overlap_length(head: str, tail: str, max_overlap: int) -> int:
+    """
+    Length of the longest suffix of ``head`` that is also a prefix of ``tail``
+    (at most ``max_overlap`` characters, at least MIN_OVERLAP_CHARS, else 0).
+    """
+    window = head[-max_overlap:]
+    probe = tail[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+
+    position = window.find(probe)
+    while position != -1:
+        length = len(window) - position
+        if tail.startswith(window[position:]):
+            return length
+        position = window.find(probe, position + 1)
+    return 0
+
+
+class ContextAssembler:
+    """
+    Fits retrieved passages into a token budget before they reach the prompt.
+
+    Passages are taken best first. Text that a neighbouring chunk of the same document
+    (chunk id +/- 1) already carries, the splitter overlap, is cut, and exact duplicates
+    are dropped. Tokens are counted with the active LLM's tokenizer, so the size of the
+    context, and with it the prefill cost, is bounded by ``budget_tokens``.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[List[str]], List[int]],
+        budget_tokens: Optional[int] = None,
+        max_overlap_chars: Optional[int] = None
+    ):
+        self.count_tokens = count_tokens
+        self.budget_tokens = budget_tokens or app_setting.PROMPT_CONTEXT_TOKENS
+        self.max_overlap_chars = max_overlap_chars or overlap_window(app_setting)
+
+    def _dedupe(self, docs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        by_id = {}
+        kept, seen, trimmed = [], set(), 0
+        for doc in docs:
+            text = doc["text"]
+            if text in seen:
+                continue
+            chunk_id = doc.get("id")
+            if isinstance(chunk_id, int):
+                previous = by_id.get(chunk_id - 1)
+                if previous is not None:
+                    cut = overlap_length(previous["text"], text, self.max_overlap_chars)
+                    text, trimmed = text[cut:], trimmed + cut
+                following = by_id.get(chunk_id + 1)
+                if following is not None:
+                    cut = overlap_length(text, following["text"], self.max_overlap_chars)
+                    text, trimmed = text[:len(text) - cut], trimmed + cut
+            text = text.strip()
+            if not text:
+                continue
+            seen.add(doc["text"])
+            doc = {**doc, "text": text}
+            kept.append(doc)
+            if isinstance(chunk_id, int):
+                by_id[chunk_id] = doc
+        return kept, trimmed
+
+    def assemble(self, docs: List[Dict[str, Any]]) -> Tuple[str, Dict[str, int]]:
+        """
+        Builds the context string from passages shaped like search_embeddings results.
+
+        Returns:
+            Tuple[str, Dict[str, int]]: The context and its stats (passages kept and
+            dropped, context tokens, characters trimmed as overlap).
+        """
+        candidates, trimmed = self._dedupe(docs)
+        # Each line is counted as rendered, numbering and score included
+        lines = [format_retrieved_context([doc]) for doc in candidates]
+        counts = self.count_tokens(lines) if lines else []
+
+        chosen, used = [], 0
+        for doc, tokens in zip(candidates, counts):
+            if used + tokens <= self.budget_tokens:
+                chosen.append(doc)
+                used += tokens
+
+        if not chosen and candidates:
+            # Even the best passage is over budget: keep its share that fits
+            doc, tokens = candidates[0], counts[0]
+            keep = int(len(doc["text"]) * self.budget_tokens / max(tokens, 1))
+            chosen = [{**doc, "text": doc["text"][:keep]}]
+            used = self.count_tokens([format_retrieved_context(chosen)])[0]
+
+        context = format_retrieved_context(chosen)
+        stats = {
+            "passages": len(chosen),
+            "dropped": len(docs) - len(chosen),
+            "context_tokens": used,
+            "trimmed_chars": trimmed,
+        }
+        log_debug(f"[CONTEXT] {stats}")
+        return context, stats
+
+    def build_prompt(self, docs: List[Dict[str, Any]], user_message: str = "", weather: Any = "") -> Tuple[str, int]:
+        """
+        Assembles the context and renders the farm assistant prompt around it.
+
+        Returns:
+            Tuple[str, int]: The prompt and its token count.
+        """
+        context, _ = self.assemble(docs)
+        prompt = FarmAssistantPromptBuilder().build_prompt(
+            context=context,
+            user_message=user_message,
+            weather=weather,
+        )
+        return prompt, self.count_tokens([prompt])[0]
@@ -49,3 +49,12 @@ class FarmAssistantPromptBuilder:
             "4. **Timing**: Do this 2 weeks before planting\n"
             "5. **Expected Results**: pH will rise to 6.5 in 30 days"
         )
+
+
+def format_retrieved_context(retrieved_docs: list[dict]) -> str:
+    """Format retrieved docs into a single context string for the prompt."""
+    parts = [
+        f"Context {i+1} (Score: {doc['score']:.2f}): {doc['text']}"
+        for i, doc in enumerate(retrieved_docs)
+    ]
+    return "\n\n".join(parts)
@@ -6,4 +6,8 @@ from .chat import chat_route
 from .llm_setting import llm_settings_route
 from .route_live_rag import live_rag_route
 from .route_logs import logers_router
-from .route_monitor import monitor_router
\ No newline at end of file
+from .route_monitor import monitor_router
+from .ingest_archive import ingest_archive_route
+from .route_history import history_route
+from .route_snapshots import snapshot_route
+from .route_precompute import precompute_route
@@ -1,9 +1,14 @@
+import io
 import os
 import sys
-from typing import Union
+import csv
+import time
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.status import (
     HTTP_200_OK,
     HTTP_400_BAD_REQUEST,
@@ -15,18 +20,21 @@ try:
     sys.path.append(MAIN_DIR)
 
     from src.logs import log_error, log_info, log_debug, log_warning
-    from src.dbs import add_query_response
-    from src.prompt import FarmAssistantPromptBuilder
+    from src.dbs import ChatInteractionWriter, ChunkTextHydrator, PrecomputedRecommendations, normalize_term
+    from src.prompt import ContextAssembler
     from src.schemes import ChatRoute
     from src.llm import HuggingFaceLLM, GoogleLLM
     from src.db_vector import StartQdrant
-    from src.embedding import EmbeddingService
-    from src.helpers import split_soil_elements
+    from src.controllers import HybridRetriever, BulkRecommender, read_soil_table, classify_columns
+    from src.embedding import EmbeddingService, CrossEncoderReranker
+    from src.helpers import split_soil_elements, normalize_soil_elements, format_soil_query, get_settings, Settings, SingleFlight
 
 except ImportError as e:
     msg = f"Import Error in {__file__}: {e}"
     raise ImportError(msg) from e
 
+app_setting: Settings = get_settings()
+
 chat_route = APIRouter()
 
 def get_llm(request: Request) -> Union[HuggingFaceLLM, GoogleLLM]:
@@ -54,16 +62,16 @@ def get_qdrant_vector_db(request: Request) -> StartQdrant:
         )
     return qdrant
 
-def get_db_conn(request: Request):
-    """Retrieve the relational database connection from the app state."""
-    conn = getattr(request.app.state, "conn", None)
-    if conn is None:
-        log_warning("Relational database connection not found.")
+def get_chat_writer(request: Request) -> ChatInteractionWriter:
+    """Retrieve the write-behind interaction writer from the app state."""
+    writer = getattr(request.app.state, "chat_writer", None)
+    if writer is None:
+        log_warning("Chat interaction writer not found in application state.")
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Relational database service is not available.",
+            detail="Interaction storage service is not available.",
         )
-    return conn
+    return writer
 
 def get_embedding_model(request: Request) -> EmbeddingService:
     """Retrieve the embedding model instance from the app state."""
@@ -76,32 +84,150 @@ def get_embedding_model(request: Request) -> EmbeddingService:
         )
     return embedding
 
-def format_retrieved_context(retrieved_docs: list[dict]) -> str:
-    """Format retrieved docs into a single context string for the prompt."""
-    parts = [
-        f"Context {i+1} (Score: {doc['score']:.2f}): {doc['text']}"
-        for i, doc in enumerate(retrieved_docs)
-    ]
-    return "\n\n".join(parts)
+def get_chunk_hydrator(request: Request) -> Optional[ChunkTextHydrator]:
+    """Retrieve the chunk text hydrator used for lean vector payloads, if configured."""
+    return getattr(request.app.state, "chunk_hydrator", None)
+
+def get_hybrid_retriever(request: Request) -> Optional[HybridRetriever]:
+    """Retrieve the hybrid lexical + vector retriever from the app state, if configured."""
+    return getattr(request.app.state, "hybrid_retriever", None)
+
+def get_reranker(request: Request) -> Optional[CrossEncoderReranker]:
+    """Retrieve the cross-encoder reranker from the app state, if enabled."""
+    return getattr(request.app.state, "reranker", None)
+
+def get_chat_flights(request: Request) -> SingleFlight:
+    """Retrieve the single-flight group shared by concurrent chat requests."""
+    flights = getattr(request.app.state, "chat_flights", None)
+    if flights is None:
+        flights = request.app.state.chat_flights = SingleFlight()
+    return flights
+
+def get_precomputed_store(request: Request) -> Optional[PrecomputedRecommendations]:
+    """Retrieve the precomputed recommendation store from the app state, if configured."""
+    return getattr(request.app.state, "precomputed", None)
+
+def prepare_parameter(
+    individual_query: str,
+    weather: dict,
+    llm: Union[HuggingFaceLLM, GoogleLLM],
+    qdrant: StartQdrant,
+    embedding: EmbeddingService,
+    hydrator: Optional[ChunkTextHydrator],
+    retriever: Optional[HybridRetriever],
+    reranker: Optional[CrossEncoderReranker],
+    options: dict,
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Embeds, retrieves, optionally reranks and builds the prompt for one soil parameter.
+    Blocking; run in the threadpool.
+
+    Returns:
+        Tuple[Optional[str], Optional[int]]: (prompt, prompt tokens), or (None, None)
+        when no context was found.
+    """
+    log_debug(f"Embedding and searching for {individual_query}...")
+
+    # Step 1: Embed and search
+    embedding_vector = embedding.embed(text=individual_query)
+    if options["retrieval_mode"] == "hybrid" and retriever is not None:
+        retrieved = retriever.retrieve(
+            query=individual_query,
+            query_embedding=embedding_vector,
+            top_k=options["depth"],
+            score_threshold=0.3,
+            filters=options["filters"]
+        )
+    else:
+        retrieved = qdrant.search_embeddings(
+            collection_name="embeddings",
+            query_embedding=embedding_vector,
+            top_k=options["depth"],
+            score_threshold=0.3,
+            hydrator=hydrator,
+            query_filter=options["query_filter"]
+        )
+
+    if retrieved and options["use_rerank"]:
+        retrieved, reranked = reranker.rerank(
+            query=individual_query,
+            docs=retrieved,
+            top_n=options["rerank_top_n"],
+            budget_ms=max(0.0, (options["rerank_deadline"] - time.perf_counter()) * 1000),
+        )
+        if not reranked:
+            retrieved = retrieved[:5]
+
+    if not retrieved:
+        log_warning(f"No relevant docs found for {individual_query}")
+        return None, None
+
+    # Step 2: Build prompt from the retrieved context that fits the token budget
+    prompt, prompt_tokens = ContextAssembler(llm.count_tokens).build_prompt(
+        docs=retrieved,
+        user_message=individual_query,
+        weather=weather,
+    )
+    log_debug(f"Prompt for {individual_query}: {prompt_tokens} tokens")
+    return prompt, prompt_tokens
+
+async def answer_parameter(
+    individual_query: str,
+    weather: dict,
+    llm: Union[HuggingFaceLLM, GoogleLLM],
+    qdrant: StartQdrant,
+    embedding: EmbeddingService,
+    hydrator: Optional[ChunkTextHydrator],
+    retriever: Optional[HybridRetriever],
+    reranker: Optional[CrossEncoderReranker],
+    options: dict,
+) -> Tuple[str, str, Optional[int]]:
+    """
+    Retrieves context for one soil parameter in the threadpool, then awaits the LLM,
+    so clients with an async API generate without holding a worker thread.
+
+    Returns:
+        Tuple[str, str, Optional[int]]: (status, advice, prompt tokens)
+    """
+    prompt, prompt_tokens = await run_in_threadpool(
+        prepare_parameter,
+        individual_query, weather, llm, qdrant, embedding, hydrator, retriever, reranker, options,
+    )
+    if prompt is None:
+        return "NoContext", "No context found for this parameter.", None
+    try:
+        advice = (await llm.aresponse(prompt)).strip()
+        log_debug(f"Advice for {individual_query}: {advice[:80]}...")
+        return "Processed", advice, prompt_tokens
+    except RuntimeError as e:
+        log_error(f"LLM error for {individual_query}: {e}")
+        return "Error", "Error generating advice.", prompt_tokens
 
 @chat_route.post("/chat", response_class=JSONResponse)
 async def chat(
     user_id: str,
     body: ChatRoute,
     llm: Union[HuggingFaceLLM, GoogleLLM] = Depends(get_llm),
-    conn = Depends(get_db_conn),
+    writer: ChatInteractionWriter = Depends(get_chat_writer),
     qdrant: StartQdrant = Depends(get_qdrant_vector_db),
     embedding: EmbeddingService = Depends(get_embedding_model),
+    hydrator: Optional[ChunkTextHydrator] = Depends(get_chunk_hydrator),
+    retriever: Optional[HybridRetriever] = Depends(get_hybrid_retriever),
+    reranker: Optional[CrossEncoderReranker] = Depends(get_reranker),
+    precomputed_store: Optional[PrecomputedRecommendations] = Depends(get_precomputed_store),
+    flights: SingleFlight = Depends(get_chat_flights),
 ) -> JSONResponse:
     """
-    1. Parses soil & weather from user query.
-    2. Embeds each soil parameter.
+    1. Parses soil & weather from the user query (or the structured body) into canonical keys and units.
+    2. Answers vocabulary parameters of weatherless requests from the precomputed table, embeds the others.
     3. Retrieves similar docs from Qdrant.
-    4. Builds prompt & queries LLM if context exists.
-    5. Stores full interaction in relational DB.
+    4. Optionally reranks a wider candidate set down to the best few passages.
+    5. Fits the passages into the prompt token budget & awaits the LLM if context exists; steps 2-5 never block the
+       event loop and are shared by concurrent requests for the same parameter, value and weather.
+    6. Queues the full interaction for a batched write to the relational DB.
     """
     query = body.query.strip()
-    if not query:
+    if not query and not body.soil:
         log_warning("Empty query received")
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
@@ -111,63 +237,81 @@ async def chat(
     log_info(f"Received chat query for user {user_id}")
 
     try:
-        soil, weather = split_soil_elements(query)
+        if body.soil:
+            soil, weather = normalize_soil_elements(body.soil, body.weather)
+            query = format_soil_query(soil, weather)
+        else:
+            soil, weather = split_soil_elements(query)
         log_debug(f"Parsed input for user_id={user_id}: Soil={soil}, Weather={weather}")
 
+        query_filter = qdrant.build_filter(body.filters)
+        created_at = datetime.now(timezone.utc).isoformat(timespec="microseconds")
         recommendations = []
 
+        # Reranking scores a wider candidate set within a budget for the whole request
+        use_rerank = reranker is not None and (body.rerank if body.rerank is not None else app_setting.RERANK_ENABLED)
+        budget_ms = body.rerank_budget_ms if body.rerank_budget_ms is not None else app_setting.RERANK_BUDGET_MS
+        options = {
+            "retrieval_mode": body.retrieval_mode,
+            "filters": body.filters,
+            "query_filter": query_filter,
+            "depth": max(app_setting.RERANK_CANDIDATES, 5) if use_rerank else 5,
+            "use_rerank": use_rerank,
+            "rerank_top_n": body.rerank_top_n,
+            "rerank_deadline": time.perf_counter() + budget_ms / 1000,
+        }
+        model_version = llm.config_id()
+
+        # Precomputed advice stems from the default pipeline without weather, so requests
+        # that change the pipeline or carry weather data skip the lookup
+        precomputed = {}
+        if (
+            precomputed_store is not None
+            and app_setting.PRECOMPUTED_RECOMMENDATIONS
+            and not weather
+            and body.filters is None
+            and body.retrieval_mode == "vector"
+            and body.rerank is None
+        ):
+            precomputed = await run_in_threadpool(precomputed_store.lookup, soil.items(), model_version)
+
+        # Everything besides parameter and value that shapes the answer
+        work_context = (
+            tuple(sorted((normalize_term(k), normalize_term(v)) for k, v in weather.items())),
+            model_version,
+            body.retrieval_mode,
+            body.filters.model_dump_json() if body.filters is not None else None,
+            use_rerank,
+            body.rerank_top_n,
+        )
+
         for parameter, value in soil.items():
             individual_query = f"{parameter}: {value}"
-            log_debug(f"Embedding and searching for {parameter}...")
-
-            # Step 1: Embed and search
-            embedding_vector = embedding.embed(text=individual_query)
-            retrieved = qdrant.search_embeddings(
-                collection_name="embeddings",
-                query_embedding=embedding_vector,
-                top_k=5,
-                score_threshold=0.3
-            )
-
-            if retrieved:
-                # Build prompt from retrieved context
-                context = format_retrieved_context(retrieved)
-                prompt = FarmAssistantPromptBuilder().build_prompt(
-                    context=context,
-                    user_message=individual_query,
-                    weather=weather,
-                )
-                try:
-                    advice = llm.response(prompt=prompt).strip()
-                    status = "Processed"
-                    log_debug(f"Advice for {parameter}: {advice[:80]}...")
-                except RuntimeError as e:
-                    log_error(f"LLM error for {parameter}: {e}")
-                    advice = "Error generating advice."
-                    status = "Error"
+
+            entry = precomputed.get((normalize_term(parameter), normalize_term(value)))
+            if entry is not None:
+                log_debug(f"Precomputed advice used for {parameter}")
+                status, advice, prompt_tokens = entry["status"], entry["advice"], None
             else:
-                log_warning(f"No relevant docs found for {parameter}")
-                advice = "No context found for this parameter."
-                status = "NoContext"
+                # Concurrent requests for the same unit of work share one computation
+                status, advice, prompt_tokens = await flights.do(
+                    (normalize_term(parameter), normalize_term(value), work_context),
+                    answer_parameter,
+                    individual_query, weather, llm, qdrant, embedding, hydrator, retriever, reranker, options,
+                )
 
             recommendations.append({
                 "parameter": parameter,
                 "value": value,
                 "status": status,
                 "advice": advice,
+                "prompt_tokens": prompt_tokens,
             })
 
-        # Persist the interaction
-        try:
-            add_query_response(
-                conn=conn,
-                query=query,
-                response=str(recommendations),
-                user_id=user_id,
-            )
-            log_info(f"Stored interaction for user {user_id}")
-        except RuntimeError as e:
-            log_error(f"DB storage error: {e}")
+        # Persist the interaction off the request path
+        record = (user_id, query, getattr(llm, "model_name", None), llm.config_id(), created_at, recommendations)
+        if writer.submit(record):
+            log_info(f"Queued interaction for user {user_id}")
 
         return JSONResponse(
             status_code=HTTP_200_OK,
@@ -185,3 +329,71 @@ async def chat(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while processing your request",
         ) from e
+
+def stream_bulk_csv(df, recommender: BulkRecommender, flush_bytes: int = 64 * 1024) -> Iterator[str]:
+    """Renders the per-row results as CSV, flushed in chunks of about ``flush_bytes``."""
+    buffer = io.StringIO()
+    writer = None
+    try:
+        for row in recommender.iter_rows(df):
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            if buffer.tell() >= flush_bytes:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    except Exception as e:
+        # Headers are already sent; the download ends early
+        log_error(f"Bulk chat aborted: {e}")
+    yield buffer.getvalue()
+
+@chat_route.post("/chat/bulk")
+async def chat_bulk(
+    file: UploadFile = File(...),
+    llm: Union[HuggingFaceLLM, GoogleLLM] = Depends(get_llm),
+    qdrant: StartQdrant = Depends(get_qdrant_vector_db),
+    embedding: EmbeddingService = Depends(get_embedding_model),
+    hydrator: Optional[ChunkTextHydrator] = Depends(get_chunk_hydrator),
+    reranker: Optional[CrossEncoderReranker] = Depends(get_reranker),
+    precomputed_store: Optional[PrecomputedRecommendations] = Depends(get_precomputed_store),
+) -> StreamingResponse:
+    """
+    Scores a lab export (CSV or Parquet, one sample per row, one column per soil or
+    weather parameter) and streams back a CSV with one line per (row, parameter).
+    Identical inputs across rows are retrieved and generated only once.
+    """
+    try:
+        df = await run_in_threadpool(read_soil_table, file.file, file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        log_error(f"Failed to read bulk file '{file.filename}': {e}")
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Could not read the uploaded table.")
+
+    if df.empty:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="The uploaded table has no rows.")
+    if len(df) > app_setting.BULK_CHAT_MAX_ROWS:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"At most {app_setting.BULK_CHAT_MAX_ROWS} rows per upload.",
+        )
+    if not classify_columns(df.columns)[0]:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="No soil parameter column found.")
+
+    recommender = BulkRecommender(
+        qdrant=qdrant,
+        embedding=embedding,
+        llm=llm,
+        hydrator=hydrator,
+        reranker=reranker,
+        precomputed_store=precomputed_store,
+    )
+    stem = os.path.splitext(os.path.basename(file.filename or "soil"))[0].replace('"', "")
+    log_info(f"Bulk chat started for '{file.filename}' ({len(df)} rows)")
+    return StreamingResponse(
+        stream_bulk_csv(df, recommender),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{stem}_recommendations.csv"'},
+    )
@@ -1,5 +1,7 @@
 import os
 import sys
+from itertools import islice
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from starlette.status import HTTP_200_OK, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
@@ -12,25 +14,16 @@ try:
     if MAIN_DIR not in sys.path:
         sys.path.append(MAIN_DIR)
 
-    from src.dbs import fetch_all_rows
+    from src.dbs import iter_rows
     from src.logs import log_error, log_info
     from src.embedding import EmbeddingService
     from src.db_vector import StartQdrant
+    from src.helpers import get_settings, Settings
+    from .dependencies import get_db_conn
 
 except Exception as e:
     raise ImportError(f"[IMPORT ERROR] {__file__}: {e}") from e
 
-def get_db_conn(request: Request):
-    """Retrieve the relational database connection from the app state."""
-    conn = request.app.state.conn
-    if not conn:
-        log_warning("Relational database connection not found in application state.")
-        raise HTTPException(
-            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Relational database service is not available."
-        )
-    return conn
-
 def get_qdrant_vector_db(request: Request) -> StartQdrant:
     """Retrieve the Qdrant vector database connection from the app state."""
     qdrant = request.app.state.qdrant
@@ -53,35 +46,87 @@ def get_embedding_model(request: Request) -> EmbeddingService:
         )
     return embedding
 
+app_setting: Settings = get_settings()
+
 chunks_embedding_route = APIRouter()
 
+def build_payload(chunk_id: int, text: str, pages: str, sources: str,
+                  crop: Optional[str], region: Optional[str], year: Optional[int]) -> dict:
+    """
+    Vector payload for a chunk: the full text, or in lean mode only the chunk id
+    (plus pages) with the text hydrated from SQLite at search time. The indexed
+    filter fields (source, crop, region, year) are stored in both modes.
+    """
+    if app_setting.QDRANT_PAYLOAD_MODE == "lean":
+        payload = {"chunk_id": chunk_id}
+        if app_setting.QDRANT_PAYLOAD_METADATA:
+            payload["pages"] = pages
+    else:
+        payload = {"text": text}
+
+    payload["source"] = os.path.basename(sources or "")
+    for key, value in (("crop", crop), ("region", region), ("year", year)):
+        if value is not None:
+            payload[key] = value
+    return payload
+
 @chunks_embedding_route.post("/chunks_to_embedding", response_class=JSONResponse)
-async def chunks_to_embedding(conn: sqlite3.Connection = Depends(get_db_conn),
+async def chunks_to_embedding(after_id: Optional[int] = None,
+                              conn: sqlite3.Connection = Depends(get_db_conn),
                               qdrant: StartQdrant = Depends(get_qdrant_vector_db),
                               embed: EmbeddingService = Depends(get_embedding_model)):
     """
     Convert text chunks to embedding and store them in the database.
+
+    Chunks are streamed in id order, one sort window at a time. The response
+    carries ``last_id``; pass it back as ``after_id`` to resume an interrupted run.
     """
     try:
-        # Pull chunks from the database
-        chunks = fetch_all_rows(conn=conn, table_name="chunks", columns=["text", "id"])
-        if not chunks:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="No chunks found in the database.")
-        
-        log_info(f"Pulled {len(chunks)} chunk(s) from the database.")
-        for chunk in chunks:
-            # Convert chunks to embedding
-            embedding = embed.embed(text=chunk["text"])
-
-            # Store the embedding in the database
-            qdrant.insert_embedding(
+        # Stream chunks from the database
+        # Duplicates reference their canonical chunk and are never embedded
+        rows = iter_rows(
+            conn=conn,
+            table_name="chunks_resolved",
+            columns=["id", "text", "token_count", "pages", "sources", "crop", "region", "year"],
+            where="canonical_hash IS NULL",
+            after_id=after_id
+        )
+
+        embedded = 0
+        last_id = after_id
+        window = app_setting.EMBEDDING_SORT_WINDOW
+        while True:
+            batch = list(islice(rows, window))
+            if not batch:
+                break
+            ids, texts, token_counts, pages, sources, crops, regions, years = zip(*batch)
+
+            # Convert chunks to embedding, bucketed by token length
+            embeddings = embed.embed_batch(texts=list(texts), token_counts=list(token_counts))
+            if embeddings is None:
+                raise RuntimeError(f"Embedding generation failed after chunk id {last_id}.")
+
+            # Store the embeddings in the database
+            qdrant.insert_embeddings(
                 "embeddings",
-                embedding=embedding,
-                id_=chunk["id"],
-                payload={"text": chunk["text"]}
+                embeddings=embeddings,
+                ids=list(ids),
+                payloads=[
+                    build_payload(*fields)
+                    for fields in zip(ids, texts, pages, sources, crops, regions, years)
+                ]
             )
+            embedded += len(batch)
+            last_id = ids[-1]
+            log_info(f"Embedded {embedded} chunk(s) so far, last id {last_id}.")
+
+        if not embedded:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="No chunks found in the database.")
 
-        return JSONResponse(content={"status": "success"}, status_code=HTTP_200_OK)
+        return JSONResponse(
+            content={"status": "success", "embedded_chunks": embedded, "last_id": last_id},
+            status_code=HTTP_200_OK
+        )
 
     except HTTPException as http_exc:
         # Re-raise FastAPI errors
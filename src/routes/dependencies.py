@@ -0,0 +1,52 @@
+import os
+import sys
+import sqlite3
+from typing import Iterator
+
+from fastapi import HTTPException, Request
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR, HTTP_503_SERVICE_UNAVAILABLE
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+    sys.path.append(MAIN_DIR)
+
+    from src.logs import log_info, log_warning
+
+except ImportError as e:
+    msg = f"Import Error in {__file__}: {e}"
+    raise ImportError(msg) from e
+
+
+def get_db_conn(request: Request) -> Iterator[sqlite3.Connection]:
+    """Hand out a pooled relational database connection for the duration of the request."""
+    pool = getattr(request.app.state, "db_pool", None)
+    if pool is None:
+        log_warning("Relational database pool not found in application state.")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Relational database service is not available.",
+        )
+    try:
+        conn = pool.acquire()
+    except TimeoutError as e:
+        log_warning(f"Relational database pool exhausted: {e}")
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Relational database is busy, please retry.",
+        )
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def clear_chunk_caches(request: Request) -> None:
+    """
+    Drop the cached chunk texts and rerank scores. Both are keyed by chunk id, so they
+    go stale whenever the chunks table is reset or the vector collection is replaced.
+    """
+    for name in ("chunk_hydrator", "reranker"):
+        cache = getattr(request.app.state, name, None)
+        if cache is not None:
+            cache.clear()
+    log_info("Chunk text and rerank caches cleared.")
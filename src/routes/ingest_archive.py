@@ -0,0 +1,104 @@
+from fastapi import APIRouter, HTTPException, Request, Depends, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+from pathlib import Path
+import sys
+import sqlite3 as sql3
+from typing import Optional
+import tarfile
+import zipfile
+
+from src.logs.logger import log_warning
+
+FILE_LOCATION = str(Path(__file__).resolve())
+
+try:
+    MAIN_DIR = Path(__file__).resolve().parent.parent
+    sys.path.append(str(MAIN_DIR))
+
+    from logs import log_error, log_info
+    from controllers import ingest_archive, tag_chunks, mark_stored_duplicates, index_chunk_signatures, count_duplicates
+    from dbs import add_chunk
+    from embedding import EmbeddingService
+    from helpers import get_settings
+    from .dependencies import get_db_conn
+except Exception as e:
+    raise ImportError(f"Import Error in: {FILE_LOCATION}, Error: {e}")
+
+def get_embedding_model(request: Request) -> EmbeddingService:
+    """Retrieve the embedding model instance from the app state."""
+    embedding = request.app.state.embedded
+    if not embedding:
+        log_warning("Embedding model instance not found in application state.")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Embedding model service is not available."
+        )
+    return embedding
+
+ingest_archive_route = APIRouter()
+
+
+def store_archive_chunks(conn: sql3.Connection, df, crop: Optional[str], region: Optional[str], year: Optional[int]):
+    """
+    Tags the chunks, resolves duplicates of stored chunks and inserts them. Blocking
+    SQLite and MinHash work, so the route runs it in the threadpool.
+
+    Returns:
+        Tuple[DataFrame, int]: The stored chunks and the number of rows inserted.
+
+    Raises:
+        sqlite3.Error: If the chunks could not be stored.
+    """
+    df = tag_chunks(df, crop=crop, region=region, year=year)
+    df = mark_stored_duplicates(conn=conn, df=df)
+    ids = add_chunk(conn=conn, data=df)
+    index_chunk_signatures(conn=conn, df=df)
+    return df, len(ids)
+
+
+@ingest_archive_route.post("/ingest_archive")
+async def ingest_archive_file(file: UploadFile = File(...),
+                              crop: Optional[str] = None,
+                              region: Optional[str] = None,
+                              year: Optional[int] = None,
+                              conn: sql3.Connection = Depends(get_db_conn),
+                              embed: EmbeddingService = Depends(get_embedding_model)):
+    """
+    Extracts PDFs and TXTs from a zip or tar archive, chunks them in parallel
+    and stores the chunks in the SQLite database, tagged with the optional
+    crop / region / year filter metadata.
+    """
+    log_info(f"Starting archive ingestion for: {file.filename}")
+
+    try:
+        df, summary = await run_in_threadpool(
+            ingest_archive, file.file, file.filename, get_settings(), embed.tokenizer, embed.max_seq_length
+        )
+    except (ValueError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+        log_error(f"Rejected archive '{file.filename}': {e}")
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        log_error(f"Unexpected error in /ingest_archive endpoint: {e}")
+        return JSONResponse(
+            content={"status": "error", "message": "Internal server error"},
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    if not df.empty:
+        try:
+            df, inserted = await run_in_threadpool(store_archive_chunks, conn, df, crop, region, year)
+        except Exception as e:
+            log_error(f"Failed to store chunks of archive '{file.filename}': {e}")
+            return JSONResponse(
+                content={"status": "error", "message": "Failed to store the archive chunks."},
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        summary["duplicates"] = count_duplicates(df)
+        log_info(f"Inserted {inserted} chunks from archive '{file.filename}'.")
+
+    return JSONResponse(
+        content={"status": "success", "archive": file.filename, **summary},
+        status_code=HTTP_200_OK,
+    )
@@ -45,6 +45,7 @@ async def apply_model_settings(
                 "do_sample": body.do_sample,
                 "quantization": body.quantization,
                 "quantization_type": body.quantization_type,
+                "seed": body.seed,
             }
             llm = HuggingFaceLLM(model_name=body.model_name, **model_config)
         elif llm_name == "google":
@@ -57,6 +58,8 @@ async def apply_model_settings(
             raise ValueError(f"Unsupported model provider: {llm_name}")
 
         llm.initialize_llm()
+        # Responses of deterministic configs are reused across requests and restarts
+        llm.response_cache = getattr(request.app.state, "response_cache", None)
         request.app.state.llm = llm
 
         message = f"[APPLICATION] {llm_name} model '{body.model_name}' initialized successfully."
@@ -0,0 +1,85 @@
+import os
+import sys
+import base64
+import sqlite3
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+    sys.path.append(MAIN_DIR)
+
+    from src.logs import log_error, log_info, log_warning
+    from src.dbs import fetch_chat_history
+    from .dependencies import get_db_conn
+
+except ImportError as e:
+    msg = f"Import Error in {__file__}: {e}"
+    raise ImportError(msg) from e
+
+history_route = APIRouter()
+
+def encode_cursor(created_at: str, interaction_id: int) -> str:
+    """Opaque cursor pointing just past the given interaction."""
+    raw = f"{created_at}|{interaction_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    try:
+        created_at, interaction_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return created_at, int(interaction_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+@history_route.get("/history/{user_id}", response_class=JSONResponse)
+def chat_history(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    conn: sqlite3.Connection = Depends(get_db_conn),
+) -> JSONResponse:
+    """
+    Returns a user's chat interactions, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to read the next page;
+    it is null once the history is exhausted.
+    """
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        log_warning(str(e))
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    try:
+        # Read one extra row to know whether another page exists
+        interactions = fetch_chat_history(conn, user_id, limit=limit + 1, before=before)
+    except sqlite3.Error as e:
+        log_error(f"Failed to read chat history for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read chat history.",
+        )
+
+    next_cursor = None
+    if len(interactions) > limit:
+        interactions = interactions[:limit]
+        last = interactions[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+
+    log_info(f"Served {len(interactions)} history item(s) for user {user_id}")
+    return JSONResponse(
+        status_code=HTTP_200_OK,
+        content={
+            "user_id": user_id,
+            "interactions": interactions,
+            "next_cursor": next_cursor,
+        },
+    )
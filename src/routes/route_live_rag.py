@@ -1,8 +1,10 @@
 import os
 import sys
+import json
 import sqlite3 as sql3
+from typing import Iterator, List, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.status import (
     HTTP_200_OK,
     HTTP_400_BAD_REQUEST,
@@ -18,15 +20,19 @@ try:
     sys.path.append(MAIN_DIR)
 
     from logs import log_debug, log_error, log_info
-    from dbs import fetch_all_rows
+    from dbs import fetch_all_rows, ChunkTextHydrator
     from embedding import EmbeddingService
     from db_vector import StartQdrant
-    from schemes import LiveRAG
+    from controllers import HybridRetriever
+    from schemes import LiveRAG, LiveRAGBatch
+    from helpers import get_settings, Settings
 
 except ImportError as e:
     log_error(f"[IMPORT ERROR] {__file__}: {e}")
     raise
 
+app_setting: Settings = get_settings()
+
 live_rag_route = APIRouter()
 
 
@@ -46,11 +52,21 @@ def get_qdrant_vector_db(request: Request) -> StartQdrant:
     return qdrant
 
 
+def get_chunk_hydrator(request: Request) -> Optional[ChunkTextHydrator]:
+    return getattr(request.app.state, "chunk_hydrator", None)
+
+
+def get_hybrid_retriever(request: Request) -> Optional[HybridRetriever]:
+    return getattr(request.app.state, "hybrid_retriever", None)
+
+
 @live_rag_route.post("/live_rag", response_class=JSONResponse)
 async def live_rag(
     request_data: LiveRAG,
     embedd: EmbeddingService = Depends(get_embedd),
     qdrant: StartQdrant = Depends(get_qdrant_vector_db),
+    hydrator: Optional[ChunkTextHydrator] = Depends(get_chunk_hydrator),
+    retriever: Optional[HybridRetriever] = Depends(get_hybrid_retriever),
 ):
     """Endpoint for Live RAG search using vector embeddings."""
     query = request_data.query.strip()
@@ -71,12 +87,26 @@ async def live_rag(
         log_debug(f"Query embedded successfully.")
 
         # Step 2: Retrieve similar documents
-        retrieved_docs = qdrant.search_embeddings(
-            collection_name="embeddings",
-            query_embedding=query_embedding,
-            top_k=top_k,
-            score_threshold=score_threshold,
-        )
+        search_params = qdrant.build_search_params(request_data.search_mode, request_data.hnsw_ef)
+        if request_data.retrieval_mode == "hybrid" and retriever is not None:
+            retrieved_docs = retriever.retrieve(
+                query=query,
+                query_embedding=query_embedding,
+                top_k=top_k,
+                score_threshold=score_threshold,
+                filters=request_data.filters,
+                search_params=search_params,
+            )
+        else:
+            retrieved_docs = qdrant.search_embeddings(
+                collection_name="embeddings",
+                query_embedding=query_embedding,
+                top_k=top_k,
+                score_threshold=score_threshold,
+                hydrator=hydrator,
+                query_filter=qdrant.build_filter(request_data.filters),
+                search_params=search_params,
+            )
 
         if not retrieved_docs:
             log_info(f"No match found for query: '{query}'")
@@ -93,3 +123,103 @@ async def live_rag(
     except Exception as err:
         log_error(f"Unexpected error: {err}")
         raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "An internal error occurred.")
+
+
+def stream_batch(queries: List[LiveRAG], embedd: EmbeddingService, qdrant: StartQdrant,
+                 hydrator: Optional[ChunkTextHydrator],
+                 retriever: Optional[HybridRetriever] = None) -> Iterator[str]:
+    """
+    Yields one NDJSON line per query, in input order. Queries are embedded and
+    searched LIVE_RAG_BATCH_SIZE at a time: one embed call and one multi-search each.
+    Queries asking for "hybrid" retrieval go through the hybrid retriever with the
+    batch's embedding instead, as on /live_rag.
+    """
+    batch_size = max(1, app_setting.LIVE_RAG_BATCH_SIZE)
+    for start in range(0, len(queries), batch_size):
+        lines = {}
+        valid = []
+        for index, item in enumerate(queries[start:start + batch_size], start=start):
+            query = item.query.strip()
+            if not query:
+                lines[index] = {"index": index, "error": "Query cannot be empty."}
+            elif item.top_k <= 0:
+                lines[index] = {"index": index, "error": "top_k must be greater than zero."}
+            else:
+                valid.append((index, query, item))
+
+        if valid:
+            try:
+                embeddings = embedd.embed_batch(texts=[query for _, query, _ in valid])
+                if embeddings is None:
+                    raise RuntimeError("Embedding failed.")
+
+                vector, hybrid = [], []
+                for entry, embedding in zip(valid, embeddings):
+                    use_hybrid = entry[2].retrieval_mode == "hybrid" and retriever is not None
+                    (hybrid if use_hybrid else vector).append((entry, embedding))
+
+                if vector:
+                    results = qdrant.search_embeddings_batch(
+                        collection_name="embeddings",
+                        query_embeddings=[embedding for _, embedding in vector],
+                        requests=[
+                            {
+                                "top_k": item.top_k,
+                                "score_threshold": item.score_threshold,
+                                "query_filter": qdrant.build_filter(item.filters),
+                                "search_params": qdrant.build_search_params(item.search_mode, item.hnsw_ef),
+                            }
+                            for (_, _, item), _ in vector
+                        ],
+                        hydrator=hydrator,
+                    )
+                    for ((index, query, _), _), docs in zip(vector, results):
+                        lines[index] = {"index": index, "query": query, "results": docs}
+
+                for (index, query, item), embedding in hybrid:
+                    docs = retriever.retrieve(
+                        query=query,
+                        query_embedding=embedding,
+                        top_k=item.top_k,
+                        score_threshold=item.score_threshold,
+                        filters=item.filters,
+                        search_params=qdrant.build_search_params(item.search_mode, item.hnsw_ef),
+                    )
+                    lines[index] = {"index": index, "query": query, "results": docs}
+
+            except Exception as err:
+                log_error(f"Batch retrieval failed for queries {start}-{start + batch_size - 1}: {err}")
+                for index, _, _ in valid:
+                    lines[index] = {"index": index, "error": "An internal error occurred."}
+
+        for index in sorted(lines):
+            yield json.dumps(lines[index]) + "\n"
+
+
+@live_rag_route.post("/live_rag/batch")
+async def live_rag_batch(
+    request_data: LiveRAGBatch,
+    embedd: EmbeddingService = Depends(get_embedd),
+    qdrant: StartQdrant = Depends(get_qdrant_vector_db),
+    hydrator: Optional[ChunkTextHydrator] = Depends(get_chunk_hydrator),
+    retriever: Optional[HybridRetriever] = Depends(get_hybrid_retriever),
+):
+    """
+    Vector or hybrid retrieval (per query's retrieval_mode) for many queries in one
+    request, streamed back as NDJSON (one {"index", "query", "results"} or
+    {"index", "error"} line per query).
+    """
+    queries = request_data.queries
+    if not queries:
+        raise HTTPException(HTTP_400_BAD_REQUEST, "queries cannot be empty.")
+
+    if len(queries) > app_setting.LIVE_RAG_BATCH_MAX:
+        raise HTTPException(
+            HTTP_400_BAD_REQUEST, f"At most {app_setting.LIVE_RAG_BATCH_MAX} queries per request."
+        )
+
+    log_info(f"Batch retrieval of {len(queries)} queries.")
+    return StreamingResponse(
+        stream_batch(queries, embedd, qdrant, hydrator, retriever),
+        media_type="application/x-ndjson"
+    )
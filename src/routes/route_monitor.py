@@ -1,6 +1,6 @@
 import os
 import sys
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from starlette.status import HTTP_200_OK, HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -82,3 +82,91 @@ def gpu_usage():
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             content={"error": "Failed to retrieve GPU usage"}
         )
+
+@monitor_router.get("/health/chat_writer", summary="Get chat interaction write queue stats")
+def chat_writer_stats(request: Request):
+    try:
+        writer = getattr(request.app.state, "chat_writer", None)
+        if writer is None:
+            raise ValueError("Chat writer not initialized")
+        return writer.stats()
+    except Exception as e:
+        log_error(f"Error getting chat writer stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve chat writer stats"}
+        )
+
+@monitor_router.get("/health/chunk_hydrator", summary="Get chunk text cache stats")
+def chunk_hydrator_stats(request: Request):
+    try:
+        hydrator = getattr(request.app.state, "chunk_hydrator", None)
+        if hydrator is None:
+            raise ValueError("Chunk hydrator not initialized")
+        return hydrator.stats()
+    except Exception as e:
+        log_error(f"Error getting chunk hydrator stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve chunk hydrator stats"}
+        )
+
+@monitor_router.get("/health/reranker", summary="Get reranker cache and latency stats")
+def reranker_stats(request: Request):
+    try:
+        reranker = getattr(request.app.state, "reranker", None)
+        if reranker is None:
+            raise ValueError("Reranker not enabled")
+        return reranker.stats()
+    except Exception as e:
+        log_error(f"Error getting reranker stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve reranker stats"}
+        )
+
+@monitor_router.get("/health/chat_flights", summary="Get in-flight chat work deduplication stats")
+def chat_flights_stats(request: Request):
+    try:
+        flights = getattr(request.app.state, "chat_flights", None)
+        if flights is None:
+            raise ValueError("Chat single-flight group not initialized")
+        return flights.stats()
+    except Exception as e:
+        log_error(f"Error getting chat single-flight stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve chat single-flight stats"}
+        )
+
+@monitor_router.get("/health/llm_cache", summary="Get LLM response cache hit ratio and size")
+def llm_cache_stats(request: Request):
+    try:
+        cache = getattr(request.app.state, "response_cache", None)
+        if cache is None:
+            raise ValueError("LLM response cache not enabled")
+        llm = getattr(request.app.state, "llm", None)
+        return {
+            **cache.stats(),
+            "active_llm_cacheable": llm is not None and llm.response_cache is cache and llm.is_deterministic(),
+        }
+    except Exception as e:
+        log_error(f"Error getting LLM response cache stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve LLM response cache stats"}
+        )
+
+@monitor_router.get("/health/llm_rate_limit", summary="Get the async LLM client's rate limiter state")
+def llm_rate_limit_stats(request: Request):
+    try:
+        llm = getattr(request.app.state, "llm", None)
+        if llm is None or not hasattr(llm, "rate_limit_stats"):
+            raise ValueError("Active LLM has no rate limiter")
+        return llm.rate_limit_stats()
+    except Exception as e:
+        log_error(f"Error getting LLM rate limiter stats: {e}")
+        return JSONResponse(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"error": "Failed to retrieve LLM rate limiter stats"}
+        )
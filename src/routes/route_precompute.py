@@ -0,0 +1,121 @@
+import os
+import sys
+from typing import Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_409_CONFLICT,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+    sys.path.append(MAIN_DIR)
+
+    from src.logs import log_error, log_info, log_warning
+    from src.dbs import PrecomputedRecommendations
+    from src.controllers import materialize_recommendations, materialization_running, claim_materialization
+    from src.llm import HuggingFaceLLM, GoogleLLM
+
+except ImportError as e:
+    msg = f"Import Error in {__file__}: {e}"
+    raise ImportError(msg) from e
+
+precompute_route = APIRouter()
+
+def get_precomputed_store(request: Request) -> PrecomputedRecommendations:
+    """Retrieve the precomputed recommendation store from the app state."""
+    store = getattr(request.app.state, "precomputed", None)
+    if store is None:
+        log_warning("Precomputed recommendation store not found in application state.")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Precomputed recommendation storage is not available.",
+        )
+    return store
+
+def get_llm(request: Request) -> Union[HuggingFaceLLM, GoogleLLM]:
+    """Retrieve the LLM instance from the app state."""
+    llm = getattr(request.app.state, "llm", None)
+    if llm is None:
+        log_warning("LLM instance not found in application state.")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=(
+                "LLM service is not initialized. "
+                "Please configure the LLM via the /llmsSettings endpoint."
+            ),
+        )
+    return llm
+
+def run_materialization(request: Request, store: PrecomputedRecommendations, llm, force: bool) -> None:
+    """
+    Background task: materializes the vocabulary and keeps the outcome for the status
+    endpoint. The route has already claimed the job lock; the job releases it.
+    """
+    state = request.app.state
+    try:
+        state.precompute_last_run = materialize_recommendations(
+            store=store,
+            qdrant=state.qdrant,
+            embedding=state.embedded,
+            llm=llm,
+            hydrator=getattr(state, "chunk_hydrator", None),
+            reranker=getattr(state, "reranker", None),
+            force=force,
+            claimed=True,
+        )
+    except Exception as e:
+        log_error(f"[PRECOMPUTE] Materialization failed: {e}")
+        state.precompute_last_run = {"error": str(e)}
+
+@precompute_route.post("/precompute/recommendations", response_class=JSONResponse)
+async def start_materialization(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    force: bool = False,
+    store: PrecomputedRecommendations = Depends(get_precomputed_store),
+    llm: Union[HuggingFaceLLM, GoogleLLM] = Depends(get_llm),
+) -> JSONResponse:
+    """
+    Starts the offline materialization of the categorical soil vocabulary with the
+    current corpus and LLM. Pairs already stored for both versions are skipped
+    unless ``force`` is set.
+    """
+    model_version = llm.config_id()
+    # Claimed here rather than checked: two concurrent requests cannot both pass
+    if not claim_materialization():
+        raise HTTPException(status_code=HTTP_409_CONFLICT, detail="A materialization job is already running.")
+
+    background_tasks.add_task(run_materialization, request, store, llm, force)
+    log_info(f"[PRECOMPUTE] Materialization scheduled (force={force}).")
+    return JSONResponse(
+        status_code=HTTP_202_ACCEPTED,
+        content={"status": "started", "model_version": model_version},
+    )
+
+@precompute_route.get("/precompute/recommendations", response_class=JSONResponse)
+async def materialization_status(
+    request: Request,
+    store: PrecomputedRecommendations = Depends(get_precomputed_store),
+) -> JSONResponse:
+    """Current corpus version, stored entries per version and the outcome of the last job."""
+    try:
+        return JSONResponse(
+            status_code=HTTP_200_OK,
+            content={
+                "running": materialization_running(),
+                "corpus_version": store.corpus_version(),
+                "versions": store.summary(),
+                "last_run": getattr(request.app.state, "precompute_last_run", None),
+            },
+        )
+    except Exception as e:
+        log_error(f"[PRECOMPUTE] Failed to read status: {e}")
+        raise HTTPException(
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read precomputed recommendations.",
+        ) from e
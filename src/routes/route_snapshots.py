@@ -0,0 +1,128 @@
+import os
+import re
+import sys
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+# Setup import path and modules
+try:
+    MAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+    sys.path.append(MAIN_DIR)
+
+    from logs import log_error, log_info, log_warning
+    from db_vector import StartQdrant
+    from helpers import get_settings, Settings
+    from .dependencies import clear_chunk_caches
+
+except ImportError as e:
+    raise ImportError(f"[IMPORT ERROR] {__file__}: {e}")
+
+app_setting: Settings = get_settings()
+
+snapshot_route = APIRouter()
+
+# Snapshot and export names are plain file names, never paths
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+def get_qdrant_vector_db(request: Request) -> StartQdrant:
+    qdrant = getattr(request.app.state, "qdrant", None)
+    if not qdrant:
+        log_warning("Qdrant not found in app state.")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Vector DB unavailable.")
+    return qdrant
+
+
+def check_name(name: str) -> str:
+    if not _SAFE_NAME.match(name) or ".." in name:
+        raise HTTPException(HTTP_400_BAD_REQUEST, f"Invalid name: {name}")
+    return name
+
+
+@snapshot_route.post("/snapshots/{collection_name}", response_class=JSONResponse)
+async def create_snapshot(collection_name: str, qdrant: StartQdrant = Depends(get_qdrant_vector_db)):
+    """Snapshots a collection into QDRANT_SNAPSHOT_DIR."""
+    try:
+        snapshot = await run_in_threadpool(qdrant.create_snapshot, check_name(collection_name))
+        return JSONResponse(status_code=HTTP_200_OK, content={"status": "success", "snapshot": snapshot})
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(f"Snapshot of '{collection_name}' failed: {e}")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Failed to create snapshot.")
+
+
+@snapshot_route.get("/snapshots/{collection_name}", response_class=JSONResponse)
+async def list_snapshots(collection_name: str, qdrant: StartQdrant = Depends(get_qdrant_vector_db)):
+    """Lists the snapshots of a collection, newest first."""
+    try:
+        snapshots = await run_in_threadpool(qdrant.list_snapshots, check_name(collection_name))
+        return JSONResponse(status_code=HTTP_200_OK, content={"snapshots": snapshots})
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(f"Listing snapshots of '{collection_name}' failed: {e}")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Failed to list snapshots.")
+
+
+@snapshot_route.post("/snapshots/{collection_name}/restore", response_class=JSONResponse)
+async def restore_snapshot(request: Request, collection_name: str, snapshot_name: str,
+                           qdrant: StartQdrant = Depends(get_qdrant_vector_db)):
+    """Replaces a collection with one of its snapshots from QDRANT_SNAPSHOT_DIR."""
+    collection_name = check_name(collection_name)
+    snapshot_name = check_name(snapshot_name)
+    if not os.path.exists(os.path.join(app_setting.QDRANT_SNAPSHOT_DIR, collection_name, snapshot_name)):
+        raise HTTPException(HTTP_404_NOT_FOUND, f"Snapshot not found: {snapshot_name}")
+
+    try:
+        await run_in_threadpool(qdrant.restore_snapshot, collection_name, snapshot_name)
+        clear_chunk_caches(request)
+        log_info(f"Collection '{collection_name}' restored from '{snapshot_name}'.")
+        return JSONResponse(status_code=HTTP_200_OK, content={"status": "success", "restored": snapshot_name})
+    except Exception as e:
+        log_error(f"Restore of '{collection_name}' from '{snapshot_name}' failed: {e}")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Failed to restore snapshot.")
+
+
+@snapshot_route.post("/snapshots/{collection_name}/export", response_class=JSONResponse)
+async def export_collection(collection_name: str, export_name: str,
+                            qdrant: StartQdrant = Depends(get_qdrant_vector_db)):
+    """Exports (id, vector, payload) of every point to QDRANT_EXPORT_DIR/<export_name>."""
+    out_dir = os.path.join(app_setting.QDRANT_EXPORT_DIR, check_name(export_name))
+    try:
+        count = await run_in_threadpool(qdrant.export_collection, check_name(collection_name), out_dir)
+        return JSONResponse(status_code=HTTP_200_OK, content={"status": "success", "exported": count, "export": export_name})
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(f"Export of '{collection_name}' failed: {e}")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Failed to export collection.")
+
+
+@snapshot_route.post("/snapshots/{collection_name}/import", response_class=JSONResponse)
+async def import_collection(request: Request, collection_name: str, export_name: str, recreate: bool = False,
+                            qdrant: StartQdrant = Depends(get_qdrant_vector_db)):
+    """
+    Seeds a collection from an export in QDRANT_EXPORT_DIR without re-embedding.
+    Points are upserted into the existing collection unless recreate=true drops it first.
+    """
+    in_dir = os.path.join(app_setting.QDRANT_EXPORT_DIR, check_name(export_name))
+    if not os.path.isdir(in_dir):
+        raise HTTPException(HTTP_404_NOT_FOUND, f"Export not found: {export_name}")
+
+    try:
+        count = await run_in_threadpool(qdrant.import_collection, check_name(collection_name), in_dir, recreate=recreate)
+        clear_chunk_caches(request)
+        return JSONResponse(status_code=HTTP_200_OK, content={"status": "success", "imported": count})
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(f"Import into '{collection_name}' failed: {e}")
+        raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, "Failed to import collection.")
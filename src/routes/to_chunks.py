@@ -14,22 +14,24 @@ try:
     sys.path.append(str(MAIN_DIR))
 
     from logs import log_error, log_info
-    from controllers import from_doc_to_chunks, clear
+    from controllers import from_doc_to_chunks, tag_chunks, clear, mark_stored_duplicates, index_chunk_signatures, count_duplicates
     from schemes import ChunkRequest
-    from dbs import add_chunk
+    from dbs import add_chunk, clear_chunks_fts, clear_chunk_signatures
+    from embedding import EmbeddingService
+    from .dependencies import get_db_conn, clear_chunk_caches
 except Exception as e:
     raise ImportError(f"Import Error in: {FILE_LOCATION}, Error: {e}")
 
-def get_db_conn(request: Request):
-    """Retrieve the relational database connection from the app state."""
-    conn = request.app.state.conn
-    if not conn:
-        log_warning("Relational database connection not found in application state.")
+def get_embedding_model(request: Request) -> EmbeddingService:
+    """Retrieve the embedding model instance from the app state."""
+    embedding = request.app.state.embedded
+    if not embedding:
+        log_warning("Embedding model instance not found in application state.")
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Relational database service is not available."
+            detail="Embedding model service is not available."
         )
-    return conn
+    return embedding
 
 to_chunks_route = APIRouter()
 
@@ -37,7 +39,8 @@ to_chunks_route = APIRouter()
 @to_chunks_route.post("/to_chunks")
 async def to_chunks(request: Request,
                     body: ChunkRequest,
-                    conn:sql3.Connection = Depends(get_db_conn)):
+                    conn:sql3.Connection = Depends(get_db_conn),
+                    embed: EmbeddingService = Depends(get_embedding_model)):
     """
     Converts documents into text chunks and stores them in the SQLite database.
     """
@@ -49,23 +52,35 @@ async def to_chunks(request: Request,
     try:
         if do_reset:
             clear(conn=conn, table_name="chunks")
+            clear_chunks_fts(conn=conn)
+            clear_chunk_signatures(conn=conn)
+            clear_chunk_caches(request)
             log_info("Chunks table cleared.")
 
-        df = from_doc_to_chunks(file_path=file_path)
+        df = from_doc_to_chunks(
+            file_path=file_path,
+            tokenizer=embed.tokenizer,
+            max_tokens=embed.max_seq_length
+        )
 
         if df.empty:
             msg = "No valid documents found to process."
             log_error(msg)
             return JSONResponse(content={"status": "error", "message": msg}, status_code=404)
 
-        add_chunk(conn=conn, data=df)
-        log_info(f"Inserted {len(df)} chunks into the database.")
+        df = tag_chunks(df, crop=body.crop, region=body.region, year=body.year)
+        df = mark_stored_duplicates(conn=conn, df=df)
+        ids = add_chunk(conn=conn, data=df)
+        index_chunk_signatures(conn=conn, df=df)
+        log_info(f"Inserted {len(ids)} chunks into the database.")
 
         return JSONResponse(
             content={
                 "status": "success",
-                "inserted_chunks": len(df),
-                "documents": df.to_dict(orient="records"),
+                "inserted_chunks": len(ids),
+                "duplicates_removed": count_duplicates(df),
+                # Missing values as null: NaN is not valid JSON
+                "documents": df.astype(object).where(df.notna(), None).to_dict(orient="records"),
             },
             status_code=200,
         )
@@ -1,5 +1,6 @@
 from .chunks import ChunkRequest
 from .chat_route import ChatRoute
 from .llm_setting import LLMsSettings
-from .live_rag import LiveRAG
-from .login_post import LoginRequest
\ No newline at end of file
+from .live_rag import LiveRAG, LiveRAGBatch
+from .login_post import LoginRequest
+from .retrieval_filters import RetrievalFilters
@@ -1,5 +1,15 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Literal, Optional
+
+from .retrieval_filters import RetrievalFilters
 
 class ChatRoute(BaseModel):
-    query: str 
\ No newline at end of file
+    query: str = ""
+    # Structured alternative to the bracketed text query, e.g. {"Nitrogen": "Low"}
+    soil: Optional[Dict[str, Any]] = None
+    weather: Optional[Dict[str, Any]] = None
+    filters: Optional[RetrievalFilters] = None
+    retrieval_mode: Literal["vector", "hybrid"] = "vector"
+    rerank: Optional[bool] = None
+    rerank_top_n: Optional[int] = None
+    rerank_budget_ms: Optional[float] = None
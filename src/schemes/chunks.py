@@ -3,4 +3,7 @@ from typing import Optional
 
 class ChunkRequest(BaseModel):
     file_path: Optional[str] = None 
-    do_reset: int = 0
\ No newline at end of file
+    do_reset: int = 0
+    crop: Optional[str] = None
+    region: Optional[str] = None
+    year: Optional[int] = None
@@ -1,6 +1,16 @@
 from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+from .retrieval_filters import RetrievalFilters
 
 class LiveRAG(BaseModel):
     query: str
     top_k: int = 1
-    score_threshold: float
\ No newline at end of file
+    score_threshold: float
+    filters: Optional[RetrievalFilters] = None
+    retrieval_mode: Literal["vector", "hybrid"] = "vector"
+    search_mode: Literal["fast", "balanced", "accurate", "exact"] = "balanced"
+    hnsw_ef: Optional[int] = None
+
+class LiveRAGBatch(BaseModel):
+    queries: List[LiveRAG]
@@ -12,3 +12,4 @@ class LLMsSettings(BaseModel):
     do_sample: bool
     quantization: bool
     quantization_type: Optional[Literal["4bit", "8bit"]] = None
+    seed: Optional[int] = None
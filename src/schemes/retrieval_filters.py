@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class RetrievalFilters(BaseModel):
+    sources: Optional[List[str]] = None
+    crops: Optional[List[str]] = None
+    regions: Optional[List[str]] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
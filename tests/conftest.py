@@ -0,0 +1,34 @@
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, "src")]
+
+# Settings without defaults, so the modules import without a .env file
+for name, value in {
+    "APP_NAME": "soil-health-tests",
+    "APP_VERSION": "0.0.0",
+    "LOC_DOC": os.path.join(ROOT_DIR, "assets", "doc"),
+    "VECTOR_DB": ":memory:",
+    "SQLITE_DB": ":memory:",
+    "PORT": "0",
+    "HOST": "127.0.0.1",
+    "EMBEDDING_MODEL": "sentence-transformers/all-MiniLM-L6-v2",
+    "HUGGINGFACE_TOKIENS": "test",
+    "FILE_ALLOWED_TYPES": '["pdf", "txt"]',
+    "FILE_MAX_SIZE": "10",
+    "FILE_DEFAULT_CHUNK_SIZE": "200",
+    "CHUNK_SIZE": "200",
+    "CHUNK_OVERLAP": "50",
+    "CPU_THRESHOLD": "90",
+    "MEMORY_THRESHOLD": "90",
+    "MONITOR_INTERVAL": "60",
+    "DISK_THRESHOLD": "90",
+    "GPUs_THRESHOLD": "90",
+    "GPU_AVAILABLE": "false",
+    "TELEGRAM_BOT_TOKEN": "test",
+    "TELEGRAM_CHAT_ID": "test",
+    "SECRET_KEY": "test",
+    "GOOGLE_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
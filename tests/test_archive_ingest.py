@@ -0,0 +1,57 @@
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("langchain")
+
+from src.controllers import ingest_archive
+from src.helpers import get_settings
+
+GUIDE = (
+    "Potassium moves slowly in most soils, so banding it near the seed row puts it where "
+    "young roots can reach it. Sandy soils with low cation exchange capacity lose potassium "
+    "to leaching and need smaller, more frequent applications than clay soils."
+)
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return get_settings().model_copy(update={
+        "LOC_DOC": str(tmp_path),
+        "ARCHIVE_MAX_WORKERS": 2,
+        "CHUNKING_MODE": "characters",
+    })
+
+
+def test_members_are_counted_by_outcome(settings):
+    archive = make_zip({
+        "guides/potassium.txt": GUIDE,
+        "guides/blank.txt": "   \n",
+        "guides/broken.txt": b"\xff\xfe\xfa not utf-8",
+        "photos/field.jpg": b"\x89JPEG",
+    })
+
+    df, summary = ingest_archive(archive, "library.zip", app_settings=settings)
+
+    assert summary["accepted"] == 1
+    assert summary["empty_files"] == ["guides/blank.txt"]
+    assert summary["failed_files"] == ["guides/broken.txt"]
+    assert summary["skipped_files"] == ["photos/field.jpg"]
+    assert summary["chunks"] == len(df) > 0
+    assert "".join(df["text"]).startswith("Potassium")
+
+
+def test_unsupported_archive_type_is_rejected(settings):
+    with pytest.raises(ValueError):
+        ingest_archive(io.BytesIO(b"not an archive"), "library.rar", app_settings=settings)
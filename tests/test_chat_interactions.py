@@ -0,0 +1,55 @@
+import pytest
+
+from src.dbs import SQLitePool, ChatInteractionWriter, init_chat_interactions_table
+
+RECOMMENDATIONS = [
+    {"parameter": "Nitrogen", "value": "Low", "status": "Processed", "advice": "Apply compost.", "prompt_tokens": 412},
+    {"parameter": "Soil pH", "value": "6,5", "status": "Processed", "advice": "No liming needed."},
+]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(database=str(tmp_path / "chat.db"), size=2)
+    with pool.connection() as conn:
+        init_chat_interactions_table(conn)
+    yield pool
+    pool.close()
+
+
+def record(user_id):
+    return (user_id, "Nitrogen: Low, Soil pH: 6,5", "gemini-1.5-flash", "abc123", "2026-10-19T10:00:00+00:00", RECOMMENDATIONS)
+
+
+def count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_writer_flushes_queued_interactions_on_stop(pool):
+    writer = ChatInteractionWriter(pool=pool, batch_size=2, flush_interval=0.05)
+    writer.start()
+    assert all(writer.submit(record(f"farmer-{i}")) for i in range(3))
+    writer.stop()
+
+    with pool.connection() as conn:
+        assert count(conn, "chat_interactions") == 3
+        assert count(conn, "chat_recommendations") == 6
+    assert writer.stats()["written"] == 3
+
+
+def test_deleting_an_interaction_cascades_to_its_recommendations(pool):
+    writer = ChatInteractionWriter(pool=pool)
+    writer.submit(record("farmer-1"))
+    writer.submit(record("farmer-2"))
+    writer.stop()
+
+    with pool.connection() as conn:
+        conn.execute("DELETE FROM chat_interactions WHERE user_id = 'farmer-1'")
+        conn.commit()
+        assert count(conn, "chat_recommendations") == 2
+        orphans = conn.execute("""
+            SELECT COUNT(*) FROM chat_recommendations AS r
+            LEFT JOIN chat_interactions AS i ON i.id = r.interaction_id
+            WHERE i.id IS NULL
+        """).fetchone()[0]
+        assert orphans == 0
@@ -0,0 +1,85 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("langchain_community")
+
+from src.controllers import mark_duplicates, mark_stored_duplicates, index_chunk_signatures, count_duplicates
+from src.dbs import add_chunk, init_chunks_table, clear_chunk_signatures
+
+EDITION = (
+    "Nitrogen deficiency shows first as yellowing of the older leaves, because the plant "
+    "moves nitrogen from old tissue to new growth. Split applications of urea or ammonium "
+    "nitrate during the growing season reduce leaching losses on sandy soils, while "
+    "incorporating legume residues builds up the organic nitrogen pool over several years."
+)
+REPRINT = EDITION.replace("several years", "several seasons")
+UNRELATED = (
+    "Soil pH controls the availability of phosphorus: below 5.5 it is fixed by iron and "
+    "aluminium, above 7.5 by calcium. Liming acid soils with ground limestone raises the "
+    "pH slowly, so apply it months ahead of planting and retest before the next crop."
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    init_chunks_table(conn)
+    yield conn
+    conn.close()
+
+
+def ingest(conn, texts, source):
+    """One upload, as the /to_chunks and /ingest_archive routes store it."""
+    df = pd.DataFrame({
+        "text": texts,
+        "pages": ["1"] * len(texts),
+        "sources": [source] * len(texts),
+        "authors": ["extension service"] * len(texts),
+    })
+    df = mark_duplicates(df)
+    df = mark_stored_duplicates(conn=conn, df=df)
+    add_chunk(conn=conn, data=df)
+    index_chunk_signatures(conn=conn, df=df)
+    return df
+
+
+def test_near_duplicate_of_an_earlier_upload_is_stored_as_a_reference(conn):
+    first = ingest(conn, [EDITION, UNRELATED], "guide-2019.pdf")
+    second = ingest(conn, [REPRINT], "guide-2021-reprint.pdf")
+
+    assert count_duplicates(first) == 0
+    assert count_duplicates(second) == 1
+    assert second.at[0, "canonical_hash"] == first.at[0, "content_hash"]
+    assert second.at[0, "text"] == ""
+    # The reference keeps its own provenance
+    assert conn.execute(
+        "SELECT canonical_hash FROM chunks WHERE sources = 'guide-2021-reprint.pdf'"
+    ).fetchone()[0] == first.at[0, "content_hash"]
+
+
+def test_exact_copy_of_an_earlier_upload_is_stored_as_a_reference(conn):
+    first = ingest(conn, [UNRELATED], "liming.pdf")
+    second = ingest(conn, [UNRELATED.upper()], "liming-copy.txt")
+
+    assert second.at[0, "canonical_hash"] == first.at[0, "content_hash"]
+
+
+def test_unrelated_upload_is_kept(conn):
+    ingest(conn, [EDITION], "guide-2019.pdf")
+    second = ingest(conn, [UNRELATED], "liming.pdf")
+
+    assert count_duplicates(second) == 0
+    assert second.at[0, "text"] == UNRELATED
+
+
+def test_cleared_index_no_longer_matches(conn):
+    ingest(conn, [EDITION], "guide-2019.pdf")
+    conn.execute("DELETE FROM chunks")
+    conn.commit()
+    clear_chunk_signatures(conn)
+
+    second = ingest(conn, [REPRINT], "guide-2021-reprint.pdf")
+
+    assert count_duplicates(second) == 0
@@ -0,0 +1,24 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_community")
+
+from controllers.pdf_or_txt_to_chunks import chunks_to_frame
+
+
+def test_mixed_dated_and_undated_batch_serializes_as_json():
+    chunks = [
+        SimpleNamespace(page_content="dated pdf", metadata={"page": 0, "source": "a.pdf", "creationdate": "D:20200131120000"}),
+        SimpleNamespace(page_content="undated pdf", metadata={"page": 0, "source": "b.pdf"}),
+        SimpleNamespace(page_content="plain text", metadata={"source": "c.txt"}),
+    ]
+
+    df = chunks_to_frame(chunks)
+
+    assert df["year"].tolist() == [2020, None, None]
+    documents = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    payload = json.loads(json.dumps(documents, allow_nan=False))
+    assert [doc["year"] for doc in payload] == [2020, None, None]
@@ -0,0 +1,38 @@
+import pytest
+
+from prompt import context_assembler
+from prompt.context_assembler import ContextAssembler
+
+
+def count_chars(texts):
+    return [len(text) for text in texts]
+
+
+def neighbours(overlap_chars):
+    shared = ("Split urea doses reduce nitrogen losses on sandy soils after heavy rain. " * 4)[:overlap_chars]
+    first = "Nitrogen deficiency shows as yellowing of the older leaves first. " + shared
+    second = shared + "Phosphorus supports early root growth and flowering."
+    return [{"id": 10, "text": first, "score": 0.9}, {"id": 11, "text": second, "score": 0.8}]
+
+
+@pytest.mark.parametrize("mode, overlap_chars", [("characters", 45), ("tokens", 130)])
+def test_overlap_between_adjacent_chunks_is_trimmed(monkeypatch, mode, overlap_chars):
+    monkeypatch.setattr(context_assembler.app_setting, "CHUNKING_MODE", mode)
+    monkeypatch.setattr(context_assembler.app_setting, "CHUNK_OVERLAP", 50)
+    monkeypatch.setattr(context_assembler.app_setting, "CHUNK_TOKEN_OVERLAP", 32)
+
+    assembler = ContextAssembler(count_chars, budget_tokens=10_000)
+    _, stats = assembler.assemble(neighbours(overlap_chars))
+
+    assert stats["passages"] == 2
+    assert stats["trimmed_chars"] == overlap_chars
+
+
+def test_budget_keeps_the_best_passages():
+    docs = [{"id": i * 10, "text": f"passage {i} " * 20, "score": 1 - i / 10} for i in range(5)]
+
+    context, stats = ContextAssembler(count_chars, budget_tokens=450).assemble(docs)
+
+    assert stats["passages"] == 2
+    assert stats["context_tokens"] <= 450
+    assert "passage 0" in context and "passage 1" in context
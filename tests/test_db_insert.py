@@ -0,0 +1,62 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.dbs import add_chunk, add_chunks_bulk, init_chunks_table
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    init_chunks_table(conn)
+    yield conn
+    conn.close()
+
+
+def chunk(text):
+    return {"text": text, "pages": "1", "sources": "guide.pdf", "authors": "extension service"}
+
+
+def stored_texts(conn):
+    return [row[0] for row in conn.execute("SELECT text FROM chunks ORDER BY id")]
+
+
+def test_bulk_insert_returns_row_ids_in_input_order(conn):
+    ids = add_chunks_bulk(conn, (chunk(f"passage {i}") for i in range(7)), batch_size=3, codec="none")
+
+    assert len(ids) == 7
+    rows = dict(conn.execute("SELECT id, text FROM chunks"))
+    assert [rows[i] for i in ids] == [f"passage {i}" for i in range(7)]
+
+
+def test_failed_bulk_insert_rolls_back_every_batch(conn):
+    records = [chunk("first batch"), chunk("first batch too"), {"text": "no pages"}]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        add_chunks_bulk(conn, records, batch_size=2, codec="none")
+
+    assert stored_texts(conn) == []
+    assert not conn.in_transaction
+
+
+def test_bulk_insert_inside_a_caller_transaction_leaves_the_commit_to_the_caller(conn):
+    conn.execute("BEGIN")
+    conn.execute("INSERT INTO chunks (text, pages, sources, authors) VALUES ('caller', '1', 's', 'a')")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        add_chunks_bulk(conn, [chunk("mine"), {"text": "no pages"}], codec="none")
+    assert conn.in_transaction
+    add_chunks_bulk(conn, [chunk("mine")], codec="none")
+    assert conn.in_transaction
+
+    conn.rollback()
+    assert stored_texts(conn) == []
+
+
+def test_add_chunk_raises_instead_of_reporting_an_empty_insert(conn):
+    df = pd.DataFrame({"text": ["a passage"], "pages": [None], "sources": ["s"], "authors": ["a"]})
+
+    with pytest.raises(sqlite3.IntegrityError):
+        add_chunk(conn, df)
+    assert stored_texts(conn) == []
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.dbs import SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(database=str(tmp_path / "pool.db"), size=2)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE readings (value INTEGER)")
+        conn.commit()
+    yield pool
+    pool.close()
+
+
+def test_connections_use_wal_and_a_busy_timeout(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+
+def test_exhausted_pool_times_out(pool):
+    held = [pool.acquire(), pool.acquire()]
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    pool.release(held.pop())
+    pool.release(pool.acquire(timeout=0.05))
+    pool.release(held.pop())
+
+
+def test_release_rolls_back_an_unfinished_transaction(pool):
+    conn = pool.acquire()
+    conn.execute("INSERT INTO readings VALUES (1)")
+    pool.release(conn)
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0] == 0
+
+
+def test_readers_are_not_blocked_by_an_open_write(pool):
+    writer = pool.acquire()
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO readings VALUES (1)")
+    counts = []
+
+    def read():
+        with pool.connection() as conn:
+            counts.append(conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0])
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    reader.join(timeout=2)
+
+    # The reader saw the last committed state while the write was still open
+    assert counts == [0]
+    writer.commit()
+    pool.release(writer)
+
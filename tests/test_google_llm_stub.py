@@ -0,0 +1,215 @@
+"""
+GoogleLLM against a local stub of the Generative Language REST API, reached
+through GOOGLE_API_ENDPOINT.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+# The llm package also loads the HuggingFace backend
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.helpers import get_settings
+from src.llm import GoogleLLM, ResponseCache
+
+
+class StubGenerativeAPI(ThreadingHTTPServer):
+    """
+    Answers generateContent calls. ``script`` holds the HTTP status of successive
+    calls (200 once it runs out); ``delay`` is the time spent on each call.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, script=(), delay=0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.script = list(script)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.arrivals = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        with server.lock:
+            server.arrivals.append(time.monotonic())
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.script.pop(0) if server.script else 200
+        try:
+            time.sleep(server.delay)
+            if status == 200:
+                body = {"candidates": [{"content": {"role": "model", "parts": [{"text": "Apply compost."}]}}]}
+            else:
+                body = {"error": {"code": status, "message": "stubbed failure", "status": "UNAVAILABLE"}}
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(request):
+    server = StubGenerativeAPI(**getattr(request, "param", {}))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def settings(monkeypatch, stub):
+    settings = get_settings()
+    for name, value in {
+        "GOOGLE_API_KEY": "test-key",
+        "GOOGLE_API_ENDPOINT": stub.endpoint,
+        "GOOGLE_API_TRANSPORT": "rest",
+        "GOOGLE_MAX_CONCURRENCY": 3,
+        "GOOGLE_REQUESTS_PER_MINUTE": 600.0,
+        "GOOGLE_RATE_BURST": 2,
+        "GOOGLE_REQUEST_TIMEOUT": 5.0,
+        "GOOGLE_MAX_RETRIES": 3,
+        "GOOGLE_RETRY_BASE_DELAY": 0.05,
+        "GOOGLE_RETRY_MAX_DELAY": 0.2,
+        "LLM_BATCH_SIZE": 8,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    return settings
+
+
+def make_llm():
+    # Created and configured inside the running loop, as the /llmsettings route does
+    llm = GoogleLLM(temperature=0.5)
+    llm.initialize_llm()
+    return llm
+
+
+@pytest.mark.parametrize("stub", [{"delay": 0.05}], indirect=True)
+def test_burst_queues_under_semaphore_and_token_bucket(stub, settings):
+    async def main():
+        llm = make_llm()
+        gaps, done = [], asyncio.Event()
+
+        async def ticker():
+            last = time.monotonic()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        watcher = asyncio.create_task(ticker())
+        answers = await asyncio.gather(*(llm.aresponse(f"Nitrogen: Low #{i}") for i in range(12)))
+        done.set()
+        await watcher
+        return answers, gaps
+
+    answers, gaps = asyncio.run(main())
+
+    assert answers == ["Apply compost."] * 12
+    assert stub.max_in_flight <= settings.GOOGLE_MAX_CONCURRENCY
+    # 2 requests of burst, then 10 per second: the last one starts about a second in
+    assert stub.arrivals[-1] - stub.arrivals[0] >= 0.9
+    # Waiting happened on the loop without blocking it
+    assert max(gaps) < 0.2
+
+
+@pytest.mark.parametrize("stub", [{"script": [429, 503]}], indirect=True)
+def test_quota_and_unavailable_errors_are_retried(stub, settings):
+    async def main():
+        return await make_llm().aresponse("Potassium: High")
+
+    assert asyncio.run(main()) == "Apply compost."
+    assert len(stub.arrivals) == 3
+    assert stub.arrivals[2] > stub.arrivals[0]
+
+
+@pytest.mark.parametrize("stub", [{"script": [503] * 10}], indirect=True)
+def test_retries_are_bounded(stub, settings, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_MAX_RETRIES", 2)
+
+    async def main():
+        return await make_llm().aresponse("Potassium: High")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+    assert len(stub.arrivals) == 3
+
+
+@pytest.mark.parametrize("stub", [{"delay": 1.0}], indirect=True)
+def test_timeout_surfaces_as_runtime_error(stub, settings, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_REQUEST_TIMEOUT", 0.2)
+    monkeypatch.setattr(settings, "GOOGLE_MAX_RETRIES", 1)
+
+    async def main():
+        return await make_llm().aresponse("Soil Moisture: Dry")
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+    assert time.monotonic() - started < 1.5
+
+
+@pytest.mark.parametrize("stub", [{"delay": 0.05, "script": [429]}], indirect=True)
+def test_batch_from_a_worker_thread_shares_the_limiter(stub, settings):
+    async def main():
+        llm = make_llm()
+        # As bulk scoring and the precompute job do: a sync call off the event loop
+        return await asyncio.to_thread(llm.batch_response, [f"Organic Matter: Poor #{i}" for i in range(8)])
+
+    answers = asyncio.run(main())
+
+    assert answers == ["Apply compost."] * 8
+    assert stub.max_in_flight <= settings.GOOGLE_MAX_CONCURRENCY
+    # The 429 was retried instead of failing its prompt
+    assert len(stub.arrivals) == 9
+
+
+def test_config_id_is_stable_across_initialization(stub, settings):
+    llm = GoogleLLM(temperature=0.5)
+    before = llm.config_id()
+    llm.initialize_llm()
+
+    assert llm.config_id() == before
+    assert GoogleLLM(temperature=0.0).config_id() != before
+
+
+def test_greedy_config_answers_repeats_from_the_cache(stub, settings):
+    async def main():
+        llm = GoogleLLM(temperature=0.0)
+        llm.response_cache = ResponseCache(cache_size=8)
+        llm.initialize_llm()
+        first = await llm.aresponse("Nitrogen: Low")
+        second = await llm.aresponse("Nitrogen: Low")
+        return first, second, llm.response_cache.stats()
+
+    first, second, stats = asyncio.run(main())
+
+    assert first == second == "Apply compost."
+    assert len(stub.arrivals) == 1
+    assert stats["hits"] == 1
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.helpers import get_settings
+from src.llm import HuggingFaceLLM
+
+
+class FakeBatch(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    padding_side = "right"
+    pad_token_id = 0
+
+    def __init__(self):
+        self.padded_on = []
+
+    def __call__(self, texts, **kwargs):
+        self.padded_on.append(self.padding_side)
+        return FakeBatch(texts=texts)
+
+    def batch_decode(self, output, **kwargs):
+        return [f"answer: {text}" for text in output]
+
+
+class FakeModel:
+    device = "cpu"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, texts, **kwargs):
+        self.calls += 1
+        return texts
+
+
+def make_llm(do_sample, seed):
+    # Skips model loading; only the batching logic is under test
+    llm = HuggingFaceLLM.__new__(HuggingFaceLLM)
+    llm.settings = get_settings()
+    llm.max_new_tokens, llm.temperature, llm.top_p, llm.top_k = 16, 0.7, 0.95, 50
+    llm.do_sample, llm.seed = do_sample, seed
+    llm.tokenizer, llm.model = FakeTokenizer(), FakeModel()
+    return llm
+
+
+def test_greedy_prompts_share_a_batch_and_padding_side_is_restored():
+    llm = make_llm(do_sample=False, seed=None)
+
+    answers = llm.batch_response(["Nitrogen: Low", "Soil pH: 6,5"])
+
+    assert answers == ["answer: Nitrogen: Low", "answer: Soil pH: 6,5"]
+    assert llm.model.calls == 1
+    assert llm.tokenizer.padded_on == ["left"]
+    assert llm.tokenizer.padding_side == "right"
+
+
+def test_seeded_sampling_generates_prompt_by_prompt(monkeypatch):
+    llm = make_llm(do_sample=True, seed=7)
+    seen = []
+    monkeypatch.setattr(llm, "response", lambda prompt: seen.append(prompt) or f"single: {prompt}")
+
+    answers = llm.batch_response(["Nitrogen: Low", "Potassium: High"])
+
+    assert answers == ["single: Nitrogen: Low", "single: Potassium: High"]
+    assert seen == ["Nitrogen: Low", "Potassium: High"]
+    assert llm.model.calls == 0
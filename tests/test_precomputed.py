@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dbs import SQLitePool, PrecomputedRecommendations, init_chunks_table, init_precomputed_table
+from dbs import db_precomputed
+
+
+def make_store(tmp_path, state):
+    pool = SQLitePool(database=str(tmp_path / "precomputed.db"), size=1)
+    with pool.connection() as conn:
+        init_chunks_table(conn=conn)
+        init_precomputed_table(conn=conn)
+    qdrant = SimpleNamespace(collection_state=lambda name: state["value"])
+    return PrecomputedRecommendations(pool=pool, qdrant=qdrant)
+
+
+def test_corpus_version_follows_the_vector_collection(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_precomputed, "VECTOR_STATE_TTL_S", 0.0)
+    state = {"value": "0:None:384:Cosine"}
+    store = make_store(tmp_path, state)
+
+    before = store.corpus_version()
+    store.store([("Nitrogen", "Low", before, "model", "Processed", "advice", "[]", "2026-01-01")])
+    assert store.lookup([("Nitrogen", "Low")], "model")
+
+    # Same chunks, but the vectors were embedded (or restored from a snapshot) since
+    state["value"] = "120:1:384:Cosine"
+    assert store.corpus_version() != before
+    assert store.lookup([("Nitrogen", "Low")], "model") == {}
+
+
+class UpToDateStore:
+    """Store that already holds every pair, so a job ends right after its lookup."""
+
+    def corpus_version(self):
+        return "v1"
+
+    def lookup(self, pairs, model_version, version=None):
+        return {(db_precomputed.normalize_term(p), db_precomputed.normalize_term(v)): "advice" for p, v in pairs}
+
+
+def test_claimed_job_excludes_others_until_it_ends():
+    pytest.importorskip("langchain_community")
+    from controllers import claim_materialization, materialization_running, materialize_recommendations
+
+    llm = SimpleNamespace(config_id=lambda: "model")
+    run = lambda **kwargs: materialize_recommendations(
+        store=UpToDateStore(), qdrant=None, embedding=None, llm=llm, vocabulary={"Nitrogen": ("Low",)}, **kwargs
+    )
+
+    assert claim_materialization()
+    assert not claim_materialization()
+    with pytest.raises(RuntimeError):
+        run()
+    assert materialization_running()
+
+    assert run(claimed=True)["skipped"] == 1
+    assert not materialization_running()
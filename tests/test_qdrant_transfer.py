@@ -0,0 +1,73 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from helpers import get_settings
+from db_vector import StartQdrant
+
+
+class ShrinkingClient:
+    """Counts more points than the scroll returns, as when points are deleted mid-export."""
+
+    def __init__(self, counted, points):
+        self.counted = counted
+        self.points = points
+        self.recovered = []
+
+    def get_collection(self, collection_name):
+        vectors = SimpleNamespace(size=3, distance=SimpleNamespace(value="Cosine"))
+        return SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)))
+
+    def count(self, collection_name, exact):
+        return SimpleNamespace(count=self.counted)
+
+    def scroll(self, collection_name, limit, offset, with_payload, with_vectors):
+        start = offset or 0
+        batch = self.points[start:start + limit]
+        next_offset = start + limit if start + limit < len(self.points) else None
+        return batch, next_offset
+
+    def recover_snapshot(self, collection_name, location, wait):
+        self.recovered.append(location)
+
+
+def make_qdrant(tmp_path, client):
+    qdrant = StartQdrant.__new__(StartQdrant)
+    qdrant.app_setting = get_settings().model_copy(update={"QDRANT_SNAPSHOT_DIR": str(tmp_path / "snapshots")})
+    qdrant.client = client
+    return qdrant
+
+
+def test_export_truncates_vectors_to_the_points_read(tmp_path):
+    pytest.importorskip("pyarrow")
+    points = [SimpleNamespace(id=i, vector=[float(i)] * 3, payload={"chunk_id": i}) for i in range(3)]
+    qdrant = make_qdrant(tmp_path, ShrinkingClient(counted=5, points=points))
+
+    assert qdrant.export_collection("embeddings", str(tmp_path / "export"), batch_size=2) == 3
+
+    vectors = np.load(tmp_path / "export" / "vectors.npy")
+    assert vectors.shape == (3, 3)
+    assert vectors[:, 0].tolist() == [0.0, 1.0, 2.0]
+    with open(tmp_path / "export" / "manifest.json", encoding="utf-8") as f:
+        assert json.load(f)["count"] == 3
+    assert not os.path.exists(tmp_path / "export" / "vectors.npy.tmp")
+
+
+def test_restore_only_reads_snapshots_from_the_snapshot_dir(tmp_path):
+    client = ShrinkingClient(counted=0, points=[])
+    qdrant = make_qdrant(tmp_path, client)
+    os.makedirs(tmp_path / "snapshots" / "embeddings")
+    (tmp_path / "snapshots" / "embeddings" / "embeddings-1.snapshot").write_bytes(b"")
+
+    for snapshot in ("http://attacker.example/x.snapshot", "file:///etc/passwd", "../other/x.snapshot", "missing.snapshot"):
+        with pytest.raises(ValueError):
+            qdrant.restore_snapshot("embeddings", snapshot)
+    assert client.recovered == []
+
+    qdrant.restore_snapshot("embeddings", "embeddings-1.snapshot")
+    assert client.recovered == ["file:///qdrant/snapshots/embeddings/embeddings-1.snapshot"]
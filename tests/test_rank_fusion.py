@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("langchain_community")
+
+from controllers import reciprocal_rank_fusion
+
+
+def test_ids_found_by_both_retrievers_rank_first():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4, 1]], k=60)
+
+    assert {item for item, _ in fused[:2]} == {1, 3}
+    assert dict(fused)[1] == pytest.approx(1 / 61 + 1 / 63)
+    assert dict(fused)[4] == pytest.approx(1 / 62)
+
+
+def test_single_ranking_keeps_its_order():
+    assert [item for item, _ in reciprocal_rank_fusion([[7, 5, 9]])] == [7, 5, 9]
+
+
+def test_empty_rankings_fuse_to_nothing():
+    assert reciprocal_rank_fusion([[], []]) == []
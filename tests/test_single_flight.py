@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from helpers import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", compute, 21) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert results == [42] * 5
+    assert calls == [21]
+    assert flight.stats() == {"in_flight": 0, "started": 1, "shared": 4}
+
+
+def test_results_are_not_cached_once_the_call_ends():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        flight = SingleFlight()
+        return [await flight.do("key", compute), await flight.do("key", compute)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_errors_are_shared_and_then_forgotten():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        outcomes = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+        return flight, outcomes
+
+    flight, outcomes = asyncio.run(main())
+    assert [type(o) for o in outcomes] == [ValueError, ValueError]
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        flight = SingleFlight()
+        dropped = asyncio.ensure_future(flight.do("key", compute))
+        kept = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0.01)
+        dropped.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await dropped
+        return await kept
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,16 @@
+from helpers.spliters import split_soil_elements
+
+
+def test_decimal_comma_stays_in_the_value():
+    soil, weather = split_soil_elements(
+        "[SoilData] Soil pH: 6,5, Nitrogen: Low [WeatherData] Temperature: 21,5 C, Humidity: 40%"
+    )
+
+    assert soil == {"Soil pH": "6.5", "Nitrogen": "Low"}
+    assert weather == {"Temperature": "21.5°C", "Humidity": "40%"}
+
+
+def test_comma_between_entries_still_separates_them():
+    soil, _ = split_soil_elements("[SoilData] pH: 6,Nitrogen: Low,Potassium: High")
+
+    assert soil == {"Soil pH": "6", "Nitrogen": "Low", "Potassium": "High"}